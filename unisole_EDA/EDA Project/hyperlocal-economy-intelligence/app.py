@@ -1,11 +1,37 @@
+import time
+RUN_STARTED = time.perf_counter()
+
+import json
+from dataclasses import replace
+
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import json
-from pathlib import Path
+
+# Plotting libraries are imported by the pages that draw (see below), so a
+# cold start only pays for them once a chart is on screen
+from hyperlocal.aggregates import (AggregateCache, city_stats as compute_city_stats,
+                                   correlation_matrix, overview_aggregates,
+                                   risk_return_aggregates, selection_key)
+from hyperlocal.export import (PAGE_SIZES, export_csv, export_parquet, page_bounds,
+                               page_count, sort_positions)
+from hyperlocal.geo import GeoIndex, load_pincode_table, resolve_place
+from hyperlocal.pipeline import (HIGH_THRESHOLD, MODERATE_THRESHOLD, RETURN_WEIGHTS,
+                                 RISK_WEIGHTS, WEIGHTS)
+from hyperlocal.profiling import MetricsRegistry, RunProfile, log_run, profiling_enabled
+from hyperlocal.queries import finder_rows
+from hyperlocal.recommender import (INPUT_COLUMNS as RECOMMENDER_COLUMNS, PROFILES,
+                                    score_profiles, top_areas)
+from hyperlocal.scenarios import (BASELINE, CATEGORIES, HEALTH_COLUMN, SCENARIO_COLUMNS,
+                                  Scenario, ScenarioMatrix, category_counts, score_ranks)
+from hyperlocal.shared import load_shared, take_rows
+from hyperlocal.similarity import SUBSCORE_COLUMNS, SimilarityIndex
+from hyperlocal.snapshot import (FILTER_COLUMNS, OVERVIEW_COLUMNS, default_selection,
+                                 load_snapshot)
+from hyperlocal.store import dataset_version
+from hyperlocal.timing import StageTimer, logger as startup_logger
+
+timer = StageTimer(RUN_STARTED)
+timer.mark("imports")
 
 # Page configuration
 st.set_page_config(
@@ -15,6 +41,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in hot-path profiling (hyperlocal/profiling.py): $HYPERLOCAL_PROFILE or ?profile=1
+PROFILING = profiling_enabled(st.query_params)
+run_profile = RunProfile(enabled=PROFILING)
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -44,22 +74,116 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
-@st.cache_data
-def load_data():
-    app_dir = Path(__file__).resolve().parent
-    candidates = [
-        app_dir / "hyperlocal_economy_processed.csv",
-        app_dir / "data" / "hyperlocal_economy_processed.csv",
-    ]
-    for csv_path in candidates:
-        if csv_path.exists():
-            return pd.read_csv(csv_path)
-    raise FileNotFoundError(
-        "Could not find hyperlocal_economy_processed.csv in expected locations."
-    )
+# Columns each view reads; load_data only pulls these from the store
+PAGE_COLUMNS = {
+    "🏠 Overview": OVERVIEW_COLUMNS,
+    "📊 Data Explorer": ('area_name', 'city', 'area_type', 'locality_type',
+                        'economic_health_score', 'investment_category', 'monthly_rent',
+                        'property_price_sqft', 'footfall_score', 'infrastructure_score',
+                        'recommended_business', 'risk_score'),
+    "🎯 Investment Finder": ('area_name', 'city', 'area_type', 'locality_type',
+                            'economic_health_score', 'monthly_rent', 'business_growth',
+                            'footfall_score', 'risk_score', 'property_price_sqft',
+                            'recommended_business'),
+    "📈 Analytics": ('area_id', 'area_name', 'city', 'area_type', 'economic_health_score',
+                    'business_density_score', 'footfall_score', 'infrastructure_score',
+                    'property_value_score', 'monthly_rent', 'pedestrian_count_15min',
+                    'property_price_sqft', 'risk_score', 'expected_return',
+                    'investment_category'),
+    "💼 Business Recommender": tuple(dict.fromkeys((
+        'area_name', 'city', 'area_type', 'monthly_rent', 'footfall_score',
+        'economic_health_score', 'infrastructure_score', 'business_growth', 'risk_score',
+        'recommended_business', *RECOMMENDER_COLUMNS))),
+    "🧬 Similar Areas": ('area_id', 'area_name', 'city', 'area_type', 'economic_health_score',
+                        *SUBSCORE_COLUMNS),
+    "🎛️ Scenarios": ('area_name', 'city', 'area_type', 'locality_type', *SCENARIO_COLUMNS),
+    # Hidden unless profiling is on
+    "🩺 Diagnostics": FILTER_COLUMNS,
+}
+# Span name of each page body
+PAGE_SPANS = {page: "page." + page.split(" ", 1)[1].lower().replace(" ", "_")
+              for page in PAGE_COLUMNS}
+# Name matches offered as anchors on the Similar Areas page
+SIMILAR_MATCHES = 20
+
+# Load data: read-only memory-mapped views shared by every session and
+# process (see hyperlocal/shared.py); the version argument invalidates the
+# caches when the processed file is rebuilt
+@st.cache_resource
+def load_data(columns=None, version=None):
+    return load_shared(columns, version)
+
+# Indexes and landing-page aggregates from the warm-start snapshot
+# (hyperlocal/snapshot.py), built and saved on the first start if missing
+@st.cache_resource
+def get_snapshot(version=None):
+    return load_snapshot(version)
+
+@st.cache_resource
+def get_filter_index(version=None):
+    return get_snapshot(version).filter_index
+
+# Page aggregates shared by every session, keyed on the filter selection
+@st.cache_resource
+def get_aggregate_cache(version=None):
+    cache = AggregateCache(maxsize=256)
+    for key, value in get_snapshot(version).aggregates.items():
+        cache.put(key, value)
+    return cache
 
-df = load_data()
+# Per-cell sums behind the Correlations tab (any selection, no row scan)
+@st.cache_resource
+def get_sufficient_stats(version=None):
+    return get_snapshot(version).sufficient_stats
+
+@st.cache_resource
+def get_search_index(version=None):
+    return get_snapshot(version).search_index
+
+# Bundled pincode table, read once per process
+@st.cache_resource
+def get_pincode_table():
+    return load_pincode_table()
+
+# Area positions from the bundled pincode table, for radius and nearby queries
+@st.cache_resource
+def get_geo_index(version=None):
+    return GeoIndex.from_frame(load_data(('pincode', 'city'), version), get_pincode_table())
+
+# Stage timings of this process's first run
+@st.cache_resource
+def get_cold_start():
+    return {}
+
+# Standardised float32 sub-score matrix for "more like this" and clusters
+@st.cache_resource
+def get_similarity_index(version=None):
+    return SimilarityIndex(load_data(tuple(SUBSCORE_COLUMNS), version))
+
+# Sub-scores and vacancy rate as one matrix for what-if re-scoring
+@st.cache_resource
+def get_scenario_matrix(version=None):
+    return ScenarioMatrix(load_data(tuple(SCENARIO_COLUMNS), version))
+
+# Span totals of every profiled run of this process
+@st.cache_resource
+def get_metrics():
+    return MetricsRegistry()
+
+# Figures and tables in their own spans: serialization time and bytes sent
+def show_chart(fig, name):
+    with run_profile.span(f"{name}.chart"):
+        st.plotly_chart(run_profile.sent(fig), use_container_width=True)
+
+def show_table(data, name, **kwargs):
+    with run_profile.span(f"{name}.table"):
+        st.dataframe(run_profile.sent(data), **kwargs)
+
+DATA_VERSION = dataset_version()
+filter_index = get_filter_index(DATA_VERSION)
+agg_cache = get_aggregate_cache(DATA_VERSION)
+timer.mark("snapshot")
+DEFAULT_CITIES, DEFAULT_AREA_TYPES, DEFAULT_SCORE_RANGE = default_selection(filter_index.options)
 
 # Header
 st.markdown('<div class="main-header">🏙️ Hyperlocal Economy Intelligence System</div>', 
@@ -67,71 +191,84 @@ st.markdown('<div class="main-header">🏙️ Hyperlocal Economy Intelligence Sy
 
 # Sidebar
 with st.sidebar:
-    st.image("https://img.icons8.com/fluency/96/000000/business.png", width=100)
+    st.markdown("<div style='font-size: 4rem; text-align: center;'>🏙️</div>",
+                unsafe_allow_html=True)
     st.title("🎯 Navigation")
     
     page = st.radio("Select View:", 
                     ["🏠 Overview", "📊 Data Explorer", "🎯 Investment Finder", 
-                     "📈 Analytics", "💼 Business Recommender"])
+                     "📈 Analytics", "💼 Business Recommender", "🧬 Similar Areas",
+                     "🎛️ Scenarios"]
+                    + (["🩺 Diagnostics"] if PROFILING else []))
     
     st.markdown("---")
     st.subheader("🔍 Filters")
     
     # Filters
     cities = st.multiselect("Select Cities:", 
-                           options=df['city'].unique(),
-                           default=df['city'].unique()[:3])
+                           options=filter_index.options['city'],
+                           default=DEFAULT_CITIES)
     
     area_types = st.multiselect("Area Type:",
-                                options=df['area_type'].unique(),
-                                default=df['area_type'].unique())
+                                options=filter_index.options['area_type'],
+                                default=DEFAULT_AREA_TYPES)
     
     score_range = st.slider("Health Score Range:",
                            min_value=0, max_value=100,
-                           value=(0, 100))
-    
-    # Apply filters
-    if cities:
-        df_filtered = df[df['city'].isin(cities)]
-    else:
-        df_filtered = df
+                           value=DEFAULT_SCORE_RANGE)
     
-    if area_types:
-        df_filtered = df_filtered[df_filtered['area_type'].isin(area_types)]
-    
-    df_filtered = df_filtered[
-        (df_filtered['economic_health_score'] >= score_range[0]) &
-        (df_filtered['economic_health_score'] <= score_range[1])
-    ]
+    # Apply filters: row positions from the cached index, then one take
+    with run_profile.span("sidebar.filters") as span:
+        rows = filter_index.select(score_range=score_range, city=cities, area_type=area_types)
+        
+        # Only the columns the selected page uses
+        df = load_data(PAGE_COLUMNS[page], DATA_VERSION)
+        df_filtered = take_rows(df, rows)
+        span.rows = len(df_filtered)
+    selection = selection_key(DATA_VERSION, cities, area_types, score_range)
+    timer.mark("data")
     
     st.markdown("---")
     st.info(f"📍 Showing {len(df_filtered)} locations")
 
 
+# Each page body is one span; its aggregates, figures and tables get their own
+run_profile.start(PAGE_SPANS[page], rows=len(df_filtered))
+
 # PAGE 1: OVERVIEW
 
-if page == "🏠 Overview":
+if page == "🏠 Overview" and df_filtered.empty:
+    st.warning("📭 No locations match the current filters. Widen the score range "
+               "or select more cities or area types.")
+
+elif page == "🏠 Overview":
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from hyperlocal.charts import CATEGORY_COLORS, histogram_figure
+    
+    overview = run_profile.cached(agg_cache, f"{selection}:overview",
+                                  lambda: overview_aggregates(df_filtered, df),
+                                  "overview.aggregates")
     
     # KPI Metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Locations", len(df_filtered),
-                 delta=f"{len(df_filtered)/len(df)*100:.1f}% of total")
+        st.metric("Total Locations", overview['total'],
+                 delta=f"{overview['share']:.1f}% of total")
     
     with col2:
-        avg_score = df_filtered['economic_health_score'].mean()
+        avg_score = overview['avg_score']
         st.metric("Avg Health Score", f"{avg_score:.1f}",
-                 delta=f"{avg_score - df['economic_health_score'].mean():.1f}")
+                 delta=f"{avg_score - overview['overall_avg_score']:.1f}")
     
     with col3:
-        high_potential = len(df_filtered[df_filtered['investment_category']=='High Potential'])
+        high_potential = overview['high_potential']
         st.metric("High Potential Areas", high_potential,
-                 delta=f"{high_potential/len(df_filtered)*100:.1f}%")
+                 delta=f"{overview['high_potential_share']:.1f}%")
     
     with col4:
-        top_city = df_filtered.groupby('city')['economic_health_score'].mean().idxmax()
-        st.metric("Top City", top_city)
+        st.metric("Top City", overview['top_city'])
     
     st.markdown("---")
     
@@ -140,19 +277,16 @@ if page == "🏠 Overview":
     
     with col1:
         st.subheader("📊 Score Distribution")
-        fig = px.histogram(df_filtered, x='economic_health_score', 
-                          nbins=30, color='investment_category',
-                          color_discrete_map={
-                              'High Potential': 'green',
-                              'Moderate Potential': 'orange',
-                              'Low Potential': 'red'
-                          })
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        # Binned server-side; the figure is cached per filter selection
+        fig = run_profile.cached(agg_cache, f"{selection}:fig:score_hist", lambda: histogram_figure(
+            df_filtered, 'economic_health_score', color='investment_category',
+            nbins=30, color_map=CATEGORY_COLORS).update_layout(height=400),
+            "overview.score_hist")
+        show_chart(fig, "overview.score_hist")
     
     with col2:
         st.subheader("🎯 Investment Categories")
-        category_counts = df_filtered['investment_category'].value_counts()
+        category_counts = overview['category_counts']
         fig = px.pie(values=category_counts.values, names=category_counts.index,
                     color=category_counts.index,
                     color_discrete_map={
@@ -161,13 +295,13 @@ if page == "🏠 Overview":
                         'Low Potential': 'red'
                     })
         fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, "overview.categories")
     
     # Top 10 Areas
     st.markdown("---")
     st.subheader("🏆 Top 10 Investment Areas")
     
-    top_10 = df_filtered.nlargest(10, 'economic_health_score')
+    top_10 = overview['top_10']
     
     fig = go.Figure(go.Bar(
         x=top_10['economic_health_score'].values,
@@ -182,7 +316,7 @@ if page == "🏠 Overview":
         textposition='outside'
     ))
     fig.update_layout(height=500, yaxis={'categoryorder':'total ascending'})
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig, "overview.top_10")
 
 
 # PAGE 2: DATA EXPLORER
@@ -193,8 +327,10 @@ elif page == "📊 Data Explorer":
     
     # Search
     search = st.text_input("🔍 Search by area name:", "")
-    if search:
-        df_filtered = df_filtered[df_filtered['area_name'].str.contains(search, case=False)]
+    if search.strip():
+        # Indexed prefix / substring / fuzzy match over the area names
+        matches = get_search_index(DATA_VERSION).row_mask(search)
+        df_filtered = df_filtered[matches[rows]]
     
     # Display options
     col1, col2 = st.columns([3, 1])
@@ -205,11 +341,12 @@ elif page == "📊 Data Explorer":
     with col2:
         sort_order = st.radio("Order:", ['Descending', 'Ascending'])
     
-    # Sort dataframe
-    df_display = df_filtered.sort_values(
-        sort_by, 
-        ascending=(sort_order=='Ascending')
-    )
+    # Sort order as row positions (cached per selection, search and sort)
+    order = run_profile.cached(
+        agg_cache, f"{selection}:order:{search}:{sort_by}:{sort_order}",
+        lambda: sort_positions(df_filtered[sort_by].to_numpy(),
+                               ascending=(sort_order=='Ascending')),
+        "explorer.sort")
     
     # Select columns to display
     display_cols = st.multiselect(
@@ -222,17 +359,35 @@ elif page == "📊 Data Explorer":
                 'investment_category', 'monthly_rent']
     )
     
-    # Display dataframe
-    st.dataframe(df_display[display_cols], use_container_width=True, height=400)
-    
-    # Download button
-    csv = df_display[display_cols].to_csv(index=False)
-    st.download_button(
-        label="📥 Download as CSV",
-        data=csv,
-        file_name='filtered_data.csv',
-        mime='text/csv'
-    )
+    # Display only the current page
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page:", PAGE_SIZES, index=1)
+    with col2:
+        page_number = st.number_input("Page:", min_value=1,
+                                      max_value=page_count(len(order), page_size),
+                                      value=1, step=1)
+    start, stop = page_bounds(len(order), page_number, page_size)
+    show_table(df_filtered.iloc[order[start:stop]][display_cols], "explorer.page",
+               use_container_width=True, height=400)
+    st.caption(f"Rows {min(start + 1, stop)}–{stop} of {len(order)}")
+    
+    # Download buttons: files are only built when clicked
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download as CSV",
+            data=lambda: export_csv(df_filtered, display_cols, order),
+            file_name='filtered_data.csv',
+            mime='text/csv'
+        )
+    with col2:
+        st.download_button(
+            label="📥 Download as Parquet",
+            data=lambda: export_parquet(df_filtered, display_cols, order),
+            file_name='filtered_data.parquet',
+            mime='application/octet-stream'
+        )
     
     # Statistics
     st.markdown("---")
@@ -242,18 +397,18 @@ elif page == "📊 Data Explorer":
     
     with col1:
         st.write("**Numeric Summary:**")
-        st.dataframe(df_display[display_cols].describe().round(2))
+        show_table(df_filtered[display_cols].describe().round(2), "explorer.summary")
     
     with col2:
         st.write("**Categorical Summary:**")
         if 'area_type' in display_cols:
-            st.write(df_display['area_type'].value_counts())
+            st.write(df_filtered['area_type'].value_counts())
         if 'investment_category' in display_cols:
-            st.write(df_display['investment_category'].value_counts())
+            st.write(df_filtered['investment_category'].value_counts())
     
     with col3:
         st.write("**Missing Values:**")
-        missing = df_display[display_cols].isnull().sum()
+        missing = df_filtered[display_cols].isnull().sum()
         if missing.sum() > 0:
             st.write(missing[missing > 0])
         else:
@@ -298,20 +453,40 @@ elif page == "🎯 Investment Finder":
         
         max_risk = st.slider("Maximum Risk Score:",
                             min_value=0, max_value=100, value=50)
+        
+        # A radius only means something once some areas have positions of their own
+        geo_index = get_geo_index(DATA_VERSION)
+        near, radius_km = "", None
+        if geo_index.exact.any():
+            near = st.text_input("Near (pincode or city, optional):", "")
+            radius_km = st.slider("Within (km):", min_value=1, max_value=100, value=15)
+        else:
+            st.caption("📍 Proximity is city-level only: no area's pincode is in the bundled "
+                       "pincode table, so use Preferred Cities to search by location.")
     
     # Find button
     if st.button("🔍 Find Investment Opportunities", type="primary"):
         
-        # Apply criteria
-        results = df[
-            (df['monthly_rent'] <= budget) &
-            (df['economic_health_score'] >= min_score) &
-            (df['business_growth'].isin(preferred_growth)) &
-            (df['footfall_score'] >= min_footfall) &
-            (df['city'].isin(preferred_cities)) &
-            (df['locality_type'].isin(preferred_locality)) &
-            (df['risk_score'] <= max_risk)
-        ].sort_values('economic_health_score', ascending=False)
+        # Optional radius around a pincode or city, from the grid index
+        within = None
+        if near.strip():
+            try:
+                within, _ = geo_index.radius(*resolve_place(near, get_pincode_table()),
+                                             radius_km)
+            except KeyError:
+                st.warning(f"📍 Unknown pincode or city '{near}': showing matches anywhere.")
+            else:
+                city_level = int((~geo_index.exact[within]).sum())
+                if city_level:
+                    st.info(f"📍 {city_level} of the {len(within)} areas within {radius_km} km "
+                            "are only placed at their city centre (pincode not in the bundled "
+                            "table): for those the radius is a city-level match.")
+        
+        # Apply criteria (shared with the query service)
+        with run_profile.span("finder.query", rows=len(df)):
+            results = df.iloc[finder_rows(df, budget, min_score, preferred_growth, min_footfall,
+                                          preferred_cities, preferred_locality, max_risk,
+                                          within=within)]
         
         st.markdown("---")
         
@@ -337,6 +512,20 @@ elif page == "🎯 Investment Finder":
                     
                     st.write(f"**Recommended Business:** {row['recommended_business']}")
                     st.write(f"**Area Type:** {row['area_type']} - {row['locality_type']}")
+                    
+                    # Areas at a city centre share one point: no neighbours or distances
+                    if geo_index.exact[idx]:
+                        nearby, distances = geo_index.nearest(
+                            geo_index.lat[idx], geo_index.lon[idx], 3, exclude=idx)
+                        placed = geo_index.exact[nearby]
+                        nearby, distances = nearby[placed], distances[placed]
+                        if len(nearby):
+                            names = df['area_name'].to_numpy()[nearby]
+                            st.write("**Nearby areas:** " + ", ".join(
+                                f"{name} ({km:.1f} km)" for name, km in zip(names, distances)))
+                    elif geo_index.exact.any():
+                        st.caption("📍 Located at city level only, so nearby areas "
+                                   "are not shown.")
         else:
             st.error("❌ No areas match your criteria. Try relaxing some filters.")
 
@@ -344,6 +533,8 @@ elif page == "🎯 Investment Finder":
 # PAGE 4: ANALYTICS
 
 elif page == "📈 Analytics":
+    import plotly.express as px
+    from hyperlocal.charts import CATEGORY_COLORS, scatter_figure
     
     st.subheader("📈 Advanced Analytics")
     
@@ -357,14 +548,20 @@ elif page == "📈 Analytics":
                        'footfall_score', 'infrastructure_score', 'property_value_score',
                        'monthly_rent', 'pedestrian_count_15min']
         
-        corr_matrix = df_filtered[numeric_cols].corr()
+        stats = get_sufficient_stats(DATA_VERSION)
+        if stats.supports(score_range):
+            corr_matrix = stats.corr(score_range, city=cities, area_type=area_types)
+        else:
+            corr_matrix = run_profile.cached(agg_cache, f"{selection}:corr",
+                                             lambda: correlation_matrix(df_filtered, numeric_cols),
+                                             "analytics.corr")
         
         fig = px.imshow(corr_matrix, 
                        text_auto='.2f',
                        color_continuous_scale='RdBu_r',
                        aspect='auto')
         fig.update_layout(height=600)
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, "analytics.corr")
         
         # Scatter plots
         col1, col2 = st.columns(2)
@@ -374,66 +571,60 @@ elif page == "📈 Analytics":
         with col2:
             y_var = st.selectbox("Y-axis:", numeric_cols, index=0)
         
-        fig = px.scatter(df_filtered, x=x_var, y=y_var, 
-                        color='area_type', size='economic_health_score',
-                        hover_data=['area_name', 'city'],
-                        trendline="ols")
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        # Downsampled above SCATTER_MAX_POINTS rows; trend lines from the cell sums
+        trendlines = (stats.trendlines(x_var, y_var, 'area_type', score_range,
+                                       city=cities, area_type=area_types)
+                      if stats.supports(score_range) else True)
+        fig = run_profile.cached(agg_cache, f"{selection}:fig:scatter:{x_var}:{y_var}", lambda: scatter_figure(
+            df_filtered, x_var, y_var, color='area_type', size='economic_health_score',
+            hover=['area_name', 'city'], trendline=trendlines).update_layout(height=500),
+            "analytics.scatter")
+        show_chart(fig, "analytics.scatter")
     
     # TAB 2: Geographic
     with tab2:
         st.write("### Geographic Analysis")
         
         # City comparison
-        city_stats = df_filtered.groupby('city').agg({
-            'economic_health_score': 'mean',
-            'monthly_rent': 'mean',
-            'property_price_sqft': 'mean',
-            'area_id': 'count'
-        }).round(2)
-        city_stats.columns = ['Avg Score', 'Avg Rent', 'Avg Price/sqft', 'Count']
-        city_stats = city_stats.sort_values('Avg Score', ascending=False)
+        city_stats = run_profile.cached(agg_cache, f"{selection}:city_stats",
+                                        lambda: compute_city_stats(df_filtered),
+                                        "analytics.city_stats")
         
         fig = px.bar(city_stats.reset_index(), x='city', y='Avg Score',
                     color='Avg Score', color_continuous_scale='RdYlGn')
         fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, "analytics.city_stats")
         
-        st.dataframe(city_stats, use_container_width=True)
+        show_table(city_stats, "analytics.city_stats", use_container_width=True)
     
     # TAB 3: Risk-Return
     with tab3:
         st.write("### Risk-Return Analysis")
         
-        fig = px.scatter(df_filtered, x='risk_score', y='expected_return',
-                        color='investment_category', size='economic_health_score',
-                        hover_data=['area_name', 'city'],
-                        color_discrete_map={
-                            'High Potential': 'green',
-                            'Moderate Potential': 'orange',
-                            'Low Potential': 'red'
-                        })
-        
-        # Add quadrant lines
-        fig.add_hline(y=df_filtered['expected_return'].median(), 
-                     line_dash="dash", line_color="gray")
-        fig.add_vline(x=df_filtered['risk_score'].median(), 
-                     line_dash="dash", line_color="gray")
+        risk_return = run_profile.cached(agg_cache, f"{selection}:risk_return",
+                                         lambda: risk_return_aggregates(df_filtered),
+                                         "analytics.risk_return")
         
-        fig.update_layout(height=600)
-        st.plotly_chart(fig, use_container_width=True)
+        def risk_return_figure():
+            fig = scatter_figure(df_filtered, 'risk_score', 'expected_return',
+                                 color='investment_category', size='economic_health_score',
+                                 hover=['area_name', 'city'], color_map=CATEGORY_COLORS)
+            
+            # Add quadrant lines
+            fig.add_hline(y=risk_return['return_median'], 
+                         line_dash="dash", line_color="gray")
+            fig.add_vline(x=risk_return['risk_median'], 
+                         line_dash="dash", line_color="gray")
+            
+            return fig.update_layout(height=600)
         
-        # Best opportunities
-        best = df_filtered[
-            (df_filtered['risk_score'] < df_filtered['risk_score'].median()) &
-            (df_filtered['expected_return'] > df_filtered['expected_return'].median())
-        ].nlargest(10, 'expected_return')
+        fig = run_profile.cached(agg_cache, f"{selection}:fig:risk_return", risk_return_figure,
+                                 "analytics.risk_return_figure")
+        show_chart(fig, "analytics.risk_return")
         
+        # Best opportunities
         st.write("#### 🌟 Best Opportunities (Low Risk + High Return)")
-        st.dataframe(best[['area_name', 'city', 'economic_health_score', 
-                          'risk_score', 'expected_return']], 
-                    use_container_width=True)
+        show_table(risk_return['best'], "analytics.risk_return", use_container_width=True)
 
 
 # PAGE 5: BUSINESS RECOMMENDER
@@ -447,10 +638,7 @@ elif page == "💼 Business Recommender":
     col1, col2 = st.columns(2)
     
     with col1:
-        business_type = st.selectbox("Business Type:",
-                                    ['Restaurant/Cafe', 'Retail Shop', 'Gym/Fitness',
-                                     'Education/Coaching', 'Healthcare/Clinic', 
-                                     'Salon/Spa', 'Co-working Space', 'Other Service'])
+        business_type = st.selectbox("Business Type:", list(PROFILES))
         
         investment_budget = st.number_input("Total Investment Budget (₹ Lakhs):",
                                            min_value=5, max_value=100, value=20)
@@ -469,33 +657,43 @@ elif page == "💼 Business Recommender":
                                      ['Urban', 'Semi-Urban', 'Rural', 'Any'])
         
         priority = st.radio("Priority:",
-                           ['High Footfall', 'Low Rent', 'Balanced'])
+                           ['Fastest Payback', 'Customer Fit', 'High Footfall', 'Low Rent',
+                            'Balanced'])
     
     if st.button("🎯 Get Recommendations", type="primary"):
         
-        # Filter logic based on business type
-        if preferred_area != 'Any':
-            recommendations = df[df['area_type'] == preferred_area]
-        else:
-            recommendations = df.copy()
-        
-        recommendations = recommendations[
-            recommendations['monthly_rent'] <= monthly_budget
-        ]
-        
-        # Sort based on priority
-        if priority == 'High Footfall':
-            recommendations = recommendations.sort_values('footfall_score', ascending=False)
-        elif priority == 'Low Rent':
-            recommendations = recommendations.sort_values('monthly_rent', ascending=True)
-        else:
-            recommendations = recommendations.sort_values('economic_health_score', ascending=False)
+        with run_profile.span("recommender.query", rows=len(df)):
+            # Candidate areas: preferred area type within the monthly budget
+            candidates = df['monthly_rent'].to_numpy() <= monthly_budget
+            if preferred_area != 'Any':
+                candidates &= (df['area_type'] == preferred_area).to_numpy()
+            
+            # Revenue, payback and customer fit for every area in one pass
+            profile = PROFILES[business_type].with_customers(target_customers)
+            result = score_profiles(df, [profile], investment=investment_budget * 100000)
+            
+            # Rank the candidates by the engine's payback or fit, or by a plain column sort
+            if priority == 'Fastest Payback':
+                top = top_areas(result['roi_months'], 3, mask=candidates)[0]
+            elif priority == 'Customer Fit':
+                top = top_areas(result['customer_fit'], 3, largest=True, mask=candidates)[0]
+            else:
+                recommendations = df[candidates]
+                if priority == 'High Footfall':
+                    recommendations = recommendations.sort_values('footfall_score', ascending=False)
+                elif priority == 'Low Rent':
+                    recommendations = recommendations.sort_values('monthly_rent', ascending=True)
+                else:
+                    recommendations = recommendations.sort_values('economic_health_score', ascending=False)
+                top = df.index.get_indexer(recommendations.index[:3])
+            positions = top[top >= 0]
         
         st.markdown("---")
-        st.success(f"📍 Found {len(recommendations)} suitable locations!")
+        st.success(f"📍 Found {int(candidates.sum())} suitable locations!")
         
         # Display top 3 recommendations
-        for i, (idx, row) in enumerate(recommendations.head(3).iterrows(), 1):
+        for i, pos in enumerate(positions, 1):
+            row = df.iloc[pos]
             with st.container():
                 st.write(f"## Recommendation #{i}")
                 
@@ -518,17 +716,202 @@ elif page == "💼 Business Recommender":
                     st.metric("⚠️ Risk Score", f"{row['risk_score']:.1f}")
                 
                 st.write(f"**Why this location:** {row['recommended_business']}")
+                st.write(f"**Customer Fit:** {result['customer_fit'][0, pos]:.0f}/100")
                 
-                # Calculate ROI estimate
-                estimated_customers = row['avg_daily_customers'] * 0.8 # 80% capture
-                estimated_revenue = estimated_customers * 30 * 500 # Assuming ₹500 avg transaction
-                roi_months = (investment_budget * 100000) / (estimated_revenue - row['monthly_rent'])
+                # ROI estimate from the business profile
+                estimated_revenue = result['revenue'][0, pos]
+                roi_months = result['roi_months'][0, pos]
                 
                 st.write(f"**Estimated Monthly Revenue:** ₹{estimated_revenue:,.0f}")
-                st.write(f"**Estimated ROI Period:** {roi_months:.1f} months")
+                if np.isfinite(roi_months):
+                    st.write(f"**Estimated ROI Period:** {roi_months:.1f} months")
+                else:
+                    st.write("**Estimated ROI Period:** not reached (revenue does not cover rent)")
                 
                 st.markdown("---")
 
+
+# PAGE 6: SIMILAR AREAS
+
+elif page == "🧬 Similar Areas":
+    from hyperlocal.charts import scatter_figure
+    
+    st.subheader("🧬 Similar Areas")
+    st.caption("Areas compared on their eight sub-scores, across all locations "
+               "(the sidebar filters do not apply here).")
+    similarity = get_similarity_index(DATA_VERSION)
+    
+    tab1, tab2 = st.tabs(["🔁 More Like This", "🧩 Clusters"])
+    
+    # TAB 1: nearest areas in sub-score space
+    with tab1:
+        query = st.text_input("Find areas like:", "Sector 17 Market")
+        matches, _ = get_search_index(DATA_VERSION).search(query, limit=SIMILAR_MATCHES)
+        if len(matches) == 0:
+            st.warning("No area matches that name.")
+        else:
+            names, area_cities = df['area_name'].to_numpy(), df['city'].to_numpy()
+            anchor = st.selectbox("Area:", matches,
+                                  format_func=lambda row: f"{names[row]}, {area_cities[row]}")
+            k = st.slider("Number of similar areas:", min_value=5, max_value=50, value=10)
+            
+            with run_profile.span("similar.query", rows=len(similarity)):
+                similar_rows, distances = similarity.similar(anchor, k)
+            table = df.iloc[similar_rows][['area_name', 'city', 'area_type', 'economic_health_score',
+                                   *SUBSCORE_COLUMNS]].assign(distance=distances.round(3))
+            show_table(table, "similar.results", use_container_width=True)
+    
+    # TAB 2: k-means groups, drawn on the first two principal components
+    with tab2:
+        n_clusters = st.slider("Number of clusters:", min_value=2, max_value=10, value=5)
+        with run_profile.span("similar.clusters", rows=len(similarity)):
+            labels, _ = similarity.clusters(n_clusters)
+            cluster_table = similarity.cluster_table(n_clusters)
+        show_table(cluster_table, "similar.clusters", use_container_width=True)
+        
+        projection = similarity.projection()
+        points = df[['area_name', 'city']].assign(
+            component_1=projection[:, 0], component_2=projection[:, 1],
+            cluster=[f"Cluster {label + 1}" for label in labels])
+        fig = agg_cache.get(f"{DATA_VERSION}:fig:clusters:{n_clusters}", lambda: scatter_figure(
+            points, 'component_1', 'component_2', color='cluster',
+            hover=['area_name', 'city']).update_layout(height=500))
+        show_chart(fig, "similar.clusters")
+
+
+# PAGE 7: SCENARIOS
+
+elif page == "🎛️ Scenarios":
+    
+    st.subheader("🎛️ What-If Scenarios")
+    st.caption("Re-score every location with your own weights and thresholds "
+               "(the sidebar filters do not apply here).")
+    scenario_matrix = get_scenario_matrix(DATA_VERSION)
+    saved = st.session_state.setdefault("scenarios", {})
+    
+    def label(col):
+        return col.replace('_score', '').replace('_', ' ').title()
+    
+    with st.expander("⚖️ Health Score Weights", expanded=True):
+        weight_cols = st.columns(4)
+        weights = {}
+        for i, col in enumerate(SCENARIO_COLUMNS[:-1]):
+            with weight_cols[i % 4]:
+                weights[col] = st.slider(label(col), 0.0, 0.5, float(WEIGHTS.get(col, 0.0)),
+                                         0.01, key=f"scenario_weight_{col}")
+        st.caption(f"Weights sum to {sum(weights.values()):.2f} (1.00 in the baseline).")
+    
+    with st.expander("🏷️ Thresholds, Risk and Return"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            moderate, high = st.slider("Moderate / High Potential from:", 0, 100,
+                                       (MODERATE_THRESHOLD, HIGH_THRESHOLD))
+        with col2:
+            risk_weights = {col: st.slider(f"Risk: {label(col)}"
+                                           + ("" if col == 'vacancy_rate' else " shortfall"),
+                                           0.0, 1.0, float(weight), 0.05)
+                            for col, weight in RISK_WEIGHTS.items()}
+        with col3:
+            return_weights = {col: st.slider(f"Return: {label(col)}", 0.0, 1.0, float(weight), 0.05)
+                              for col, weight in RETURN_WEIGHTS.items()}
+    
+    scenario = Scenario("Current", weights, high, moderate, risk_weights, return_weights)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        scenario_name = st.text_input("Scenario name:", f"Scenario {len(saved) + 1}")
+    with col2:
+        st.write("")
+        if st.button("💾 Save Scenario"):
+            saved[scenario_name] = replace(scenario, name=scenario_name)
+    
+    # Baseline, the current edit and every saved scenario in one pass
+    scenarios = [BASELINE, scenario, *saved.values()]
+    with run_profile.span("scenarios.rescore", rows=len(scenario_matrix) * len(scenarios)):
+        result = scenario_matrix.rescore(scenarios)
+        counts = category_counts(result)
+        health = result[HEALTH_COLUMN]
+        top = top_areas(health[1], 10, largest=True)[0]
+        top = top[top >= 0]
+        rank, baseline_rank = score_ranks(health[1], top), score_ranks(health[0], top)
+    
+    st.markdown("---")
+    metric_cols = st.columns(4)
+    for i, category in enumerate(CATEGORIES):
+        metric_cols[i].metric(category, f"{counts[1, i]:,}",
+                              delta=f"{counts[1, i] - counts[0, i]:+,}")
+    metric_cols[3].metric("Avg Health Score", f"{np.nanmean(health[1]):.1f}",
+                          delta=f"{np.nanmean(health[1]) - np.nanmean(health[0]):+.1f}")
+    
+    st.write("### 🏆 Top 10 Under This Scenario")
+    top_table = df.iloc[top][['area_name', 'city', 'area_type', 'locality_type']].assign(
+        score=health[1, top], category=np.array(CATEGORIES)[result['category'][1, top]],
+        risk=result['risk_score'][1, top], expected_return=result['expected_return'][1, top],
+        baseline_score=health[0, top], rank=rank, baseline_rank=baseline_rank,
+        rank_change=baseline_rank - rank)
+    show_table(top_table, "scenarios.top", use_container_width=True, hide_index=True)
+    
+    st.write("### 📋 Scenarios Side by Side")
+    means = {key: np.nanmean(result[key], axis=1)
+             for key in (HEALTH_COLUMN, 'risk_score', 'expected_return')}
+    best = top_areas(health, 1, largest=True)[:, 0]
+    comparison = {
+        'scenario': [s.name for s in scenarios],
+        **{category: counts[:, i] for i, category in enumerate(CATEGORIES)},
+        'avg_score': means[HEALTH_COLUMN].round(2),
+        'avg_risk': means['risk_score'].round(2),
+        'avg_return': means['expected_return'].round(2),
+        'top_area': [df['area_name'].iat[row] if row >= 0 else None for row in best],
+    }
+    show_table(comparison, "scenarios.compare", use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Download Saved Scenarios",
+                           json.dumps([s.to_dict() for s in saved.values()], indent=2),
+                           "scenarios.json", "application/json", disabled=not saved)
+    with col2:
+        uploaded = st.file_uploader("Load scenarios (JSON):", type="json")
+        # The file stays in the uploader across reruns: apply each upload once
+        applied = st.session_state.setdefault("scenario_uploads", set())
+        if uploaded is not None and uploaded.file_id not in applied:
+            applied.add(uploaded.file_id)
+            try:
+                loaded = [Scenario.from_dict(item) for item in json.load(uploaded)]
+            except (TypeError, ValueError) as exc:
+                st.error(f"Could not load scenarios: {exc}")
+            else:
+                saved.update({s.name: s for s in loaded})
+                st.success(f"Loaded {len(loaded)} scenarios.")
+
+
+# PAGE 8: DIAGNOSTICS (only listed when profiling is on)
+
+elif page == "🩺 Diagnostics":
+    st.subheader("🩺 Diagnostics")
+    metrics = get_metrics()
+    st.caption(f"Profiled runs of this process: {metrics.runs}. Bytes sent are estimates "
+               "(frame memory, figure JSON); measuring them adds a serialization per figure.")
+    
+    st.write("### Previous run")
+    st.dataframe(metrics.last_run, use_container_width=True)
+    
+    st.write("### Totals since the process started")
+    st.dataframe(metrics.totals(), use_container_width=True)
+    
+    prometheus = metrics.prometheus_text()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Prometheus text", prometheus,
+                           file_name='hyperlocal_metrics.prom', mime='text/plain')
+    with col2:
+        st.download_button("📥 Previous run (JSON)", json.dumps(metrics.last_run),
+                           file_name='hyperlocal_profile.json', mime='application/json')
+    with st.expander("Prometheus text"):
+        st.code(prometheus, language=None)
+
+run_profile.finish()
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -537,3 +920,14 @@ st.markdown("""
     <p>Data updated: 2025 | Analyzing 200+ locations across Punjab-Haryana</p>
 </div>
 """, unsafe_allow_html=True)
+
+timer.mark("page")
+if PROFILING:
+    get_metrics().observe(run_profile)
+    log_run(run_profile, page=page, rows=len(df_filtered), total_seconds=timer.total)
+cold_start = get_cold_start()
+if not cold_start:
+    cold_start.update(timer.stages, total=timer.total)
+    startup_logger.info("cold start: %s", timer.summary())
+st.sidebar.caption(f"⏱️ This run: {timer.summary()}  \n"
+                   f"Cold start: {cold_start['total'] * 1000:.0f} ms")
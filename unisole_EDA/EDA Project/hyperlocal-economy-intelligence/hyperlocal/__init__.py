@@ -0,0 +1,19 @@
+"""Hyperlocal Economy Intelligence: data pipeline and query helpers for app.py."""
+
+from .pipeline import (
+    ScoringStats,
+    clean,
+    fit_stats,
+    impute,
+    run_pipeline,
+    score,
+)
+
+__all__ = [
+    "ScoringStats",
+    "clean",
+    "fit_stats",
+    "impute",
+    "run_pipeline",
+    "score",
+]
@@ -0,0 +1,125 @@
+"""Per-page aggregates, memoized on the sidebar filter state.
+
+The Overview and Analytics pages recompute group-bys, ``value_counts``,
+``nlargest`` and ``corr`` on every rerun even when the filters have not
+changed.  The functions here compute one page's aggregates from the filtered
+frame, and :class:`AggregateCache` keeps the results in a bounded LRU that
+app.py holds in ``st.cache_resource`` so every session shares it.
+
+Cached values are shared between sessions: treat returned frames as
+read-only.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+NUMERIC_CORR_COLUMNS = ['economic_health_score', 'business_density_score',
+                        'footfall_score', 'infrastructure_score', 'property_value_score',
+                        'monthly_rent', 'pedestrian_count_15min']
+
+
+def selection_key(version, cities, area_types, score_range):
+    """Stable hash of a sidebar selection (order of the picked values does not matter)."""
+    parts = (
+        version,
+        tuple(sorted(map(str, cities or ()))),
+        tuple(sorted(map(str, area_types or ()))),
+        tuple(float(v) for v in score_range),
+    )
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class AggregateCache:
+    """Thread-safe LRU of computed aggregates with hit/miss counters."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, compute):
+        """Cached value for ``key``, calling ``compute()`` on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Compute outside the lock so one slow page does not block the others
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a value computed elsewhere (e.g. loaded from a snapshot)."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def overview_aggregates(df_filtered, df):
+    """KPI values, category counts and the top 10 for the Overview page.
+
+    An empty selection gets zero shares and no ``top_city``.
+    """
+    total = len(df_filtered)
+    high_potential = int((df_filtered['investment_category'] == 'High Potential').sum())
+    city_means = df_filtered.groupby('city', observed=True)['economic_health_score'].mean().dropna()
+    return {
+        'total': total,
+        'share': total / len(df) * 100 if len(df) else 0.0,
+        'avg_score': df_filtered['economic_health_score'].mean(),
+        'overall_avg_score': df['economic_health_score'].mean(),
+        'high_potential': high_potential,
+        'high_potential_share': high_potential / total * 100 if total else 0.0,
+        'top_city': city_means.idxmax() if len(city_means) else None,
+        'category_counts': df_filtered['investment_category'].value_counts(),
+        'top_10': df_filtered.nlargest(10, 'economic_health_score'),
+    }
+
+
+def correlation_matrix(df_filtered, columns=NUMERIC_CORR_COLUMNS):
+    return df_filtered[columns].corr()
+
+
+def city_stats(df_filtered):
+    """Per-city means and counts for Analytics -> Geographic."""
+    stats = df_filtered.groupby('city', observed=True).agg({
+        'economic_health_score': 'mean',
+        'monthly_rent': 'mean',
+        'property_price_sqft': 'mean',
+        'area_id': 'count'
+    }).round(2)
+    stats.columns = ['Avg Score', 'Avg Rent', 'Avg Price/sqft', 'Count']
+    return stats.sort_values('Avg Score', ascending=False)
+
+
+def risk_return_aggregates(df_filtered):
+    """Quadrant medians and the low-risk / high-return top 10."""
+    risk_median = df_filtered['risk_score'].median()
+    return_median = df_filtered['expected_return'].median()
+    best = df_filtered[
+        (df_filtered['risk_score'] < risk_median) &
+        (df_filtered['expected_return'] > return_median)
+    ].nlargest(10, 'expected_return')
+    return {
+        'risk_median': risk_median,
+        'return_median': return_median,
+        'best': best[['area_name', 'city', 'economic_health_score',
+                      'risk_score', 'expected_return']],
+    }
@@ -0,0 +1,179 @@
+"""Correlations and regression lines from per-cell sufficient statistics.
+
+Analytics -> Correlations used to rescan the filtered frame with ``corr()``
+and refit a statsmodels OLS trend line whenever an axis changed.  Both only
+need counts, sums and cross-products, and those add up across disjoint row
+sets.  :class:`SufficientStats` computes them once per dataset for every
+cell of city x area type x health-score bin, so any sidebar selection is a
+sum over its cells:
+
+* the score bins are "exactly k" and "strictly between k and k + 1" for
+  every integer k, so an integer slider range covers whole bins;
+* statistics are pairwise-complete (row counted for a pair of columns only
+  when both values are present), which is what ``DataFrame.corr`` does;
+* values are shifted by the column mean before summing to keep the
+  one-pass formulas accurate.
+
+Only occupied cells are stored, as one row each of a cell table (the
+cell's category codes and score bin, then its moments), so the memory
+follows the number of distinct cells in the data, at most the row count,
+not the size of the full city x area type x bin grid.  A selection masks
+the table's rows and sums them.
+
+Selections that do not line up with the cells (a fractional score range)
+are answered by :meth:`SufficientStats.supports` returning False; callers
+fall back to scanning the rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import NUMERIC_CORR_COLUMNS
+from .filters import CATEGORY_FILTERS, SCORE_FILTER
+
+
+class SufficientStats:
+    """Pairwise counts, sums and cross-products per occupied filter cell."""
+
+    def __init__(self, df, columns=NUMERIC_CORR_COLUMNS, category_columns=CATEGORY_FILTERS,
+                 score_column=SCORE_FILTER):
+        self.columns = list(columns)
+        self._labels = pd.Index(self.columns)
+        self.category_columns = list(category_columns)
+        self._position = {col: i for i, col in enumerate(self.columns)}
+
+        # Cell coordinates: one axis per category (last slot = missing) + score bin
+        self._lookup, self.options, shape, coords = {}, {}, [], []
+        for col in self.category_columns:
+            values = pd.Categorical(df[col])
+            self.options[col] = list(values.categories)
+            self._lookup[col] = {value: i for i, value in enumerate(values.categories)}
+            codes = values.codes.astype(np.intp)
+            coords.append(np.where(codes < 0, len(values.categories), codes))
+            shape.append(len(values.categories) + 1)
+        scores = df[score_column].to_numpy(dtype="float64")
+        finite = np.isfinite(scores)
+        self._base = int(np.floor(scores[finite].min())) if finite.any() else 0
+        top = int(np.floor(scores[finite].max())) if finite.any() else 0
+        self._n_bins = 2 * (top - self._base) + 2
+        floor = np.floor(np.where(finite, scores, self._base))
+        bins = 2 * (floor - self._base).astype(np.intp) + (scores != floor)
+        coords.append(np.where(finite, bins, self._n_bins))  # last bin: missing score
+        shape.append(self._n_bins + 1)
+        cells = np.ravel_multi_index(coords, shape)
+
+        values = df[self.columns].to_numpy(dtype="float64")
+        present = np.isfinite(values)
+        self.shift = np.nanmean(np.where(present, values, np.nan), axis=0) if len(values) else 0
+        self.shift = np.nan_to_num(self.shift)
+        centred = np.where(present, values - self.shift, 0.0)
+        mask = present.astype("float64")
+
+        p = len(self.columns)
+        order = np.argsort(cells, kind="stable")
+        sorted_cells = cells[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        stops = np.r_[starts[1:], len(order)]
+        # One row per occupied cell: its coordinates, then its statistics
+        self._coords = np.stack(np.unravel_index(sorted_cells[starts], shape), axis=1)
+        # count, sum, sum of squares and cross-product matrices
+        self._moments = np.empty((len(starts), 4, p, p))
+        self._min = np.empty((len(starts), p))
+        self._max = np.empty((len(starts), p))
+        for cell, (start, stop) in enumerate(zip(starts, stops)):
+            rows = order[start:stop]
+            x, m = centred[rows], mask[rows]
+            self._moments[cell] = (m.T @ m,
+                                   x.T @ m,          # [i, j]: sum of column i where j is present
+                                   (x * x).T @ m,
+                                   x.T @ x)
+            raw = values[rows]
+            self._min[cell] = np.where(present[rows], raw, np.inf).min(axis=0)
+            self._max[cell] = np.where(present[rows], raw, -np.inf).max(axis=0)
+
+    @property
+    def nbytes(self):
+        """Memory held by the cell table."""
+        return self._coords.nbytes + self._moments.nbytes + self._min.nbytes + self._max.nbytes
+
+    def supports(self, score_range):
+        """True when ``score_range`` covers whole score bins (integer bounds or None)."""
+        return score_range is None or all(float(v).is_integer() for v in score_range)
+
+    def _bins(self, score_range):
+        """[first, stop) score-bin range of ``score_range``."""
+        if score_range is None:
+            return 0, self._n_bins + 1
+        if not self.supports(score_range):
+            raise ValueError("score_range bounds must be whole numbers; scan the rows instead")
+        low, high = (int(v) for v in score_range)
+        first = min(max(0, 2 * (low - self._base)), self._n_bins)
+        last = min(self._n_bins - 1, 2 * (high - self._base))
+        return first, max(first, last + 1)
+
+    def _cells(self, score_range, categories):
+        """Mask of the occupied cells inside the selection."""
+        first, stop = self._bins(score_range)
+        bins = self._coords[:, -1]
+        selected = (bins >= first) & (bins < stop)
+        for axis, col in enumerate(self.category_columns):
+            chosen = categories.get(col)
+            if chosen:
+                codes = [self._lookup[col][v] for v in chosen if v in self._lookup[col]]
+                selected &= np.isin(self._coords[:, axis], codes)
+        return selected
+
+    def moments(self, score_range=None, **categories):
+        """Summed (count, sum, sum of squares, cross-product) matrices of a selection."""
+        return tuple(self._moments[self._cells(score_range, categories)].sum(axis=0))
+
+    def corr(self, score_range=None, **categories):
+        """Pearson correlation matrix of the selection, like ``df[columns].corr()``."""
+        n, s, q, cross = self.moments(score_range, **categories)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = cross - s * s.T / n
+            var_i = q - s * s / n
+            result = covariance / np.sqrt(var_i * var_i.T)
+        defined = (n > 1) & (var_i > 0) & (var_i.T > 0)
+        result = np.where(defined, np.clip(result, -1, 1), np.nan)
+        np.fill_diagonal(result, np.where(np.diag(defined), 1.0, np.nan))
+        return pd.DataFrame(result, index=self._labels, columns=self._labels)
+
+    def ols(self, x, y, score_range=None, **categories):
+        """``(slope, intercept)`` of y on x over the selection, or None if undefined."""
+        i, j = self._position[x], self._position[y]
+        n, s, q, cross = self.moments(score_range, **categories)
+        n, sx, sy, sxx, sxy = n[i, j], s[i, j], s[j, i], q[i, j], cross[i, j]
+        if n < 2:
+            return None
+        var_x = sxx - sx * sx / n
+        if var_x <= 1e-12 * max(sxx, 1.0):
+            return None
+        slope = (sxy - sx * sy / n) / var_x
+        mean_x, mean_y = sx / n + self.shift[i], sy / n + self.shift[j]
+        return slope, mean_y - slope * mean_x
+
+    def x_range(self, x, score_range=None, **categories):
+        """(min, max) of column ``x`` over the selection, or None if it has no values."""
+        i = self._position[x]
+        cells = self._cells(score_range, categories)
+        lo = self._min[cells, i].min(initial=np.inf)
+        hi = self._max[cells, i].max(initial=-np.inf)
+        return (lo, hi) if lo <= hi else None
+
+    def trendlines(self, x, y, by, score_range=None, **categories):
+        """One OLS line per value of category column ``by``, as ``scatter_figure`` takes them.
+
+        Returns ``{label: (slope, intercept, x_low, x_high)}``; the x range is
+        that of the column itself within the group.
+        """
+        lines = {}
+        for label in categories.get(by) or self.options[by]:
+            if label not in self._lookup[by]:
+                continue
+            group = {**categories, by: [label]}
+            fit = self.ols(x, y, score_range, **group)
+            bounds = self.x_range(x, score_range, **group)
+            if fit is not None and bounds is not None:
+                lines[label] = (*fit, *bounds)
+        return lines
@@ -0,0 +1,251 @@
+"""Benchmarks of the scoring pipeline and the dashboard's hot paths.
+
+Each run generates a synthetic survey (:mod:`hyperlocal.synthetic`) of the
+requested size, times every pipeline stage on it, writes the processed
+store to a scratch app directory and times what a dashboard session does
+with it: loading, sidebar filtering, the page aggregates, the search index,
+the Investment Finder, the recommender, the report packs and the warm-start
+snapshot::
+
+    python -m hyperlocal.bench --rows 10000 1000000 --knn tree
+
+Every case reports the minimum and median of ``--repeat`` runs in
+milliseconds.  Runs are appended as JSON lines to :data:`HISTORY_PATH`
+(with the commit, machine and parameters), and each run is compared with
+the median of the last :data:`WINDOW` comparable runs: same rows, seed,
+neighbour imputer and machine.  ``--check`` exits with status 1 when a
+case got slower than :data:`THRESHOLD` times that baseline (plus
+:data:`SLACK_MS`, so sub-millisecond cases do not flap).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import city_stats, overview_aggregates, risk_return_aggregates
+from .analytics import SufficientStats
+from .charts import binned_counts, sample_positions
+from .export import sort_positions
+from .filters import FilterIndex
+from .pipeline import APP_DIR, KNN_BLOCK_KEYS, clean, impute, knn_impute, score
+from .queries import finder_index, finder_rows
+from .recommender import PROFILES, score_profiles, top_areas
+from .reports import build_reports, write_reports
+from .search import AreaSearchIndex
+from .shared import open_shared, take_rows
+from .snapshot import build_snapshot, default_selection, load_snapshot, save_snapshot
+from .store import PROCESSED_PARQUET, dataset_version, load_processed, write_store
+from .synthetic import write_raw_csv
+
+HISTORY_PATH = APP_DIR / "benchmarks" / "history.jsonl"
+DEFAULT_ROWS = 10_000
+REPEAT = 3
+WINDOW = 5
+THRESHOLD = 1.25
+SLACK_MS = 2.0
+SEARCH_QUERY = "model town"
+
+
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, {"min_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3)}
+
+
+def _imputer(knn):
+    if knn == "tree":
+        from .neighbours import tree_knn_impute
+
+        return partial(tree_knn_impute, by=KNN_BLOCK_KEYS, workers=1)
+    return knn_impute
+
+
+def machine_info():
+    return {"host": platform.node(), "cpus": os.cpu_count(), "machine": platform.machine(),
+            "python": platform.python_version(), "pandas": pd.__version__,
+            "numpy": np.__version__}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, seed=0, repeat=REPEAT, knn="exact", workdir=None):
+    """Time every case on a synthetic survey of ``rows`` areas; returns one history record."""
+    with tempfile.TemporaryDirectory(dir=workdir, prefix="hyperlocal-bench-") as scratch:
+        scratch = Path(scratch)
+        results = {}
+
+        def case(name, fn, times=repeat):
+            value, results[name] = _timed(fn, times)
+            return value
+
+        raw_path = write_raw_csv(scratch / "raw.csv", rows, seed)
+
+        # Pipeline stages
+        raw = case("pipeline.read_csv", lambda: pd.read_csv(raw_path))
+        cleaned = case("pipeline.clean", lambda: clean(raw))
+        imputed = case("pipeline.impute", lambda: impute(cleaned, _imputer(knn)))
+        processed = case("pipeline.score", lambda: score(imputed))
+
+        # Store and load_data
+        case("store.write", lambda: write_store(processed, scratch / PROCESSED_PARQUET.name))
+        version = dataset_version(scratch)
+        shared_root = scratch / "shared"
+        case("load.processed", lambda: load_processed(app_dir=scratch))
+        case("load.shared_export", lambda: open_shared(version=version, root=shared_root,
+                                                       app_dir=scratch), times=1)
+        df = case("load.shared", lambda: open_shared(version=version, root=shared_root,
+                                                     app_dir=scratch))
+
+        # Sidebar filters
+        index = case("sidebar.index", lambda: FilterIndex(df))
+        cities, area_types, score_range = default_selection(index.options)
+        selected = case("sidebar.select", lambda: index.select(
+            score_range=score_range, city=cities, area_type=area_types))
+        df_filtered = case("sidebar.take_rows", lambda: take_rows(df, selected))
+
+        # Pages
+        case("overview.aggregates", lambda: overview_aggregates(df_filtered, df))
+        case("overview.histogram", lambda: binned_counts(
+            df_filtered["economic_health_score"], df_filtered["investment_category"]))
+        search = case("explorer.search_index", lambda: AreaSearchIndex(df["area_name"]))
+        case("explorer.search", lambda: search.row_mask(SEARCH_QUERY))
+        case("explorer.sort", lambda: sort_positions(
+            df_filtered["economic_health_score"].to_numpy(), ascending=False))
+        stats = case("analytics.sufficient_stats", lambda: SufficientStats(df))
+        case("analytics.corr", lambda: stats.corr(score_range, city=cities, area_type=area_types))
+        case("analytics.city_stats", lambda: city_stats(df_filtered))
+        case("analytics.risk_return", lambda: risk_return_aggregates(df_filtered))
+        case("analytics.scatter_sample", lambda: sample_positions(
+            df_filtered["footfall_score"], df_filtered["economic_health_score"]))
+        finder = case("finder.index", lambda: finder_index(df))
+        case("finder.rows", lambda: finder_rows(
+            df, 50000, 60, ["Growing", "Stable"], 50, cities, ["Commercial", "Mixed"], 50,
+            index=finder))
+        scored = case("recommender.score_profiles", lambda: score_profiles(
+            df, PROFILES.values(), investment=1_000_000))
+        case("recommender.top_areas", lambda: top_areas(scored["roi_months"], 10))
+        reports = case("reports.build", lambda: build_reports(df, by_city=True))
+        case("reports.write", lambda: write_reports(reports, scratch / "reports"))
+
+        # Warm-start snapshot
+        loader = partial(open_shared, root=shared_root, app_dir=scratch)
+        snapshot = case("snapshot.build", lambda: build_snapshot(version, loader))
+        snapshot_path = save_snapshot(snapshot, scratch / "bench.snapshot.pkl")
+        case("snapshot.load", lambda: load_snapshot(version, snapshot_path, loader))
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "machine": machine_info(),
+        "rows": rows,
+        "seed": seed,
+        "knn": knn,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def read_history(path=HISTORY_PATH):
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(record, path=HISTORY_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return path
+
+
+def _comparable(a, b):
+    return (a["rows"] == b["rows"] and a["seed"] == b["seed"] and a["knn"] == b["knn"]
+            and a["machine"].get("host") == b["machine"].get("host")
+            and a["machine"].get("cpus") == b["machine"].get("cpus"))
+
+
+def find_regressions(record, history, window=WINDOW, threshold=THRESHOLD, slack_ms=SLACK_MS):
+    """Cases of ``record`` slower than ``threshold`` x the median of recent comparable runs.
+
+    Returns ``{case: {"baseline_ms", "median_ms", "ratio"}}``; cases with no
+    comparable history are skipped.
+    """
+    previous = [r for r in history if _comparable(r, record)][-window:]
+    regressions = {}
+    for name, result in record["results"].items():
+        past = [r["results"][name]["median_ms"] for r in previous if name in r["results"]]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        if result["median_ms"] > baseline * threshold + slack_ms:
+            regressions[name] = {"baseline_ms": baseline, "median_ms": result["median_ms"],
+                                 "ratio": round(result["median_ms"] / max(baseline, 1e-9), 2)}
+    return regressions
+
+
+def format_results(record, regressions=()):
+    lines = [f" {record['rows']} areas, knn={record['knn']}, repeat={record['repeat']}"]
+    for name, result in record["results"].items():
+        flag = "  REGRESSION" if name in regressions else ""
+        lines.append(f"   {name:<28} {result['median_ms']:>10.1f} ms "
+                     f"(min {result['min_ms']:.1f}){flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline and dashboard queries.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[DEFAULT_ROWS],
+                        help="synthetic survey sizes to run, e.g. 10000 1000000 10000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per case")
+    parser.add_argument("--knn", choices=["exact", "tree"], default="exact",
+                        help="neighbour imputer for the impute stage ('tree' for large surveys)")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH, help="JSON lines history file")
+    parser.add_argument("--no-record", action="store_true", help="do not append to the history")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="slowdown ratio against the recent median that counts as a regression")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    args = parser.parse_args(argv)
+
+    regressed = False
+    for rows in args.rows:
+        history = read_history(args.history)
+        record = run_benchmarks(rows, args.seed, args.repeat, args.knn)
+        regressions = find_regressions(record, history, threshold=args.threshold)
+        print(format_results(record, regressions))
+        if not args.no_record:
+            append_history(record, args.history)
+        regressed |= bool(regressions)
+    if regressed:
+        print(" Regressions against the recent history are flagged above.")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
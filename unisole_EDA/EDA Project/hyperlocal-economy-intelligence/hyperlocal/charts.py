@@ -0,0 +1,246 @@
+"""Server-side chart data: pre-binned histograms and downsampled scatters.
+
+``px.histogram`` and ``px.scatter`` put every row of the filtered frame into
+the figure, so the page payload and browser render time grow with the area
+count.  The builders here aggregate first and send only what is drawn:
+
+* histograms are binned with NumPy and sent as one bar per bin and colour;
+* scatters up to :data:`SCATTER_MAX_POINTS` rows are sent as they are; larger
+  ones are thinned with a grid-stratified sample that keeps every occupied
+  region of the plot (so outliers survive) and the rest in proportion to
+  density; above :data:`HEXBIN_ROWS` rows the points become hexagonal bins
+  coloured by count;
+* OLS trend lines are fitted on the full data from running sums, not on the
+  sample.
+
+The figures are plain ``plotly.graph_objects`` figures that app.py caches
+per filter selection (see :class:`~hyperlocal.aggregates.AggregateCache`);
+treat cached figures as read-only.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+SCATTER_MAX_POINTS = 5_000
+HEXBIN_ROWS = 250_000
+SAMPLE_GRID = 48
+HEXBIN_GRIDSIZE = 40
+SIZE_MAX = 20
+CATEGORY_COLORS = {
+    'High Potential': 'green',
+    'Moderate Potential': 'orange',
+    'Low Potential': 'red'
+}
+
+
+def _codes(labels):
+    """Integer codes (first-appearance order, -1 for missing) and their labels."""
+    codes, uniques = pd.factorize(pd.Series(labels).astype(object), sort=False)
+    return codes, list(uniques)
+
+
+def _bounds(values):
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return 0.0, 1.0
+    lo, hi = float(finite.min()), float(finite.max())
+    return (lo, hi) if hi > lo else (lo - 0.5, hi + 0.5)
+
+
+def binned_counts(values, groups=None, nbins=30, value_range=None):
+    """Equal-width histogram of ``values``, optionally split by ``groups``.
+
+    Returns ``(edges, labels, counts)`` where ``counts`` is
+    ``(n_groups, nbins)`` (one row with label None without groups).  Missing
+    values and rows with a missing group are left out; the last bin includes
+    its right edge, like ``np.histogram``.
+    """
+    values = np.asarray(values, dtype="float64")
+    lo, hi = value_range if value_range is not None else _bounds(values)
+    edges = np.linspace(lo, hi, nbins + 1)
+    keep = np.isfinite(values) & (values >= lo) & (values <= hi)
+    if groups is None:
+        codes, labels = np.zeros(len(values), dtype=np.intp), [None]
+    else:
+        codes, labels = _codes(groups)
+        keep &= codes >= 0
+    bins = np.minimum(((values[keep] - lo) / (hi - lo) * nbins).astype(np.intp), nbins - 1)
+    flat = np.bincount(codes[keep] * nbins + bins, minlength=len(labels) * nbins)
+    return edges, labels, flat.reshape(len(labels), nbins)
+
+
+def sample_positions(x, y, max_points=SCATTER_MAX_POINTS, grid=SAMPLE_GRID, seed=0):
+    """Sorted positions of a density-preserving sample of the (x, y) points.
+
+    Points are bucketed on a ``grid`` x ``grid`` lattice; every occupied
+    cell keeps at least one point and the rest of the budget is shared in
+    proportion to cell counts, so sparse regions stay visible.  Points with
+    a missing coordinate are dropped, as plotly would not draw them.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(finite) <= max_points:
+        return finite
+    cells = np.zeros(len(finite), dtype=np.intp)
+    for values in (x[finite], y[finite]):
+        lo, hi = _bounds(values)
+        cells = cells * grid + np.minimum(((values - lo) / (hi - lo) * grid).astype(np.intp),
+                                          grid - 1)
+    counts = np.bincount(cells, minlength=grid * grid)
+    quota = np.maximum(1, counts * max_points // len(finite))
+
+    # Random order within each cell (seeded, so reruns draw the same sample)
+    shuffled = np.random.default_rng(seed).permutation(len(finite))
+    order = shuffled[np.argsort(cells[shuffled], kind="stable")]
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    rank = np.arange(len(order)) - starts[cells[order]]
+    return np.sort(finite[order[rank < quota[cells[order]]]])
+
+
+def hexbin(x, y, gridsize=HEXBIN_GRIDSIZE, values=None):
+    """Hexagonal binning: ``(centre_x, centre_y, counts, mean of values)``.
+
+    Same lattice as matplotlib's ``hexbin``: two offset rectangular grids,
+    each point going to the nearer centre.  ``values`` (optional) is averaged
+    per hexagon; the fourth item is None without it.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+    (xmin, xmax), (ymin, ymax) = _bounds(x), _bounds(y)
+    nx = gridsize
+    ny = max(1, int(round(gridsize / np.sqrt(3))))
+    sx, sy = (xmax - xmin) / nx, (ymax - ymin) / ny
+    xs, ys = (x - xmin) / sx, (y - ymin) / sy
+
+    ix1, iy1 = np.round(xs), np.round(ys)
+    ix2, iy2 = np.floor(xs), np.floor(ys)
+    d1 = (xs - ix1) ** 2 + 3.0 * (ys - iy1) ** 2
+    d2 = (xs - ix2 - 0.5) ** 2 + 3.0 * (ys - iy2 - 0.5) ** 2
+    first = d1 < d2
+    cx = np.where(first, ix1, ix2 + 0.5)
+    cy = np.where(first, iy1, iy2 + 0.5)
+
+    # Centres sit on a half-step lattice: index them as integers
+    keys = (2 * cx).astype(np.int64) * (4 * ny + 8) + (2 * cy).astype(np.int64)
+    uniq, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    centre_x = (uniq // (4 * ny + 8)) / 2 * sx + xmin
+    centre_y = (uniq % (4 * ny + 8)) / 2 * sy + ymin
+    means = None
+    if values is not None:
+        values = np.asarray(values, dtype="float64")[keep]
+        valid = np.isfinite(values)
+        sums = np.bincount(inverse[valid], weights=values[valid], minlength=len(uniq))
+        n_valid = np.bincount(inverse[valid], minlength=len(uniq))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / n_valid
+    return centre_x, centre_y, counts, means
+
+
+def ols_line(x, y):
+    """Least-squares ``(slope, intercept)`` from sums, or None with < 2 distinct x."""
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+    n = len(x)
+    if n < 2:
+        return None
+    mx, my = x.mean(), y.mean()
+    sxx = ((x - mx) ** 2).sum()
+    if sxx == 0:
+        return None
+    slope = ((x - mx) * (y - my)).sum() / sxx
+    return slope, my - slope * mx
+
+
+def _colors(labels, color_map):
+    palette = qualitative.Plotly
+    return {label: (color_map or {}).get(label, palette[i % len(palette)])
+            for i, label in enumerate(labels)}
+
+
+def histogram_figure(df, column, color=None, nbins=30, color_map=None):
+    """Stacked histogram of ``df[column]`` with server-side bins."""
+    edges, labels, counts = binned_counts(df[column], df[color] if color else None, nbins)
+    centres = (edges[:-1] + edges[1:]) / 2
+    colors = _colors(labels, color_map)
+    fig = go.Figure()
+    for label, row in zip(labels, counts):
+        fig.add_trace(go.Bar(x=centres, y=row, width=edges[1] - edges[0], name=label,
+                             marker_color=colors[label] if color else None,
+                             hovertemplate=f"{column}=%{{x}}<br>count=%{{y}}<extra>{label or ''}</extra>"))
+    fig.update_layout(barmode="relative", bargap=0, xaxis_title=column, yaxis_title="count",
+                      legend_title_text=color, showlegend=color is not None)
+    return fig
+
+
+def scatter_figure(df, x, y, color=None, size=None, hover=(), color_map=None, trendline=False,
+                   max_points=SCATTER_MAX_POINTS, hexbin_rows=HEXBIN_ROWS):
+    """Scatter of ``x`` vs ``y`` sized to the browser.
+
+    Up to ``max_points`` rows are drawn as they are, larger frames are
+    sampled with :func:`sample_positions`, and above ``hexbin_rows`` the
+    figure is a hexbin density map instead.  Trend lines (one per colour,
+    like ``trendline="ols"``) always use every row: ``trendline=True`` fits
+    them here, or pass precomputed ``{label: (slope, intercept, x_low,
+    x_high)}`` lines (see :meth:`~hyperlocal.analytics.SufficientStats.trendlines`).
+    """
+    xs = df[x].to_numpy(dtype="float64")
+    ys = df[y].to_numpy(dtype="float64")
+    fig = go.Figure()
+    fig.update_layout(xaxis_title=x, yaxis_title=y, legend_title_text=color)
+    codes, labels = _codes(df[color]) if color else (np.zeros(len(df), dtype=np.intp), [None])
+    colors = _colors(labels, color_map)
+
+    if len(df) > hexbin_rows:
+        cx, cy, counts, _ = hexbin(xs, ys)
+        fig.add_trace(go.Scatter(
+            x=cx, y=cy, mode="markers", name="areas", showlegend=False,
+            marker=dict(symbol="hexagon", size=12, color=counts, colorscale="Viridis",
+                        showscale=True, colorbar=dict(title="areas")),
+            hovertemplate=f"{x}=%{{x:.2f}}<br>{y}=%{{y:.2f}}<br>areas=%{{marker.color}}<extra></extra>",
+        ))
+        fig.update_layout(title_text=f"Density of {len(df):,} areas (hexagonal bins)")
+    else:
+        positions = sample_positions(xs, ys, max_points)
+        if len(positions) < len(df):
+            fig.update_layout(title_text=f"Sample of {len(positions):,} of {len(df):,} areas")
+        sizes = df[size].to_numpy(dtype="float64") if size else None
+        sizeref = (2.0 * np.nanmax(sizes) / SIZE_MAX ** 2
+                   if size and np.isfinite(sizes).any() else None)
+        hover = list(hover)
+        custom = df[hover].iloc[positions].astype(object).to_numpy() if hover else None
+        hover_lines = "".join(f"<br>{col}=%{{customdata[{i}]}}" for i, col in enumerate(hover))
+        for code, label in enumerate(labels):
+            picked = positions[codes[positions] == code]
+            marker = dict(color=colors[label]) if color else {}
+            if size:
+                marker.update(size=np.nan_to_num(sizes[picked]), sizemode="area", sizeref=sizeref,
+                              sizemin=0)
+            fig.add_trace(go.Scatter(
+                x=xs[picked], y=ys[picked], mode="markers", name=label, marker=marker,
+                customdata=custom[codes[positions] == code] if hover else None,
+                showlegend=color is not None,
+                hovertemplate=f"{x}=%{{x}}<br>{y}=%{{y}}{hover_lines}<extra>{label or ''}</extra>",
+            ))
+    if trendline is True:
+        trendline = {}
+        for code, label in enumerate(labels):
+            rows = codes == code
+            line = ols_line(xs[rows], ys[rows])
+            if line is not None:
+                trendline[label] = (*line, *_bounds(xs[rows]))
+    if trendline:
+        for label in labels:
+            if label not in trendline:
+                continue
+            slope, intercept, lo, hi = trendline[label]
+            fig.add_trace(go.Scatter(x=[lo, hi], y=[intercept + slope * lo, intercept + slope * hi],
+                                     mode="lines", showlegend=False, hoverinfo="skip",
+                                     line=dict(color=colors[label] if color else None)))
+    return fig
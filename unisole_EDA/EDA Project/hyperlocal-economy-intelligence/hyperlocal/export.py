@@ -0,0 +1,186 @@
+"""Paging and lazy export helpers for the Data Explorer.
+
+The explorer used to sort the whole filtered frame, send all of it to the
+browser and build the full CSV string on every rerun.  Here the sort is a
+single argsort of the sort column (row positions, no frame copy), a page is
+one ``iloc`` of those positions, and the CSV / Parquet files are only built
+when a download is requested, one chunk of rows at a time.
+
+:func:`write_xlsx` streams Excel workbooks the same way: each chunk of rows
+becomes SpreadsheetML text with vectorized string operations, written
+straight into the zip member of its sheet (openpyxl's write-only mode
+builds an element per cell, about 40 us each).
+"""
+
+import io
+import re
+import zipfile
+from functools import reduce
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 250]
+CHUNK_ROWS = 50_000
+# Rows below the header row of one worksheet
+XLSX_MAX_ROWS = 1_048_575
+_XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_PACKAGE_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_CONTENT = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_STYLES = (
+    f'<styleSheet xmlns="{_MAIN_NS}"><fonts count="1"><font><sz val="11"/><name val="Calibri"/>'
+    '</font></fonts><fills count="2"><fill><patternFill patternType="none"/></fill><fill>'
+    '<patternFill patternType="gray125"/></fill></fills><borders count="1"><border><left/>'
+    '<right/><top/><bottom/><diagonal/></border></borders><cellStyleXfs count="1">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs><cellXfs count="1">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def sort_positions(values, ascending=True):
+    """Row positions that sort ``values``; NaNs last in both directions, like ``sort_values``."""
+    values = np.asarray(values, dtype="float64")
+    return np.argsort(values if ascending else -values, kind="stable")
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def page_bounds(n_rows, page, page_size):
+    """[start, stop) row range of 1-based ``page``, clamped to the last page."""
+    page = min(max(1, page), page_count(n_rows, page_size))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows)
+
+
+def iter_csv_chunks(df, columns, positions=None, chunk_rows=CHUNK_ROWS):
+    """Yield the CSV of ``df[columns]`` (rows in ``positions`` order) as encoded chunks."""
+    if positions is None:
+        positions = np.arange(len(df))
+    for start in range(0, max(len(positions), 1), chunk_rows):
+        chunk = df.iloc[positions[start:start + chunk_rows]][columns]
+        yield chunk.to_csv(index=False, header=(start == 0)).encode("utf-8")
+
+
+def export_csv(df, columns, positions=None, chunk_rows=CHUNK_ROWS):
+    """CSV file contents, written chunk by chunk."""
+    buffer = io.BytesIO()
+    for chunk in iter_csv_chunks(df, columns, positions, chunk_rows):
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
+def export_parquet(df, columns, positions=None, chunk_rows=CHUNK_ROWS):
+    """Parquet file contents with one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if positions is None:
+        positions = np.arange(len(df))
+    buffer = io.BytesIO()
+    writer = None
+    for start in range(0, max(len(positions), 1), chunk_rows):
+        chunk = df.iloc[positions[start:start + chunk_rows]][columns]
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(buffer, table.schema)
+        writer.write_table(table)
+    writer.close()
+    return buffer.getvalue()
+
+
+def column_letter(index):
+    """Excel column name of 0-based ``index``: 0 -> A, 26 -> AA."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xml_text(value):
+    return escape(_XML_INVALID.sub("", str(value)))
+
+
+def _xlsx_cells(values, refs):
+    """One column of a chunk as SpreadsheetML cells (missing values left out)."""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.to_numpy()
+        if numbers.dtype == object:  # nullable integers
+            numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+        present = np.isfinite(numbers)
+        # str() of a float32 is its shortest repr, not the float64 expansion
+        cells = '<c r="' + refs + '"><v>' + numbers.astype(str).astype(object) + "</v></c>"
+    else:
+        # Escape each distinct value once
+        codes, uniques = pd.factorize(values)
+        present = codes >= 0
+        text = np.array([_xml_text(value) for value in uniques] + [""], dtype=object)[codes]
+        cells = ('<c r="' + refs + '" t="inlineStr"><is><t xml:space="preserve">' + text
+                 + "</t></is></c>")
+    return np.where(present, cells, "")
+
+
+def _xlsx_rows(frame, chunk_rows):
+    """Encoded ``<row>`` elements of ``frame`` below a header row, one chunk at a time."""
+    letters = [column_letter(i) for i in range(frame.shape[1])]
+    yield ('<row r="1">' + "".join(
+        f'<c r="{letter}1" t="inlineStr"><is><t xml:space="preserve">{_xml_text(col)}</t></is></c>'
+        for letter, col in zip(letters, frame.columns)) + "</row>").encode("utf-8")
+    for start in range(0, len(frame), chunk_rows):
+        chunk, first_row = frame.iloc[start:start + chunk_rows], start + 2
+        numbers = np.arange(first_row, first_row + len(chunk)).astype(str).astype(object)
+        cells = [_xlsx_cells(chunk.iloc[:, i], letter + numbers) for i, letter in enumerate(letters)]
+        rows = reduce(np.add, cells, '<row r="' + numbers + '">') + "</row>"
+        yield "".join(rows).encode("utf-8")
+
+
+def write_xlsx(file, sheets, chunk_rows=CHUNK_ROWS):
+    """Write ``{sheet name: frame}`` as an .xlsx workbook to a path or binary file.
+
+    Rows are streamed chunk by chunk; values are written as numbers or
+    inline strings, without formatting.  Sheets are cut at
+    :data:`XLSX_MAX_ROWS` rows.
+    """
+    names = list(sheets)
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as workbook:
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="{_CONTENT}.worksheet+xml"/>' for i in range(1, len(names) + 1))
+        workbook.writestr("[Content_Types].xml", (
+            f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'content-types"><Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" '
+            'ContentType="application/xml"/><Override PartName="/xl/workbook.xml" '
+            f'ContentType="{_CONTENT}.sheet.main+xml"/><Override PartName="/xl/styles.xml" '
+            f'ContentType="{_CONTENT}.styles+xml"/>{overrides}</Types>'))
+        workbook.writestr("_rels/.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PACKAGE_RELS}"><Relationship Id="rId1" '
+            f'Type="{_DOC_RELS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'))
+        entries = "".join(f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" '
+                          f'r:id="rId{i}"/>' for i, name in enumerate(names, 1))
+        workbook.writestr("xl/workbook.xml", (
+            f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_DOC_RELS}">'
+            f'<sheets>{entries}</sheets></workbook>'))
+        links = "".join(f'<Relationship Id="rId{i}" Type="{_DOC_RELS}/worksheet" '
+                        f'Target="worksheets/sheet{i}.xml"/>' for i in range(1, len(names) + 1))
+        workbook.writestr("xl/_rels/workbook.xml.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PACKAGE_RELS}">{links}'
+            f'<Relationship Id="rId{len(names) + 1}" Type="{_DOC_RELS}/styles" '
+            'Target="styles.xml"/></Relationships>'))
+        workbook.writestr("xl/styles.xml", _XML_HEADER + _STYLES)
+        for i, name in enumerate(names, 1):
+            with workbook.open(f"xl/worksheets/sheet{i}.xml", "w") as sheet:
+                sheet.write(f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode())
+                for rows in _xlsx_rows(sheets[name].iloc[:XLSX_MAX_ROWS], chunk_rows):
+                    sheet.write(rows)
+                sheet.write(b"</sheetData></worksheet>")
+    return file
@@ -0,0 +1,138 @@
+"""Precomputed index for the sidebar filters (city, area type, score range).
+
+The sidebar used to chain ``isin`` masks and a two-sided score mask, copying
+the frame at every step on every rerun.  :class:`FilterIndex` is built once
+per dataset version and answers a selection with an array of row positions:
+
+* each category column is stored as integer codes plus, per category, the
+  sorted row ids that carry it;
+* the score column is stored with a score-sorted position array, so a slider
+  range is two binary searches.
+
+A selection starts from its smallest candidate set (a score slice or the
+selected categories' row ids) and checks the other conditions with code
+lookups.  When the candidates are a large share of the table a single
+vectorized mask is cheaper, so that path is used instead.  Either way the
+caller does one ``df.take(rows)``.
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_FILTERS = ("city", "area_type")
+SCORE_FILTER = "economic_health_score"
+# Above this share of the table, a full-width mask beats gathering candidates
+DENSE_FRACTION = 1 / 16
+
+
+class FilterIndex:
+    """Row-position index over ``df``'s filter columns."""
+
+    def __init__(self, df, category_columns=CATEGORY_FILTERS, score_column=SCORE_FILTER):
+        self.n_rows = len(df)
+        index_dtype = np.int32 if self.n_rows < 2 ** 31 else np.int64
+        self.options = {}
+        self._codes = {}
+        self._lookup = {}
+        self._rows = {}
+        for col in category_columns:
+            values = pd.Categorical(df[col])
+            codes = values.codes.astype(np.int8 if len(values.categories) < 128 else np.int32)
+            self.options[col] = list(df[col].dropna().unique())
+            self._lookup[col] = {value: i for i, value in enumerate(values.categories)}
+            self._codes[col] = codes
+            # Row ids grouped by category, each group in ascending row order
+            order = np.argsort(codes, kind="stable").astype(index_dtype)
+            counts = np.bincount(codes[codes >= 0], minlength=len(values.categories))
+            starts = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+            self._rows[col] = [order[starts[i]:starts[i + 1]] for i in range(len(counts))]
+
+        scores = df[score_column].to_numpy()
+        if not np.issubdtype(scores.dtype, np.floating):
+            scores = scores.astype("float64")
+        finite = np.flatnonzero(~np.isnan(scores))
+        self._scores = scores
+        self._score_order = finite[np.argsort(scores[finite], kind="stable")].astype(index_dtype)
+        self._sorted_scores = scores[self._score_order]
+
+    def _allowed(self, col, selected):
+        """Boolean lookup table over ``col``'s codes, or None for 'no restriction'."""
+        if not selected:
+            return None
+        allowed = np.zeros(len(self._rows[col]), dtype=bool)
+        for value in selected:
+            code = self._lookup[col].get(value)
+            if code is not None:
+                allowed[code] = True
+        return allowed
+
+    def select(self, score_range=None, **categories):
+        """Sorted row positions matching the selection.
+
+        ``categories`` maps a category column to the selected values; an empty
+        or missing selection means no restriction, as in the sidebar.
+        ``score_range`` is an inclusive ``(low, high)`` pair.
+        """
+        allowed = {col: self._allowed(col, categories.get(col)) for col in self._codes}
+        allowed = {col: table for col, table in allowed.items() if table is not None}
+
+        # Candidate sizes: the score slice and each category's selected rows
+        if score_range is not None:
+            # Keys in the column's dtype, so numpy neither copies the sorted
+            # array nor compares differently from a pandas mask
+            low, high = np.asarray(score_range, dtype=self._scores.dtype)
+            score_range = (low, high)
+            lo = np.searchsorted(self._sorted_scores, low, side="left")
+            hi = np.searchsorted(self._sorted_scores, high, side="right")
+            driver, size = "score", hi - lo
+        else:
+            driver, size = None, self.n_rows
+        for col, table in allowed.items():
+            col_size = sum(len(self._rows[col][code]) for code in np.flatnonzero(table))
+            if col_size < size:
+                driver, size = col, col_size
+
+        if size > self.n_rows * DENSE_FRACTION:
+            return self._select_dense(score_range, allowed)
+
+        if driver == "score":
+            rows = np.sort(self._score_order[lo:hi])
+        else:
+            groups = [self._rows[driver][code] for code in np.flatnonzero(allowed[driver])]
+            if not groups:
+                return np.empty(0, dtype=self._score_order.dtype)
+            rows = np.sort(np.concatenate(groups)) if len(groups) > 1 else groups[0]
+        keep = np.ones(len(rows), dtype=bool)
+        for col, table in allowed.items():
+            if col != driver:
+                keep &= _match_codes(table, self._codes[col][rows])
+        if score_range is not None and driver != "score":
+            values = self._scores[rows]
+            keep &= (values >= score_range[0]) & (values <= score_range[1])
+        return rows[keep]
+
+    def _select_dense(self, score_range, allowed):
+        keep = np.ones(self.n_rows, dtype=bool)
+        for col, table in allowed.items():
+            keep &= _match_codes(table, self._codes[col])
+        if score_range is not None:
+            keep &= (self._scores >= score_range[0]) & (self._scores <= score_range[1])
+        return np.flatnonzero(keep)
+
+
+def _match_codes(table, codes):
+    """Rows whose code is allowed by ``table``; code -1 (missing) never matches.
+
+    A few equality passes over narrow codes beat a fancy-index gather, so
+    compare against whichever side of the selection is smaller.
+    """
+    selected = np.flatnonzero(table)
+    if len(selected) <= len(table) - len(selected):
+        match = np.zeros(len(codes), dtype=bool)
+        for code in selected:
+            match |= codes == code
+        return match
+    match = codes >= 0
+    for code in np.flatnonzero(~table):
+        match &= codes != code
+    return match
@@ -0,0 +1,200 @@
+"""Area coordinates and a grid index for radius, nearest and bounding-box queries.
+
+Areas only carry a ``pincode`` and a ``city``.  :func:`area_coordinates`
+places each area with the bundled offline table :data:`PINCODE_TABLE`
+(``pincode, place, city, latitude, longitude``):
+
+* an area whose pincode is in the table (under the same city, when the
+  area has one) gets that post office's position;
+* any other area gets its city's centre (the mean of the table's rows for
+  that city);
+* areas with neither stay unplaced (NaN) and never match a query.
+
+The bundled table has the head post office of each surveyed city.  The
+survey's own pincodes do not match India Post codes for those cities, so
+today every area resolves to its city centre; rows appended to the CSV
+(e.g. a full pincode directory) are picked up as they are.
+
+An area placed at its city centre has no position of its own: every area
+of that city sits on the same point, so its distances are only city-level.
+:attr:`GeoIndex.exact` marks the areas placed by pincode; callers show
+"nearby" areas and distances only for those, and label radius matches of
+the others as city-level.
+
+:class:`GeoIndex` buckets the placed areas on a lat/lon grid of
+:data:`CELL_DEGREES` cells, sorted by cell, so the areas of one grid row of
+a query box are one contiguous slice.  A radius or box query reads only the
+cells it covers and checks exact (haversine) distances there; a nearest
+query widens its radius until it holds ``k`` areas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import APP_DIR
+
+PINCODE_TABLE = APP_DIR / "data" / "pincode_locations.csv"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+# About 5.5 km north-south per cell
+CELL_DEGREES = 0.05
+
+
+def load_pincode_table(path=PINCODE_TABLE):
+    table = pd.read_csv(path, dtype={"place": "string", "city": "string"})
+    table["pincode"] = table["pincode"].astype("int64")
+    return table
+
+
+def city_centres(table):
+    """Mean position of each city's rows in the pincode table."""
+    return table.groupby("city")[["latitude", "longitude"]].mean()
+
+
+def area_coordinates(df, table=None):
+    """``(latitude, longitude, exact)`` arrays for the rows of ``df``.
+
+    Areas are placed by pincode, else at their city centre; ``exact`` is
+    True where the pincode was found.
+    """
+    table = load_pincode_table() if table is None else table
+    by_pincode = table.drop_duplicates("pincode").set_index("pincode")
+    pincodes = pd.to_numeric(df["pincode"], errors="coerce").to_numpy(dtype="float64")
+    found = by_pincode.index.get_indexer(np.where(np.isfinite(pincodes), pincodes, -1))
+    cities = df["city"].astype("string")
+    # A pincode filed under another city is a data error, not a position
+    table_city = by_pincode["city"].to_numpy(dtype=object)[np.maximum(found, 0)]
+    conflict = (cities.notna() & (cities.fillna("") != table_city)).to_numpy()
+    found[conflict] = -1
+
+    centres = city_centres(table)
+    by_city = centres.index.get_indexer(cities.fillna(""))
+    lat = np.full(len(df), np.nan)
+    lon = np.full(len(df), np.nan)
+    # City centres first, then the more precise pincode positions over them
+    for source, positions in [(centres, by_city), (by_pincode, found)]:
+        rows = positions >= 0
+        lat[rows] = source["latitude"].to_numpy()[positions[rows]]
+        lon[rows] = source["longitude"].to_numpy()[positions[rows]]
+    return lat, lon, found >= 0
+
+
+def resolve_place(query, table=None):
+    """``(latitude, longitude)`` of a pincode or a city name from the pincode table."""
+    table = load_pincode_table() if table is None else table
+    text = str(query).strip()
+    if text.isdigit():
+        match = table[table["pincode"] == int(text)]
+        if len(match):
+            return float(match["latitude"].iloc[0]), float(match["longitude"].iloc[0])
+    centres = city_centres(table)
+    names = centres.index.str.lower()
+    if text.lower() in names:
+        row = centres.iloc[names.get_loc(text.lower())]
+        return float(row["latitude"]), float(row["longitude"])
+    raise KeyError(f"unknown pincode or city {query!r}")
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km (broadcasts over arrays)."""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """Grid index over area positions; queries return row positions of the frame.
+
+    ``exact`` marks the areas with a position of their own (default: every
+    placed area); the others are at their city centre.
+    """
+
+    def __init__(self, lat, lon, cell_degrees=CELL_DEGREES, exact=None):
+        self.lat = np.asarray(lat, dtype="float64")
+        self.lon = np.asarray(lon, dtype="float64")
+        self.exact = (np.ones(len(self.lat), dtype=bool) if exact is None
+                      else np.asarray(exact, dtype=bool))
+        self.cell = cell_degrees
+        placed = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lon))
+        if len(placed):
+            self.origin = (self.lat[placed].min(), self.lon[placed].min())
+            rows, cols = self._cell_of(self.lat[placed], self.lon[placed])
+            self.shape = (int(rows.max()) + 1, int(cols.max()) + 1)
+        else:
+            self.origin, self.shape = (0.0, 0.0), (0, 0)
+            rows = cols = np.empty(0, dtype=np.int64)
+        keys = rows * self.shape[1] + cols
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._rows = placed[order]
+
+    @classmethod
+    def from_frame(cls, df, table=None, cell_degrees=CELL_DEGREES):
+        """Index of ``df``'s areas placed with :func:`area_coordinates` (``exact`` by pincode)."""
+        lat, lon, exact = area_coordinates(df, table)
+        return cls(lat, lon, cell_degrees=cell_degrees, exact=exact)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _cell_of(self, lat, lon):
+        return (np.floor((lat - self.origin[0]) / self.cell).astype(np.int64),
+                np.floor((lon - self.origin[1]) / self.cell).astype(np.int64))
+
+    def _candidates(self, south, west, north, east):
+        """Rows in the grid cells overlapping the box (a superset of the box)."""
+        if not len(self._rows):
+            return self._rows
+        (r0, r1), (c0, c1) = self._cell_of(np.array([south, north]), np.array([west, east]))
+        r0, r1 = max(r0, 0), min(r1, self.shape[0] - 1)
+        c0, c1 = max(c0, 0), min(c1, self.shape[1] - 1)
+        if r0 > r1 or c0 > c1:
+            return self._rows[:0]
+        # Cells c0..c1 of one grid row are consecutive keys, so one slice each
+        grid_rows = np.arange(r0, r1 + 1) * self.shape[1]
+        starts = np.searchsorted(self._keys, grid_rows + c0, side="left")
+        stops = np.searchsorted(self._keys, grid_rows + c1, side="right")
+        return np.concatenate([self._rows[a:b] for a, b in zip(starts, stops)])
+
+    def bbox(self, south, west, north, east):
+        """Sorted row positions inside the box (edges included)."""
+        rows = self._candidates(south, west, north, east)
+        lat, lon = self.lat[rows], self.lon[rows]
+        return np.sort(rows[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)])
+
+    def radius(self, lat, lon, km):
+        """``(rows, distances)`` of the areas within ``km`` of the point, nearest first."""
+        dlat = km / KM_PER_DEGREE
+        dlon = dlat / max(np.cos(np.radians(min(abs(lat) + dlat, 89.9))), 1e-6)
+        rows = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        distances = haversine_km(lat, lon, self.lat[rows], self.lon[rows])
+        keep = distances <= km
+        rows, distances = rows[keep], distances[keep]
+        # Ties (areas sharing a position) keep row order
+        order = np.lexsort((rows, distances))
+        return rows[order], distances[order]
+
+    def nearest(self, lat, lon, k, exclude=None):
+        """``(rows, distances)`` of the ``k`` areas nearest the point, nearest first.
+
+        ``exclude`` is a row position to leave out (the area itself, for
+        "areas near this one").
+        """
+        wanted = k + (exclude is not None)
+        if not len(self._rows) or wanted <= 0:
+            return self._rows[:0], np.empty(0)
+        # No area is further than the grid's far corner from its origin corner
+        south, west = self.origin
+        north, east = south + self.shape[0] * self.cell, west + self.shape[1] * self.cell
+        extent = haversine_km(lat, lon, south, west) + haversine_km(south, west, north, east)
+        km = self.cell * KM_PER_DEGREE
+        while True:
+            rows, distances = self.radius(lat, lon, km)
+            if len(rows) >= wanted or km > extent:
+                break
+            km *= 2
+        if exclude is not None:
+            keep = rows != exclude
+            rows, distances = rows[keep], distances[keep]
+        return rows[:k], distances[:k]
@@ -0,0 +1,210 @@
+"""Incremental re-scoring for survey deltas.
+
+Every score depends on three dataset-wide maxima (business density, total
+footfall, property price) and the capped columns depend on 5/95 percentile
+ranks.  :class:`IncrementalScorer` keeps those columns as sorted arrays so a
+batch of new survey rows only costs a merge into the sorted arrays plus
+scoring the changed rows.  The full table is re-scored only when one of the
+maxima actually moves; a moved winsorize cap only refreshes the two
+``*_capped`` columns.
+
+    scorer = IncrementalScorer(pd.read_csv(PROCESSED_CSV))
+    result = scorer.update_from_survey(pd.read_csv("new_surveys.csv"))
+    scorer.frame.to_csv(PROCESSED_CSV, index=False)
+"""
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import (
+    DATE_COLUMN,
+    GROUP_FILL_KEYS,
+    GROUP_FILL_TARGET,
+    KNN_COLUMNS,
+    MODE_FILL_COLUMNS,
+    WINSORIZE_COLUMNS,
+    WINSORIZE_LIMITS,
+    ScoringStats,
+    apply_caps,
+    clean,
+    group_fill_source,
+    knn_impute,
+    score,
+    standardize_date,
+)
+
+KEY_COLUMN = "area_id"
+# Normalizer name in ScoringStats -> column it is the maximum of
+NORMALIZERS = {
+    "business_density_max": "business_density",
+    "total_footfall_max": "total_footfall",
+    "property_price_sqft_max": "property_price_sqft",
+}
+
+
+class SortedValues:
+    """Multiset of floats kept sorted, with NaNs counted separately.
+
+    Order statistics use ``np.sort`` semantics (NaNs rank last), which is what
+    ``winsorize_bounds`` sees on the full column.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype="float64")
+        nan = np.isnan(values)
+        self._values = np.sort(values[~nan])
+        self.nan_count = int(nan.sum())
+
+    def __len__(self):
+        return len(self._values) + self.nan_count
+
+    def max(self):
+        return float(self._values[-1]) if len(self._values) else np.nan
+
+    def order_stat(self, i):
+        return float(self._values[i]) if i < len(self._values) else np.nan
+
+    def remove(self, values):
+        values = np.asarray(values, dtype="float64")
+        nan = np.isnan(values)
+        self.nan_count -= int(nan.sum())
+        finite = np.sort(values[~nan])
+        if len(finite) == 0:
+            return
+        # Equal values in the batch map to consecutive slots of their run
+        positions = np.searchsorted(self._values, finite, side="left")
+        positions += np.arange(len(finite)) - np.searchsorted(finite, finite, side="left")
+        self._values = np.delete(self._values, positions)
+
+    def insert(self, values):
+        values = np.asarray(values, dtype="float64")
+        nan = np.isnan(values)
+        self.nan_count += int(nan.sum())
+        finite = np.sort(values[~nan])
+        if len(finite):
+            self._values = np.insert(self._values, np.searchsorted(self._values, finite), finite)
+
+    def winsorize_bounds(self, limits=WINSORIZE_LIMITS):
+        """Same result as :func:`hyperlocal.pipeline.winsorize_bounds` on the full column."""
+        n = len(self)
+        if n == 0:
+            return (np.nan, np.nan)
+        up_idx = n - int(n * limits[1])
+        low = self.order_stat(int(limits[0] * n)) if limits[0] else np.nan
+        high = self.order_stat(up_idx - 1) if up_idx > 0 else np.nan
+        return (low, high)
+
+
+def _same(a, b):
+    return a == b or (np.isnan(a) and np.isnan(b))
+
+
+def _tracked_values(df):
+    """The columns whose order statistics feed ScoringStats."""
+    return {
+        "business_density": df["retail_shops"] + df["restaurants"] + df["banks_atms"],
+        "total_footfall": df["pedestrian_count_15min"] + df["vehicle_count_15min"] * 0.5,
+        "property_price_sqft": df["property_price_sqft"],
+        "monthly_rent": df["monthly_rent"],
+    }
+
+
+class IncrementalScorer:
+    """Keeps a scored frame current as survey rows arrive.
+
+    ``processed`` is the output of :func:`hyperlocal.pipeline.run_pipeline`
+    (or the processed CSV).  Imputation of new rows uses the group medians
+    and modes of the data the scorer was built from, and the current frame
+    as the KNN neighbour pool.
+    """
+
+    def __init__(self, processed, key=KEY_COLUMN):
+        frame = processed.reset_index(drop=True).copy()
+        if DATE_COLUMN in frame.columns:
+            frame[DATE_COLUMN] = standardize_date(frame[DATE_COLUMN])
+        self.key = key
+        self.frame = frame
+        self._positions = pd.Index(frame[key])
+        self._sorted = {name: SortedValues(values)
+                        for name, values in _tracked_values(frame).items()}
+        self.stats = self._current_stats()
+
+        self._fill_source = group_fill_source(frame)
+        self._group_medians = frame.groupby(GROUP_FILL_KEYS, observed=True)[self._fill_source].median()
+        self._modes = {}
+        for col in MODE_FILL_COLUMNS:
+            if col in frame.columns:
+                mode = frame[col].mode()
+                self._modes[col] = mode.iloc[0] if len(mode) > 0 else "Unknown"
+
+    def _current_stats(self):
+        return ScoringStats(
+            **{name: self._sorted[col].max() for name, col in NORMALIZERS.items()},
+            caps={col: self._sorted[col].winsorize_bounds() for col in WINSORIZE_COLUMNS},
+        )
+
+    def _prepare(self, raw):
+        """Clean and impute delta rows against the stored statistics."""
+        df = clean(raw).reset_index(drop=True)
+        keys = pd.MultiIndex.from_frame(df[GROUP_FILL_KEYS])
+        medians = self._group_medians.reindex(keys).to_numpy()
+        df[GROUP_FILL_TARGET] = df[self._fill_source].fillna(pd.Series(medians, index=df.index))
+        for col, mode in self._modes.items():
+            df[col] = df[col].fillna(mode)
+        if df[KNN_COLUMNS].isna().any().any():
+            df[KNN_COLUMNS] = knn_impute(df, KNN_COLUMNS, reference=self.frame)
+        return df
+
+    def update(self, raw):
+        """Apply raw survey rows (same schema as the raw CSV), replacing rows by ``area_id``.
+
+        Returns a dict with the number of updated / added rows, how many rows
+        were re-scored and whether a normalizer move forced a full re-score.
+        """
+        delta = self._prepare(raw).drop_duplicates(self.key, keep="last")
+        positions = self._positions.get_indexer(delta[self.key])
+        existing = positions >= 0
+
+        old_values = _tracked_values(self.frame.iloc[positions[existing]])
+        new_values = _tracked_values(delta)
+        for col, values in self._sorted.items():
+            values.remove(old_values[col].to_numpy())
+            values.insert(new_values[col].to_numpy())
+
+        old_stats, self.stats = self.stats, self._current_stats()
+        normalizers_moved = not all(_same(getattr(old_stats, name), getattr(self.stats, name))
+                                    for name in NORMALIZERS)
+        caps_moved = not all(_same(a, b) for col in WINSORIZE_COLUMNS
+                             for a, b in zip(old_stats.caps[col], self.stats.caps[col]))
+
+        scored = score(delta, self.stats)[self.frame.columns]
+        if existing.any():
+            rows = self.frame.index[positions[existing]]
+            for col in self.frame.columns:
+                self.frame.loc[rows, col] = scored[col].to_numpy()[existing]
+        if (~existing).any():
+            self.frame = pd.concat([self.frame, scored[~existing]], ignore_index=True)
+            self._positions = pd.Index(self.frame[self.key])
+
+        if normalizers_moved:
+            self.frame = score(self.frame, self.stats)
+        elif caps_moved:
+            for col in WINSORIZE_COLUMNS:
+                self.frame[f"{col}_capped"] = apply_caps(self.frame[col], self.stats.caps[col])
+
+        return {
+            "updated": int(existing.sum()),
+            "added": int((~existing).sum()),
+            "rescored": len(self.frame) if normalizers_moved else len(delta),
+            "full_rescore": normalizers_moved,
+        }
+
+    def update_from_survey(self, raw):
+        """Apply only the rows of ``raw`` that are new or have a newer ``last_survey_date``."""
+        dates = standardize_date(raw[DATE_COLUMN])
+        positions = self._positions.get_indexer(raw[self.key])
+        known = positions >= 0
+        stored = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+        stored[known] = self.frame[DATE_COLUMN].to_numpy()[positions[known]]
+        changed = ~known | (dates > stored)
+        return self.update(raw[changed.to_numpy()])
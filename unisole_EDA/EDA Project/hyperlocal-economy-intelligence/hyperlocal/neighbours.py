@@ -0,0 +1,106 @@
+"""KD-tree nearest-neighbour imputation for large surveys.
+
+:func:`~hyperlocal.pipeline.knn_impute` reproduces ``KNNImputer``: every
+receiver is compared with every donor (quadratic in the row count) on the
+raw features, so rupee-valued ``avg_transaction_value`` outweighs the
+footfall counts.  :func:`tree_knn_impute` is the scalable alternative:
+
+* features are standardised (donor mean and standard deviation) first;
+* receivers are grouped by which features they have, and each group
+  searches a ``scipy.spatial.cKDTree`` built on those features over the
+  donors that have all of them, so the cost is O(n log n) rather than O(n^2);
+* with ``by`` the search stays within the receiver's block (e.g. same city
+  and area type), falling back to every donor when the block has none;
+* queries run ``chunk_rows`` receivers at a time, on ``workers`` threads.
+
+Donors missing one of a group's features are skipped for that group, where
+``KNNImputer`` would still rank them on the features they share, so values
+can differ from the exact imputer.  Requires scipy.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from .pipeline import KNN_COLUMNS, KNN_NEIGHBORS
+
+QUERY_ROWS = 65_536
+
+
+def _block_codes(df, reference, by):
+    """Block code of every row of ``df`` and of ``reference``, on a shared numbering."""
+    if not by:
+        return np.zeros(len(df), dtype=np.intp), np.zeros(len(reference), dtype=np.intp)
+    if reference is df:
+        codes = df.groupby(by, sort=False, dropna=False).ngroup().to_numpy()
+        return codes, codes
+    keys = pd.concat([df[by], reference[by]], ignore_index=True)
+    codes = keys.groupby(by, sort=False, dropna=False).ngroup().to_numpy()
+    return codes[:len(df)], codes[len(df):]
+
+
+def _scaled(X, R):
+    centre = np.nan_to_num(np.nanmean(R, axis=0)) if len(R) else np.zeros(R.shape[1])
+    spread = np.nanstd(R, axis=0) if len(R) else np.ones(R.shape[1])
+    spread = np.where(spread > 0, spread, 1.0)
+    return (X - centre) / spread, (R - centre) / spread
+
+
+def _fill(out, Xs, Rs, R, rows, donors, j, n_neighbors, chunk_rows, workers):
+    """Impute column ``j`` of ``rows`` from ``donors`` (positions in the reference)."""
+    present = ~np.isnan(Xs[rows])
+    patterns = present @ (1 << np.arange(present.shape[1]))
+    for pattern in np.unique(patterns):
+        group = rows[patterns == pattern]
+        cols = np.flatnonzero(present[patterns == pattern][0])
+        usable = donors[~np.isnan(Rs[np.ix_(donors, cols)]).any(axis=1)] if len(cols) else donors[:0]
+        if not len(usable):
+            out[group, j] = R[donors, j].mean()
+            continue
+        tree = cKDTree(Rs[np.ix_(usable, cols)])
+        k = min(n_neighbors, len(usable))
+        values = R[usable, j]
+        for start in range(0, len(group), chunk_rows):
+            chunk = group[start:start + chunk_rows]
+            _, nearest = tree.query(Xs[np.ix_(chunk, cols)], k=k, workers=workers)
+            out[chunk, j] = values[nearest.reshape(len(chunk), k)].mean(axis=1)
+
+
+def tree_knn_impute(df, columns=KNN_COLUMNS, n_neighbors=KNN_NEIGHBORS, reference=None,
+                    by=None, scale=True, chunk_rows=QUERY_ROWS, workers=1):
+    """Fill NaNs in ``columns`` with the mean of the ``n_neighbors`` nearest donors.
+
+    Drop-in for :func:`~hyperlocal.pipeline.knn_impute`: neighbours come from
+    ``df`` unless a ``reference`` frame is given (which then needs the ``by``
+    columns too).  ``workers=-1`` queries on every core.
+    """
+    X = df[columns].to_numpy(dtype="float64", copy=True)
+    missing = np.isnan(X)
+    if not missing.any():
+        return df[columns]
+    reference = df if reference is None else reference
+    R = reference[columns].to_numpy(dtype="float64")
+    Xs, Rs = _scaled(X, R) if scale else (X, R)
+    x_blocks, r_blocks = _block_codes(df, reference, by)
+
+    # Reference rows sorted by block, so each block's donors are one slice
+    r_order = np.argsort(r_blocks, kind="stable")
+    r_sorted = r_blocks[r_order]
+    out = X.copy()
+    for j in range(X.shape[1]):
+        receivers = np.flatnonzero(missing[:, j])
+        has_value = ~np.isnan(R[:, j])
+        if not len(receivers) or not has_value.any():
+            continue
+        receivers = receivers[np.argsort(x_blocks[receivers], kind="stable")]
+        blocks = x_blocks[receivers]
+        starts = np.flatnonzero(np.r_[True, blocks[1:] != blocks[:-1]])
+        for rows in np.split(receivers, starts[1:]):
+            block = x_blocks[rows[0]]
+            lo, hi = np.searchsorted(r_sorted, [block, block + 1])
+            donors = np.sort(r_order[lo:hi])
+            donors = donors[has_value[donors]]
+            if not len(donors):
+                donors = np.flatnonzero(has_value)
+            _fill(out, Xs, Rs, R, rows, donors, j, n_neighbors, chunk_rows, workers)
+    return pd.DataFrame(out, index=df.index, columns=columns)
@@ -0,0 +1,133 @@
+"""Multi-core version of :func:`~hyperlocal.pipeline.run_pipeline`.
+
+Cleaning, imputation and scoring are column operations over the rows, apart
+from a few dataset-wide statistics: the group medians and modes used by the
+fills, the KNN neighbour pool, and the maxima and winsorize caps behind the
+scores.  The parallel mode splits the survey by city (large cities are split
+further so every worker stays busy) and runs each stage on a process pool:
+
+1. workers clean their partition and return it with partial summaries
+   (group value counts, mode counts, missing flags) collected by
+   :class:`~hyperlocal.streaming.StreamingPipeline`;
+2. the parent merges the summaries into the global fill values; workers
+   impute with them, using every cleaned row as the KNN neighbour pool, and
+   return partial value counts of the scoring columns;
+3. the parent reduces those into one :class:`~hyperlocal.pipeline.ScoringStats`,
+   workers score their partition, and the rows go back into input order.
+
+The summaries are kept exact, so the result is the same frame as the serial
+pipeline's for any number of workers::
+
+    python -m hyperlocal --workers 8
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import KNN_BLOCK_KEYS, KNN_COLUMNS, knn_impute, run_pipeline, score
+from .streaming import QuantileSketch, StreamingPipeline
+
+PARTITION_COLUMN = "city"
+PARTITIONS_PER_WORKER = 4
+
+# Set in each pool process by _init_worker so the summaries (and the KNN
+# pool inside them) are sent once per process rather than once per task
+_worker_summary = None
+
+
+def partition_positions(raw, workers, column=PARTITION_COLUMN, per_worker=PARTITIONS_PER_WORKER):
+    """Row positions of each partition, largest first.
+
+    One partition per value of ``column`` (missing values form their own),
+    with cities larger than ``1 / (workers * per_worker)`` of the rows split
+    into consecutive pieces of that size.
+    """
+    if column in raw.columns:
+        codes = pd.factorize(raw[column])[0]
+    else:
+        codes = np.zeros(len(raw), dtype=np.intp)
+    limit = max(1, -(-len(raw) // (workers * per_worker)))
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]])
+    parts = []
+    for group in np.split(order, starts[1:]) if len(order) else []:
+        parts.extend(group[i:i + limit] for i in range(0, len(group), limit))
+    parts.sort(key=len, reverse=True)
+    return parts
+
+
+def _init_worker(summary):
+    global _worker_summary
+    _worker_summary = summary
+
+
+def _observe(raw):
+    summary = StreamingPipeline(reference_rows=0, max_distinct=None)
+    return summary.observe(raw), summary
+
+
+def _impute(cleaned, summary=None):
+    summary = summary or _worker_summary
+    summary.tracked = {}
+    return summary.impute(cleaned), summary.tracked
+
+
+def _map(pool, func, items):
+    return list(pool.map(func, items)) if pool is not None else [func(item) for item in items]
+
+
+def _reorder(frames, parts):
+    positions = np.concatenate(parts)
+    return pd.concat(frames).iloc[np.argsort(positions, kind="stable")]
+
+
+def run_pipeline_parallel(raw, workers=None, knn=knn_impute):
+    """Raw survey frame -> processed frame, on ``workers`` processes (default: all cores).
+
+    Returns the same frame as :func:`~hyperlocal.pipeline.run_pipeline` with
+    the same ``knn`` imputer.  Raises ValueError if a column the scoring
+    needs is missing.
+    """
+    workers = workers or os.cpu_count() or 1
+    parts = partition_positions(raw, workers)
+    if not parts:
+        return run_pipeline(raw, knn)
+    workers = min(workers, len(parts))
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        observed = _map(pool, _observe, [raw.iloc[rows] for rows in parts])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    cleaned = [frame for frame, _ in observed]
+    summary = StreamingPipeline(reference_rows=0, max_distinct=None, knn=knn)
+    for _, partial_summary in observed:
+        summary.merge(partial_summary)
+    summary.finish_observing()
+    # Neighbours are every cleaned row in input order, as the serial KNN sees
+    # them, with the block keys the KD-tree imputer may search within
+    pool_columns = KNN_COLUMNS + [col for col in KNN_BLOCK_KEYS if col in raw.columns]
+    summary.reference_frame = _reorder([frame[pool_columns] for frame in cleaned], parts)
+
+    if workers > 1:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(summary,))
+        impute = _impute
+    else:
+        pool, impute = None, partial(_impute, summary=summary)
+    try:
+        imputed = _map(pool, impute, cleaned)
+        summary.tracked = {}
+        for _, tracked in imputed:
+            for name, sketch in tracked.items():
+                summary.tracked.setdefault(name, QuantileSketch(max_distinct=None)).merge(sketch)
+        stats = summary.scoring_stats()
+        scored = _map(pool, partial(score, stats=stats), [frame for frame, _ in imputed])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return _reorder(scored, parts)
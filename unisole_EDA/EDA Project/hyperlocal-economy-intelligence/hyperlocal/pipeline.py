@@ -0,0 +1,468 @@
+"""Cleaning and scoring pipeline for the hyperlocal economy survey.
+
+This is the importable version of the cleaning / feature-engineering cells in
+``notebooks/eda_analysis.ipynb``.  Every stage works on whole columns (no
+row-wise ``apply``), so the processed CSV can be rebuilt from the raw survey
+without opening the notebook::
+
+    python -m hyperlocal
+    python -m hyperlocal --input raw.csv --output processed.csv
+    python -m hyperlocal --input statewide.csv --chunksize 200000
+    python -m hyperlocal --workers 8
+    python -m hyperlocal --profile     # per-stage time and rows
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent
+RAW_CSV = APP_DIR / "data" / "hyperlocal_economy_data (1).csv"
+PROCESSED_CSV = APP_DIR / "hyperlocal_economy_processed.csv"
+
+# Raw columns that should be numeric.  Survey exports mix in "Rs 1266",
+# "6795/-", "~265" and "3shops", so anything read as text gets cleaned.
+NUMERIC_COLUMNS = [
+    "pincode", "retail_shops", "restaurants", "banks_atms", "medical_facilities",
+    "educational_centers", "parking_lots", "vacant_shops", "pedestrian_count_15min",
+    "vehicle_count_15min", "road_condition", "street_lighting", "cleanliness",
+    "avg_daily_customers", "avg_transaction_value", "monthly_rent",
+    "property_price_sqft", "residential_rent_1bhk", "google_rating",
+    "google_reviews_count", "zomato_restaurants", "population_estimate",
+    "news_mentions_6months",
+]
+DATE_COLUMN = "last_survey_date"
+DATE_FORMATS = ["%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d"]
+_NOISE_PATTERN = r"Rs|/-|~|shops| "
+_NUMBER_PATTERN = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+
+# Missing value handling
+GROUP_FILL_KEYS = ["area_type", "locality_type"]
+GROUP_FILL_COLUMNS = ["retail_shops", "restaurants", "banks_atms",
+                      "medical_facilities", "parking_lots", "monthly_rent"]
+# The notebook's fill loop assigns to a literal 'col' column instead of the
+# column being filled, so the processed CSV carries that column and the
+# source columns keep their NaNs.  Kept as-is so the output schema and
+# scores stay identical to the published file.
+GROUP_FILL_TARGET = "col"
+MODE_FILL_COLUMNS = ["footfall_intensity", "business_growth",
+                     "parking_availability", "main_issue"]
+KNN_COLUMNS = ["pedestrian_count_15min", "vehicle_count_15min",
+               "avg_daily_customers", "avg_transaction_value"]
+KNN_NEIGHBORS = 5
+KNN_CHUNK_CELLS = 2 ** 22
+# Neighbour blocks for the KD-tree imputer (hyperlocal.neighbours)
+KNN_BLOCK_KEYS = ["city", "area_type"]
+
+# Scoring
+WINSORIZE_COLUMNS = ["monthly_rent", "property_price_sqft"]
+WINSORIZE_LIMITS = (0.05, 0.05)
+INFRA_COLUMNS = ["road_condition", "street_lighting", "cleanliness"]
+GROWTH_MAPPING = {"Growing": 100, "Stable": 60, "Declining": 20}
+COMPETITION_MAPPING = {"Low": 100, "Medium": 60, "High": 30}
+WEIGHTS = {
+    "business_density_score": 0.20,
+    "footfall_score": 0.18,
+    "growth_momentum_score": 0.15,
+    "infrastructure_score": 0.15,
+    "property_value_score": 0.12,
+    "digital_presence_score": 0.10,
+    "competition_score": 0.10,
+}
+# risk_score terms: the vacancy rate as is, a sub-score by its shortfall from 100
+RISK_WEIGHTS = {"vacancy_rate": 0.4, "infrastructure_score": 0.3, "occupancy_score": 0.3}
+RETURN_WEIGHTS = {"economic_health_score": 0.6, "property_value_score": 0.4}
+HIGH_THRESHOLD = 70
+MODERATE_THRESHOLD = 40
+SUB_SCORES = [
+    "business_density_score", "footfall_score", "infrastructure_score",
+    "property_value_score", "digital_presence_score", "growth_momentum_score",
+    "competition_score", "occupancy_score",
+]
+DERIVED_COLUMNS = [
+    GROUP_FILL_TARGET, "monthly_rent_capped", "property_price_sqft_capped",
+    "business_density", "business_density_score", "total_footfall",
+    "footfall_score", "infrastructure_score", "property_value_score",
+    "digital_presence_score", "growth_momentum_score", "competition_score",
+    "vacancy_rate", "occupancy_score", "economic_health_score",
+    "investment_category", "recommended_business", "risk_score",
+    "expected_return",
+]
+
+
+# STAGE 1: CLEANING
+
+def clean_numeric_columns(series):
+    """Convert a dirty survey column ("Rs 1266", "~265", "3shops") to float."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    # One regex pass instead of five str.replace calls; anything that is not
+    # a plain number afterwards ("NA", "None", "") becomes NaN.
+    cleaned = series.astype("string").str.replace(_NOISE_PATTERN, "", regex=True).str.strip()
+    is_number = cleaned.str.fullmatch(_NUMBER_PATTERN).fillna(False).astype(bool)
+    return cleaned.where(is_number).astype("float64")
+
+
+def standardize_date(date_series):
+    """Parse survey dates written as ISO or day-first strings."""
+    if pd.api.types.is_datetime64_any_dtype(date_series):
+        return date_series
+    text = date_series.astype("string")
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    pending = text.notna()
+    for fmt in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors="coerce")
+        pending &= parsed.isna()
+    if pending.any():
+        parsed[pending] = pd.to_datetime(text[pending], errors="coerce",
+                                         format="mixed", dayfirst=True)
+    return parsed
+
+
+def clean(df):
+    """Fix column types: numeric survey fields and the survey date."""
+    df = df.copy()
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = clean_numeric_columns(df[col])
+    if DATE_COLUMN in df.columns:
+        df[DATE_COLUMN] = standardize_date(df[DATE_COLUMN])
+    return df
+
+
+# STAGE 2: MISSING VALUES
+
+def group_median_fill(df, col, keys=GROUP_FILL_KEYS):
+    """Fill NaNs in ``col`` with the median of its (area_type, locality_type) group."""
+    medians = df.groupby(keys, sort=False, observed=True)[col].transform("median")
+    return df[col].fillna(medians)
+
+
+def knn_impute(df, columns=KNN_COLUMNS, n_neighbors=KNN_NEIGHBORS,
+               chunk_cells=KNN_CHUNK_CELLS, reference=None):
+    """Nearest-neighbour imputation with the same semantics as ``KNNImputer``.
+
+    Distances are nan-euclidean over ``columns`` and each missing value is the
+    mean of the ``n_neighbors`` closest rows that have it.  Neighbours come
+    from ``df`` itself unless a ``reference`` frame is given.  Receivers are
+    processed in chunks so peak memory stays at ``chunk_cells`` distances.
+    """
+    X = df[columns].to_numpy(dtype="float64", copy=True)
+    missing = np.isnan(X)
+    if not missing.any():
+        return df[columns]
+    R = X if reference is None else reference[columns].to_numpy(dtype="float64")
+    n_features = X.shape[1]
+    out = X.copy()
+    for j in range(n_features):
+        receivers = np.flatnonzero(missing[:, j])
+        donors = np.flatnonzero(~np.isnan(R[:, j]))
+        if len(receivers) == 0 or len(donors) == 0:
+            continue
+        donor_X = R[donors]
+        donor_values = donor_X[:, j]
+        k = min(n_neighbors, len(donors))
+        step = max(1, chunk_cells // len(donors))
+        for start in range(0, len(receivers), step):
+            rows = receivers[start:start + step]
+            dist = _nan_sq_distances(X[rows], donor_X)
+            nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+            usable = np.isfinite(np.take_along_axis(dist, nearest, axis=1))
+            counts = usable.sum(axis=1)
+            totals = np.where(usable, donor_values[nearest], 0.0).sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                filled = totals / counts
+            out[rows, j] = np.where(counts > 0, filled, donor_values.mean())
+    return pd.DataFrame(out, index=df.index, columns=columns)
+
+
+def _nan_sq_distances(A, B):
+    """Squared nan-euclidean distances between the rows of A and B (inf if no overlap)."""
+    total = np.zeros((A.shape[0], B.shape[0]))
+    present = np.zeros((A.shape[0], B.shape[0]), dtype=np.int32)
+    for j in range(A.shape[1]):
+        diff = A[:, j, None] - B[None, :, j]
+        np.square(diff, out=diff)
+        ok = ~np.isnan(diff)
+        diff[~ok] = 0.0
+        total += diff
+        present += ok
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dist = total * (A.shape[1] / present)
+    dist[present == 0] = np.inf
+    return dist
+
+
+def group_fill_source(df):
+    """The column the notebook's fill loop ends up writing to ``col``: the last one with NaNs."""
+    fill_cols = [c for c in GROUP_FILL_COLUMNS if c in df.columns and df[c].isna().any()]
+    return fill_cols[-1] if fill_cols else "monthly_rent"
+
+
+def impute(df, knn=knn_impute):
+    """Group-median, mode and KNN fills, in the notebook's order.
+
+    ``knn`` is the neighbour imputer, called as ``knn(df, columns)``.
+    """
+    df = df.copy()
+    df[GROUP_FILL_TARGET] = group_median_fill(df, group_fill_source(df))
+    for col in MODE_FILL_COLUMNS:
+        if col in df.columns and df[col].isna().any():
+            mode = df[col].mode()
+            df[col] = df[col].fillna(mode.iloc[0] if len(mode) > 0 else "Unknown")
+    knn_cols = [c for c in KNN_COLUMNS if c in df.columns]
+    if df[knn_cols].isna().any().any():
+        df[knn_cols] = knn(df, knn_cols)
+    return df
+
+
+# STAGE 3: SCORING
+
+@dataclass
+class ScoringStats:
+    """Dataset-wide statistics that every row's score depends on."""
+    business_density_max: float
+    total_footfall_max: float
+    property_price_sqft_max: float
+    # column -> (low, high) winsorize caps
+    caps: dict = field(default_factory=dict)
+
+
+def winsorize_bounds(values, limits=WINSORIZE_LIMITS):
+    """Cap values matching ``scipy.stats.mstats.winsorize`` (NaNs rank last)."""
+    values = np.asarray(values, dtype="float64")
+    n = len(values)
+    if n == 0:
+        return (np.nan, np.nan)
+    ordered = np.sort(values)
+    low_idx = int(limits[0] * n)
+    up_idx = n - int(n * limits[1])
+    low = ordered[low_idx] if limits[0] else np.nan
+    high = ordered[up_idx - 1] if up_idx > 0 else np.nan
+    return (float(low), float(high))
+
+
+def apply_caps(values, caps):
+    """Apply (low, high) caps from :func:`winsorize_bounds`."""
+    low, high = caps
+    values = np.asarray(values, dtype="float64")
+    out = values.copy()
+    if not np.isnan(low):
+        out = np.where(out < low, low, out)
+    if not np.isnan(high):
+        # NaNs sort last, so winsorize also overwrites them with the upper cap
+        out = np.where(np.isnan(values) | (out > high), high, out)
+    return out
+
+
+def fit_stats(df):
+    """Compute the normalizers and winsorize caps for ``df``."""
+    business_density = df["retail_shops"] + df["restaurants"] + df["banks_atms"]
+    total_footfall = df["pedestrian_count_15min"] + df["vehicle_count_15min"] * 0.5
+    return ScoringStats(
+        business_density_max=float(business_density.max()),
+        total_footfall_max=float(total_footfall.max()),
+        property_price_sqft_max=float(df["property_price_sqft"].max()),
+        caps={col: winsorize_bounds(df[col]) for col in WINSORIZE_COLUMNS},
+    )
+
+
+def add_features(df, stats):
+    """Add the capped columns and the 8 sub-scores (0-100 scale)."""
+    for col in WINSORIZE_COLUMNS:
+        df[f"{col}_capped"] = apply_caps(df[col], stats.caps[col])
+
+    df["business_density"] = df["retail_shops"] + df["restaurants"] + df["banks_atms"]
+    df["business_density_score"] = (df["business_density"] / stats.business_density_max * 100).round(2)
+
+    df["total_footfall"] = df["pedestrian_count_15min"] + (df["vehicle_count_15min"] * 0.5)
+    df["footfall_score"] = (df["total_footfall"] / stats.total_footfall_max * 100).round(2)
+
+    df["infrastructure_score"] = (df[INFRA_COLUMNS].mean(axis=1) / 5 * 100).round(2)
+    df["property_value_score"] = (df["property_price_sqft"] / stats.property_price_sqft_max * 100).round(2)
+    df["digital_presence_score"] = ((df["google_rating"] / 5) * 100).round(2)
+    df["growth_momentum_score"] = df["business_growth"].map(GROWTH_MAPPING)
+    df["competition_score"] = df["competition_level"].map(COMPETITION_MAPPING)
+
+    df["vacancy_rate"] = (df["vacant_shops"] / (df["retail_shops"] + df["vacant_shops"]) * 100).round(2)
+    df["occupancy_score"] = (100 - df["vacancy_rate"]).clip(0, 100)
+    return df
+
+
+def health_score(df, weights=WEIGHTS):
+    """Weighted composite of the sub-scores, rounded like the notebook."""
+    total = pd.Series(0.0, index=df.index)
+    for feature, weight in weights.items():
+        total = total + df[feature] * weight
+    return total.round(2)
+
+
+def classify_area(score, high=HIGH_THRESHOLD, moderate=MODERATE_THRESHOLD):
+    """Vectorized investment category (NaN scores fall through to Low)."""
+    score = np.asarray(score, dtype="float64")
+    return np.select([score >= high, score >= moderate],
+                     ["High Potential", "Moderate Potential"], "Low Potential")
+
+
+def recommend_business(score, area_type, locality_type,
+                       high=HIGH_THRESHOLD, moderate=MODERATE_THRESHOLD):
+    """Vectorized business recommendation from score, area and locality type."""
+    score = np.asarray(score, dtype="float64")
+    urban = np.asarray(area_type == "Urban")
+    commercial = np.asarray(locality_type == "Commercial")
+    is_high = score >= high
+    is_moderate = score >= moderate
+    conditions = [is_high & urban & commercial, is_high & urban, is_high,
+                  is_moderate & commercial, is_moderate]
+    choices = ["Premium F&B, Tech Retail, Co-working",
+               "Fitness Centers, Cafes, Boutiques",
+               "Family Restaurants, Supermarkets, Clinics",
+               "Retail Chains, Quick Service Restaurants, Banks",
+               "Grocery Stores, Pharmacies, Education Centers"]
+    return np.select(conditions, choices, "Essential Services, Kirana, Mobile Recharge")
+
+
+def risk_score(df, weights=RISK_WEIGHTS):
+    total = 0
+    for col, weight in weights.items():
+        term = df[col] if col == "vacancy_rate" else 100 - df[col]
+        total = total + term * weight
+    return total.round(2)
+
+
+def expected_return(df, weights=RETURN_WEIGHTS):
+    total = 0
+    for col, weight in weights.items():
+        total = total + df[col] * weight
+    return total.round(2)
+
+
+def score(df, stats=None):
+    """Add every derived scoring column.  ``stats`` defaults to :func:`fit_stats` of ``df``."""
+    df = df.copy()
+    if stats is None:
+        stats = fit_stats(df)
+    df = add_features(df, stats)
+    df["economic_health_score"] = health_score(df)
+    df["investment_category"] = classify_area(df["economic_health_score"])
+    df["recommended_business"] = recommend_business(
+        df["economic_health_score"], df["area_type"], df["locality_type"])
+    df["risk_score"] = risk_score(df)
+    df["expected_return"] = expected_return(df)
+    return df
+
+
+def run_pipeline(raw, knn=knn_impute, profile=None):
+    """Raw survey frame -> processed frame with every derived column.
+
+    ``profile`` (a :class:`~hyperlocal.profiling.RunProfile`) gets one span per stage.
+    """
+    if profile is None:
+        return score(impute(clean(raw), knn))
+    with profile.span("pipeline.clean", rows=len(raw)):
+        df = clean(raw)
+    with profile.span("pipeline.impute", rows=len(df)):
+        df = impute(df, knn)
+    with profile.span("pipeline.score", rows=len(df)):
+        return score(df)
+
+
+def save_processed(processed, output_path=PROCESSED_CSV):
+    """Write the processed CSV and, when pyarrow is available, its typed Parquet twin."""
+    output_path = Path(output_path)
+    processed.to_csv(output_path, index=False)
+    try:
+        from .store import write_store
+        write_store(processed, output_path.with_suffix(".parquet"))
+    except ImportError:
+        pass
+
+
+def process_file(input_path=RAW_CSV, output_path=PROCESSED_CSV, workers=1, knn=knn_impute,
+                 profile=None):
+    from .profiling import RunProfile
+
+    profile = profile or RunProfile(enabled=False)
+    with profile.span("pipeline.read_csv") as span:
+        raw = pd.read_csv(input_path)
+        span.rows = len(raw)
+    if workers == 1:
+        processed = run_pipeline(raw, knn, profile)
+    else:
+        from .parallel import run_pipeline_parallel
+        with profile.span("pipeline.parallel", rows=len(raw)):
+            processed = run_pipeline_parallel(raw, workers, knn)
+    with profile.span("pipeline.save", rows=len(processed)):
+        save_processed(processed, output_path)
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the processed hyperlocal economy dataset.")
+    parser.add_argument("--input", type=Path, default=RAW_CSV, help="raw survey CSV")
+    parser.add_argument("--output", type=Path, default=PROCESSED_CSV, help="processed CSV to write")
+    parser.add_argument("--delta", type=Path,
+                        help="new survey rows to merge into the existing --output file instead of a full rebuild")
+    parser.add_argument("--chunksize", type=int,
+                        help="stream the raw CSV in chunks of this many rows (bounded memory, CSV output only)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="process partitions of the survey on this many processes (0 = all cores)")
+    parser.add_argument("--knn", choices=["exact", "tree"], default="exact",
+                        help="'tree': scaled KD-tree neighbours within city/area_type blocks, "
+                             "near-linear for large surveys (needs scipy; values differ from the "
+                             "notebook's KNNImputer)")
+    parser.add_argument("--profile", action="store_true",
+                        help="print the time and rows of each stage of a full rebuild")
+    args = parser.parse_args(argv)
+
+    knn = knn_impute
+    if args.knn == "tree":
+        from functools import partial
+
+        from .neighbours import tree_knn_impute
+
+        # The streaming neighbour pool has no category columns, so no blocks there
+        knn = partial(tree_knn_impute, by=None if args.chunksize else KNN_BLOCK_KEYS,
+                      workers=-1 if args.workers == 1 else 1)
+
+    start = time.perf_counter()
+    if args.chunksize:
+        from .streaming import process_file_streaming
+
+        summary = process_file_streaming(args.input, args.output, chunksize=args.chunksize,
+                                         knn=knn)
+        elapsed = time.perf_counter() - start
+        print(f" Streamed {summary['rows']} areas in {summary['chunks']} chunks "
+              f"in {elapsed:.2f}s -> {args.output}")
+        if summary["invalid_values"]:
+            print(f" Unparseable values set to missing: {summary['invalid_values']}")
+        return
+    if args.delta:
+        from .incremental import IncrementalScorer
+
+        scorer = IncrementalScorer(pd.read_csv(args.output))
+        result = scorer.update_from_survey(pd.read_csv(args.delta))
+        save_processed(scorer.frame, args.output)
+        elapsed = time.perf_counter() - start
+        print(f" Merged {result['updated']} updated / {result['added']} new areas "
+              f"({result['rescored']} re-scored) in {elapsed:.2f}s -> {args.output}")
+        return
+    from .profiling import RunProfile
+
+    profile = RunProfile(enabled=args.profile)
+    processed = process_file(args.input, args.output, workers=args.workers or None, knn=knn,
+                             profile=profile)
+    elapsed = time.perf_counter() - start
+    print(f" Processed {len(processed)} areas in {elapsed:.2f}s -> {args.output}")
+    for span in profile.spans:
+        print(f"   {span.name:<18} {span.seconds * 1000:>9.1f} ms  {span.rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Opt-in hot-path instrumentation for the dashboard and the pipeline.
+
+A :class:`RunProfile` records one :class:`Span` per instrumented block of a
+run (a Streamlit rerun or a pipeline call):
+
+* wall time;
+* rows processed;
+* bytes sent (estimated size of the frames and the JSON of the figures
+  handed to Streamlit);
+* aggregate cache hits and misses.
+
+app.py wraps the sidebar filters and each page body in spans, and
+:func:`~hyperlocal.pipeline.run_pipeline` wraps each stage.
+:class:`MetricsRegistry` totals spans over every run of a process and
+exports them as Prometheus text; :func:`log_run` writes a run as one JSON
+log line.
+
+Profiling is off unless ``$HYPERLOCAL_PROFILE`` is set or the app URL has
+``?profile=1``; then app.py also lists a Diagnostics page with the previous
+run, the process totals and both exports.  A disabled profile neither times nor sizes anything, so
+instrumented code costs one context manager per block.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+logger = logging.getLogger("hyperlocal.profile")
+ENV_FLAG = "HYPERLOCAL_PROFILE"
+QUERY_FLAG = "profile"
+METRIC_PREFIX = "hyperlocal"
+# metric, type, help, samples as (name suffix, extra labels, total key)
+PROMETHEUS_METRICS = [
+    ("span_seconds", "summary", "Wall time of instrumented spans.",
+     [("_sum", "", "seconds"), ("_count", "", "count")]),
+    ("span_max_seconds", "gauge", "Slowest run of each span.", [("", "", "max_seconds")]),
+    ("span_rows_total", "counter", "Rows processed by each span.", [("", "", "rows")]),
+    ("span_bytes_total", "counter", "Estimated bytes sent to the browser by each span.",
+     [("", "", "bytes")]),
+    ("cache_requests_total", "counter", "Aggregate cache lookups by each span.",
+     [("", ',result="hit"', "hits"), ("", ',result="miss"', "misses")]),
+]
+
+
+def profiling_enabled(query_params=None):
+    """True when ``$HYPERLOCAL_PROFILE`` is set (not "0") or ``?profile=1`` is in the URL."""
+    if os.environ.get(ENV_FLAG, "0") not in ("", "0"):
+        return True
+    return query_params is not None and query_params.get(QUERY_FLAG) == "1"
+
+
+def payload_bytes(obj):
+    """Approximate bytes Streamlit sends for ``obj`` (frames, figures, text)."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(pd.Series(obj.memory_usage(deep=True)).sum())
+    if hasattr(obj, "to_plotly_json"):
+        return len(obj.to_json())
+    if isinstance(obj, (bytes, str)):
+        return len(obj)
+    return 0
+
+
+@dataclass
+class Span:
+    name: str
+    seconds: float = 0.0
+    rows: int = None
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+
+
+class RunProfile:
+    """Spans of one run, in the order they finished."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.spans = []
+        self._open = []
+
+    def start(self, name, rows=None):
+        """Open span ``name`` until the matching :meth:`finish` (for blocks too long to indent)."""
+        record = Span(name, rows=rows)
+        if self.enabled:
+            self._open.append((record, time.perf_counter()))
+        return record
+
+    def finish(self):
+        """Close the innermost open span."""
+        if not self.enabled:
+            return None
+        record, start = self._open.pop()
+        record.seconds = time.perf_counter() - start
+        self.spans.append(record)
+        return record
+
+    @contextmanager
+    def span(self, name, rows=None):
+        """Time the block as span ``name``; the yielded :class:`Span` takes rows and bytes."""
+        record = self.start(name, rows)
+        if not self.enabled:
+            yield record
+            return
+        try:
+            yield record
+        finally:
+            self.finish()
+
+    @property
+    def current(self):
+        """The innermost open span (a throwaway one outside any span)."""
+        return self._open[-1][0] if self._open else Span("")
+
+    def sent(self, obj):
+        """Count ``obj`` as sent to the browser by the current span."""
+        if self.enabled:
+            self.current.bytes += payload_bytes(obj)
+        return obj
+
+    def cached(self, cache, key, compute, name=None):
+        """``cache.get(key, compute)`` timed as span ``name``, counted as a hit or miss.
+
+        Without ``name`` the lookup is counted on the current span.
+        """
+        if not self.enabled:
+            return cache.get(key, compute)
+        with self.span(name) if name else nullcontext(self.current) as span:
+            if key in cache:
+                span.hits += 1
+            else:
+                span.misses += 1
+            return cache.get(key, compute)
+
+    def to_records(self):
+        return [asdict(span) for span in self.spans]
+
+    def to_frame(self):
+        columns = list(Span.__dataclass_fields__)
+        return pd.DataFrame(self.to_records(), columns=columns)
+
+
+class MetricsRegistry:
+    """Per-span totals over every run of a process (thread-safe)."""
+
+    def __init__(self):
+        self.runs = 0
+        self.last_run = []
+        self._totals = defaultdict(lambda: {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                            "rows": 0, "bytes": 0, "hits": 0, "misses": 0})
+        self._lock = threading.Lock()
+
+    def observe(self, profile):
+        with self._lock:
+            self.runs += 1
+            self.last_run = profile.to_records()
+            for span in profile.spans:
+                total = self._totals[span.name]
+                total["count"] += 1
+                total["seconds"] += span.seconds
+                total["max_seconds"] = max(total["max_seconds"], span.seconds)
+                total["rows"] += span.rows or 0
+                total["bytes"] += span.bytes
+                total["hits"] += span.hits
+                total["misses"] += span.misses
+
+    def totals(self):
+        """Frame of per-span totals, slowest total time first."""
+        with self._lock:
+            rows = [{"span": name, **total} for name, total in self._totals.items()]
+        frame = pd.DataFrame(rows, columns=["span", "count", "seconds", "max_seconds", "rows",
+                                            "bytes", "hits", "misses"])
+        frame["mean_ms"] = frame["seconds"] / frame["count"].clip(lower=1) * 1000
+        return frame.sort_values("seconds", ascending=False, ignore_index=True)
+
+    def prometheus_text(self, prefix=METRIC_PREFIX):
+        """Totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = {name: dict(total) for name, total in self._totals.items()}
+            runs = self.runs
+        lines = [f"# HELP {prefix}_runs_total Profiled runs.",
+                 f"# TYPE {prefix}_runs_total counter", f"{prefix}_runs_total {runs}"]
+        for metric, kind, help_text, samples in PROMETHEUS_METRICS:
+            name = f"{prefix}_{metric}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for span, total in totals.items():
+                for suffix, labels, key in samples:
+                    lines.append(f'{name}{suffix}{{span="{_escape(span)}"{labels}}} {total[key]}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def log_run(profile, **context):
+    """Log ``profile`` as one structured JSON line on the ``hyperlocal.profile`` logger."""
+    logger.info(json.dumps({**context, "spans": profile.to_records()}, default=str))
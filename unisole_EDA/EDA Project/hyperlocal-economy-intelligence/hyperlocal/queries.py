@@ -0,0 +1,77 @@
+"""Query logic shared by the dashboard and the HTTP service.
+
+The Investment Finder criteria and the top-k tables used to live inline in
+app.py.  They are plain functions of the processed frame here, returning row
+positions so callers take only the rows they show.
+"""
+
+import numpy as np
+
+from .export import sort_positions
+from .filters import FilterIndex
+
+FINDER_FILTERS = ("city", "locality_type", "business_growth", "area_type")
+
+
+def finder_index(df):
+    """:class:`FilterIndex` over the Investment Finder's category columns."""
+    return FilterIndex(df, category_columns=FINDER_FILTERS)
+
+
+def finder_rows(df, budget, min_score, growth, min_footfall, cities, localities, max_risk,
+                index=None, within=None):
+    """Row positions matching the Investment Finder criteria, best health score first.
+
+    As in the finder form, an empty list of growth types, cities or
+    localities matches nothing.  ``index`` (from :func:`finder_index`) narrows
+    the candidates with its category and score lookups before the remaining
+    conditions are checked.  ``within`` limits the search to those row
+    positions (e.g. a :class:`~hyperlocal.geo.GeoIndex` radius query), and
+    only they are checked.
+    """
+    if not (len(growth) and len(cities) and len(localities)):
+        return np.empty(0, dtype=np.intp)
+    if within is not None or index is None:
+        rows = (np.unique(np.asarray(within, dtype=np.intp)) if within is not None
+                else np.arange(len(df)))
+        sub = df.iloc[rows] if within is not None else df
+        keep = ((sub['economic_health_score'] >= min_score).to_numpy() &
+                sub['business_growth'].isin(growth).to_numpy() &
+                sub['city'].isin(cities).to_numpy() &
+                sub['locality_type'].isin(localities).to_numpy())
+    else:
+        rows = index.select(score_range=(min_score, np.inf), city=cities,
+                            business_growth=growth, locality_type=localities)
+        sub = df.iloc[rows]
+        keep = np.ones(len(rows), dtype=bool)
+    keep &= ((sub['monthly_rent'] <= budget).to_numpy() &
+             (sub['footfall_score'] >= min_footfall).to_numpy() &
+             (sub['risk_score'] <= max_risk).to_numpy())
+    rows = rows[keep]
+    scores = df['economic_health_score'].to_numpy()[rows]
+    return rows[sort_positions(scores, ascending=False)]
+
+
+def top_k(values, k, largest=True, rows=None):
+    """Positions of the ``k`` largest (or smallest) values, best first; NaNs skipped.
+
+    ``rows`` restricts the choice to those positions.  Ties keep row order,
+    like ``nlargest`` / ``nsmallest`` with ``keep='first'``.
+    """
+    values = np.asarray(values, dtype="float64")
+    if rows is None:
+        rows = np.arange(len(values))
+    rows = np.asarray(rows)
+    candidates = rows[~np.isnan(values[rows])]
+    keys = -values[candidates] if largest else values[candidates]
+    k = min(k, len(candidates))
+    if k == 0:
+        return candidates[:0]
+    if k < len(candidates):
+        part = np.argpartition(keys, k - 1)
+        cutoff = keys[part[k - 1]]
+        # Keep every tie at the cutoff so the stable sort picks the first rows
+        chosen = np.flatnonzero(keys <= cutoff)
+        candidates, keys = candidates[chosen], keys[chosen]
+    order = np.lexsort((candidates, keys))[:k]
+    return candidates[order]
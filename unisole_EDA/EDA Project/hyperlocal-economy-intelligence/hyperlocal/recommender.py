@@ -0,0 +1,179 @@
+"""Batch business recommender and ROI estimator.
+
+The Business Recommender page estimated revenue and payback for its top
+three rows one ``iterrows`` step at a time, with the capture rate and ticket
+size hard-coded and a division that blows up when revenue does not cover the
+rent.  Here every area is scored for every :class:`BusinessProfile` in one
+array pass: profiles become parameter vectors, areas become columns, and the
+results are ``(n_profiles, n_areas)`` matrices::
+
+    result = score_profiles(df, PROFILES.values(), investment=20 * 100000)
+    top = top_areas(result["roi_months"], k=10)
+
+Areas whose revenue is at or below the rent are not viable and get an
+infinite payback period instead of a negative or divide-by-zero one.
+"""
+
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+DAYS_PER_MONTH = 30
+DEFAULT_CAPTURE_RATE = 0.8
+DEFAULT_TICKET = 500
+
+CUSTOMER_SEGMENTS = ["Students", "Office Workers", "Families", "Senior Citizens", "Tourists"]
+# Area columns that signal each customer segment (averaged after scaling to 0-1)
+SEGMENT_COLUMNS = {
+    "Students": ["educational_centers"],
+    "Office Workers": ["banks_atms", "commercial_locality"],
+    "Families": ["population_estimate", "residential_locality"],
+    "Senior Citizens": ["medical_facilities"],
+    "Tourists": ["google_reviews_count", "zomato_restaurants"],
+}
+LOCALITY_SIGNALS = {
+    "commercial_locality": {"Commercial": 1.0, "Mixed": 0.5},
+    "residential_locality": {"Residential": 1.0, "Mixed": 0.5},
+}
+INPUT_COLUMNS = sorted(
+    {col for cols in SEGMENT_COLUMNS.values() for col in cols} - set(LOCALITY_SIGNALS)
+    | {"locality_type", "avg_daily_customers", "monthly_rent"}
+)
+
+
+@dataclass(frozen=True)
+class BusinessProfile:
+    """Revenue assumptions for one business type."""
+
+    name: str
+    capture_rate: float = DEFAULT_CAPTURE_RATE
+    avg_ticket: float = DEFAULT_TICKET
+    customer_weights: dict = field(default_factory=dict)
+
+    def with_customers(self, segments):
+        """Copy weighting the given segments equally (the profile's own weights if empty)."""
+        if not segments:
+            return self
+        return replace(self, customer_weights={segment: 1.0 for segment in segments})
+
+
+PROFILES = {profile.name: profile for profile in [
+    BusinessProfile("Restaurant/Cafe", 0.8, 350,
+                    {"Office Workers": 2, "Students": 1, "Tourists": 1}),
+    BusinessProfile("Retail Shop", 0.7, 600, {"Families": 2, "Office Workers": 1}),
+    BusinessProfile("Gym/Fitness", 0.3, 1500, {"Office Workers": 1, "Students": 1}),
+    BusinessProfile("Education/Coaching", 0.25, 2500, {"Students": 3, "Families": 1}),
+    BusinessProfile("Healthcare/Clinic", 0.4, 800,
+                    {"Senior Citizens": 2, "Families": 2}),
+    BusinessProfile("Salon/Spa", 0.4, 700, {"Office Workers": 1, "Families": 1}),
+    BusinessProfile("Co-working Space", 0.2, 1200, {"Office Workers": 3, "Students": 1}),
+    BusinessProfile("Other Service"),
+]}
+
+
+def _scaled(values):
+    """0-1 scaling by the column maximum; missing values count as 0."""
+    values = np.nan_to_num(np.asarray(values, dtype="float64"), nan=0.0)
+    peak = values.max() if len(values) else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+
+def segment_signals(df):
+    """(n_segments, n_areas) matrix of 0-1 customer-segment signals."""
+    locality = df["locality_type"].astype(object)
+    signals = []
+    for segment in CUSTOMER_SEGMENTS:
+        columns = []
+        for col in SEGMENT_COLUMNS[segment]:
+            if col in LOCALITY_SIGNALS:
+                columns.append(locality.map(LOCALITY_SIGNALS[col]).fillna(0).to_numpy(dtype="float64"))
+            else:
+                columns.append(_scaled(df[col]))
+        signals.append(np.mean(columns, axis=0))
+    return np.vstack(signals)
+
+
+def weight_matrix(profiles):
+    """(n_profiles, n_segments) customer weights, each row summing to 1 (or all 0)."""
+    weights = np.array([[profile.customer_weights.get(segment, 0.0)
+                         for segment in CUSTOMER_SEGMENTS] for profile in profiles],
+                       dtype="float64").reshape(-1, len(CUSTOMER_SEGMENTS))
+    totals = weights.sum(axis=1, keepdims=True)
+    return np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
+
+
+def estimate_roi(daily_customers, monthly_rent, capture_rate, avg_ticket, investment,
+                 days=DAYS_PER_MONTH):
+    """Monthly revenue, monthly margin and payback months; broadcasts over all inputs.
+
+    Payback is ``inf`` where the margin is zero or negative.
+    """
+    revenue = np.asarray(daily_customers) * capture_rate * days * avg_ticket
+    margin = revenue - np.asarray(monthly_rent)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi_months = np.where(margin > 0, np.asarray(investment) / margin, np.inf)
+    roi_months = np.where(np.isnan(margin), np.nan, roi_months)
+    return revenue, margin, roi_months
+
+
+def score_profiles(df, profiles, investment):
+    """Score every area in ``df`` for every profile in one pass.
+
+    ``investment`` is one amount for all profiles or one per profile.
+    Returns a dict of ``(n_profiles, n_areas)`` arrays: ``revenue``,
+    ``margin``, ``roi_months`` and ``customer_fit`` (0-100, how well the
+    area's customer mix matches the profile's weights), plus ``profiles``.
+    """
+    profiles = list(profiles)
+    capture = np.array([p.capture_rate for p in profiles], dtype="float64")[:, None]
+    ticket = np.array([p.avg_ticket for p in profiles], dtype="float64")[:, None]
+    customers = df["avg_daily_customers"].to_numpy(dtype="float64")[None, :]
+    rent = df["monthly_rent"].to_numpy(dtype="float64")[None, :]
+    investment = np.asarray(investment, dtype="float64")
+    if investment.ndim == 1:
+        investment = investment[:, None]
+    revenue, margin, roi_months = estimate_roi(customers, rent, capture, ticket, investment)
+    fit = weight_matrix(profiles) @ segment_signals(df) * 100
+    return {"profiles": profiles, "revenue": revenue, "margin": margin,
+            "roi_months": roi_months, "customer_fit": fit}
+
+
+def top_areas(values, k, largest=False, mask=None):
+    """Per-row indices of the ``k`` best values (smallest unless ``largest``), best first.
+
+    NaNs and positions where ``mask`` is False are never chosen; rows with
+    fewer than ``k`` candidates are padded with -1.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype="float64"))
+    keys = -values if largest else values.copy()
+    invalid = np.isnan(keys)
+    if mask is not None:
+        invalid |= ~np.broadcast_to(mask, keys.shape)
+    keys[invalid] = np.inf
+    k = min(k, keys.shape[1])
+    if k == 0:
+        return np.empty((keys.shape[0], 0), dtype=np.intp)
+    part = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    part_keys = np.take_along_axis(keys, part, axis=1)
+    # Stable order: best key first, ties by area position
+    order = np.lexsort((part, part_keys), axis=1)
+    top = np.take_along_axis(part, order, axis=1)
+    top[np.take_along_axis(invalid, top, axis=1)] = -1
+    return top
+
+
+def recommendations_frame(df, result, k=10, mask=None):
+    """Long-format table of the ``k`` fastest-payback areas per profile."""
+    if not result["profiles"]:
+        return pd.DataFrame()
+    top = top_areas(result["roi_months"], k, mask=mask)
+    # Every profile's picks in one gather: (profile, rank) pairs in row-major order
+    profile_rows, ranks = np.nonzero(top >= 0)
+    positions = top[profile_rows, ranks]
+    names = np.array([profile.name for profile in result["profiles"]], dtype=object)
+    frame = df.iloc[positions][["area_name", "city"]].reset_index(drop=True)
+    frame.insert(0, "business_type", names[profile_rows])
+    frame.insert(1, "rank", ranks + 1)
+    return frame.assign(**{key: result[key][profile_rows, positions]
+                           for key in ("revenue", "margin", "roi_months", "customer_fit")})
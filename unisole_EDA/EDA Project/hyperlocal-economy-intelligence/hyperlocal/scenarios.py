@@ -0,0 +1,170 @@
+"""What-if scoring: edited weights, thresholds and risk/return formulas.
+
+``economic_health_score``, ``risk_score`` and ``expected_return`` are linear
+in the sub-scores and the vacancy rate (see
+:mod:`~hyperlocal.pipeline`), so a :class:`Scenario` reduces to coefficient
+vectors over :data:`SCENARIO_COLUMNS`.  :class:`ScenarioMatrix` keeps those
+columns of every area as one ``(n_columns, n_areas)`` float64 matrix (and
+a copy with the risk terms: vacancy as is, sub-score shortfalls);
+re-scoring the whole dataset is a single matrix-vector product per
+scenario, and any number of scenarios stacked together is one matrix
+product::
+
+    matrix = ScenarioMatrix(df)
+    result = matrix.rescore([BASELINE, Scenario("Footfall first", weights={...})])
+    top = top_areas(result["economic_health_score"], k=10, largest=True)
+
+Results are ``(n_scenarios, n_areas)`` arrays, like
+:func:`~hyperlocal.recommender.score_profiles`.  A score is NaN where a
+column it weights is missing, as in the pipeline.  The baseline scenario
+reproduces the pipeline's scores to within 0.01 (BLAS sums the terms in a
+different order, so a few values round the other way).
+"""
+
+from dataclasses import asdict, dataclass, field
+from numbers import Real
+
+import numpy as np
+
+from .pipeline import (HIGH_THRESHOLD, MODERATE_THRESHOLD, RETURN_WEIGHTS, RISK_WEIGHTS,
+                       SUB_SCORES, WEIGHTS)
+
+HEALTH_COLUMN = "economic_health_score"
+SCENARIO_COLUMNS = [*SUB_SCORES, "vacancy_rate"]
+CATEGORIES = ["High Potential", "Moderate Potential", "Low Potential"]
+
+
+def _is_number(value):
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Scoring assumptions: health weights, category thresholds, risk and return weights.
+
+    Risk counts ``vacancy_rate`` as is and a sub-score by its shortfall from
+    100; expected return weights the (re-scored) health score and any
+    sub-scores.
+    """
+
+    name: str
+    weights: dict = field(default_factory=lambda: dict(WEIGHTS))
+    high: float = HIGH_THRESHOLD
+    moderate: float = MODERATE_THRESHOLD
+    risk_weights: dict = field(default_factory=lambda: dict(RISK_WEIGHTS))
+    return_weights: dict = field(default_factory=lambda: dict(RETURN_WEIGHTS))
+
+    def __post_init__(self):
+        for label, weights, allowed in [
+                ("weights", self.weights, SUB_SCORES),
+                ("risk_weights", self.risk_weights, SCENARIO_COLUMNS),
+                ("return_weights", self.return_weights, [HEALTH_COLUMN, *SUB_SCORES])]:
+            if not isinstance(weights, dict):
+                raise ValueError(f"{label} must map columns to weights")
+            unknown = [col for col in weights if col not in allowed]
+            if unknown:
+                raise ValueError(f"unknown {label} columns: {unknown}")
+            if not all(_is_number(w) for w in weights.values()):
+                raise ValueError(f"{label} must be numbers")
+        if not (_is_number(self.high) and _is_number(self.moderate)):
+            raise ValueError("thresholds must be numbers")
+        if self.moderate > self.high:
+            raise ValueError("the moderate threshold must not be above the high threshold")
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data[key] for key in cls.__dataclass_fields__ if key in data})
+
+
+BASELINE = Scenario("Baseline")
+
+
+def _coefficients(weights, columns=SCENARIO_COLUMNS):
+    return np.array([weights.get(col, 0.0) for col in columns], dtype="float64")
+
+
+class ScenarioMatrix:
+    """The :data:`SCENARIO_COLUMNS` of ``df`` with batch re-scoring."""
+
+    def __init__(self, df):
+        values = df[SCENARIO_COLUMNS].to_numpy(dtype="float64").T
+        # Bit j set where column j is missing
+        self.missing = (np.isnan(values).astype(np.uint16)
+                        << np.arange(len(SCENARIO_COLUMNS), dtype=np.uint16)[:, None]
+                        ).sum(axis=0, dtype=np.uint16)
+        self.matrix = np.ascontiguousarray(np.nan_to_num(values))
+        shortfall = np.array(SCENARIO_COLUMNS) != "vacancy_rate"
+        self.risk_matrix = self.matrix.copy()
+        self.risk_matrix[shortfall] = 100 - self.risk_matrix[shortfall]
+
+    def __len__(self):
+        return self.matrix.shape[1]
+
+    def _apply(self, weights, matrix=None):
+        """``(n_scenarios, n_areas)`` weighted sums, NaN where a weighted column is missing."""
+        coefficients = np.vstack([_coefficients(w) for w in weights]
+                                 ).reshape(-1, len(SCENARIO_COLUMNS))
+        values = coefficients @ (self.matrix if matrix is None else matrix)
+        for row, used in zip(values, coefficients != 0):
+            row[(self.missing & np.uint16((used << np.arange(len(used))).sum())) != 0] = np.nan
+        return values
+
+    def rescore(self, scenarios):
+        """Re-score every area for every scenario.
+
+        Returns a dict of ``(n_scenarios, n_areas)`` arrays:
+        ``economic_health_score``, ``risk_score``, ``expected_return`` and
+        ``category`` (int8 positions in :data:`CATEGORIES`; a NaN score is
+        Low, as in :func:`~hyperlocal.pipeline.classify_area`), plus
+        ``scenarios``.
+        """
+        scenarios = list(scenarios)
+        health = self._apply([s.weights for s in scenarios])
+        np.round(health, 2, out=health)
+        risk = self._apply([s.risk_weights for s in scenarios], self.risk_matrix)
+        np.round(risk, 2, out=risk)
+
+        # Expected return: the re-scored health term plus weighted sub-scores
+        returns = self._apply([s.return_weights for s in scenarios])
+        for row, h, scenario in zip(returns, health, scenarios):
+            weight = scenario.return_weights.get(HEALTH_COLUMN, 0.0)
+            if weight:
+                row += h * weight
+        np.round(returns, 2, out=returns)
+
+        category = np.full(health.shape, 2, dtype=np.int8)
+        for row, h, scenario in zip(category, health, scenarios):
+            row -= h >= scenario.moderate
+            row -= h >= scenario.high
+        return {"scenarios": scenarios, HEALTH_COLUMN: health, "category": category,
+                "risk_score": risk, "expected_return": returns}
+
+
+def category_counts(result):
+    """``(n_scenarios, 3)`` area counts per category, in :data:`CATEGORIES` order."""
+    codes = result["category"].astype(np.intp)
+    return np.stack([np.bincount(row, minlength=len(CATEGORIES)) for row in codes])
+
+
+def score_ranks(scores, rows=None):
+    """Rank of each score (1 for the highest; ties share a rank, NaN ranks last).
+
+    With ``rows``, only those positions are ranked: a comparison per row
+    instead of a full sort, for a top-k table over millions of areas.
+    """
+    scores = np.asarray(scores, dtype="float64")
+    missing = np.isnan(scores)
+    valid = len(scores) - int(missing.sum())
+    if rows is None:
+        ranked = np.sort(scores[~missing])
+        ranks = valid - np.searchsorted(ranked, scores, side="right") + 1
+    else:
+        rows = np.asarray(rows, dtype=np.intp)
+        ranks = np.array([1 + np.count_nonzero(scores > scores[row]) for row in rows],
+                         dtype=np.int64)
+        missing = missing[rows]
+    ranks[missing] = valid + 1
+    return ranks
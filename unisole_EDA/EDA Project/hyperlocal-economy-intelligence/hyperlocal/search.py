@@ -0,0 +1,163 @@
+"""Area-name search index for the Data Explorer.
+
+``str.contains`` rescans every area name on every keystroke.  The index is
+built once per dataset: names are normalized to lowercase alphanumeric
+tokens, each distinct token gets a posting list of the names that use it,
+and tokens are indexed by their trigrams.  A query token then matches name
+tokens by
+
+* prefix ("sec" -> "sector"), via binary search over the sorted vocabulary,
+* substring ("tor" -> "sector"), via the trigram index, or
+* fuzzy trigram similarity ("sectr" -> "sector"),
+
+every query token has to match, and names are ranked by how well they
+matched, with a bonus when the whole query appears in the name.  Results are
+row ids, so they combine with the sidebar filter positions.
+"""
+
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.9
+SUBSTRING_SCORE = 0.6
+FUZZY_WEIGHT = 0.5
+FUZZY_THRESHOLD = 0.45
+PHRASE_BONUS = 0.5
+START_BONUS = 0.5
+
+
+def normalize(text):
+    return _NON_ALNUM.sub(" ", str(text).lower()).strip()
+
+
+def normalize_series(names):
+    """Vectorized :func:`normalize` over a Series of names."""
+    return (names.astype(str).str.lower()
+            .str.replace(_NON_ALNUM.pattern, " ", regex=True).str.strip())
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _group_rows(codes, n_groups):
+    """CSR layout of ``codes``: (positions sorted by code, start offset of each code)."""
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+    return order, starts
+
+
+def _gather(order, starts, ids):
+    """Concatenation of the CSR groups ``ids`` without a Python loop."""
+    lengths = starts[ids + 1] - starts[ids]
+    offsets = np.repeat(starts[ids] - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return order[np.arange(lengths.sum()) + offsets], lengths
+
+
+class AreaSearchIndex:
+    """Token / trigram index over a column of area names."""
+
+    def __init__(self, names):
+        names = pd.Series(names).reset_index(drop=True)
+        codes, uniques = pd.factorize(names)
+        self.n_rows = len(names)
+        self._names = normalize_series(pd.Series(uniques))
+        self._row_order, self._row_starts = _group_rows(codes, len(uniques))
+
+        # Token postings: distinct names containing each vocabulary token
+        tokens = self._names.str.split().explode().dropna()
+        token_codes, vocab = pd.factorize(tokens, sort=True)
+        pairs = np.unique(np.stack([token_codes, tokens.index.to_numpy()], axis=1), axis=0)
+        self._vocab = list(vocab)
+        self._vocab_array = np.array(self._vocab, dtype=object)
+        self._posting_names = pairs[:, 1]
+        self._posting_starts = np.searchsorted(pairs[:, 0], np.arange(len(vocab) + 1))
+
+        grams = defaultdict(list)
+        for token_id, token in enumerate(self._vocab):
+            for gram in trigrams(token):
+                grams[gram].append(token_id)
+        self._trigram_tokens = {gram: np.array(ids) for gram, ids in grams.items()}
+        self._token_gram_counts = np.array([len(trigrams(t)) for t in self._vocab])
+
+    def _token_matches(self, query_token):
+        """{vocab token id: match score} for one query token."""
+        scores = {}
+        # Prefix: the vocabulary is sorted, so matches are one contiguous run
+        lo = np.searchsorted(self._vocab_array, query_token, side="left")
+        hi = np.searchsorted(self._vocab_array, query_token + "\uffff", side="left")
+        for token_id in range(lo, hi):
+            exact = self._vocab[token_id] == query_token
+            scores[token_id] = EXACT_SCORE if exact else PREFIX_SCORE
+
+        # Substring and fuzzy: candidates share at least one trigram
+        query_grams = trigrams(query_token)
+        hits = [self._trigram_tokens[g] for g in query_grams if g in self._trigram_tokens]
+        if hits:
+            candidates, shared = np.unique(np.concatenate(hits), return_counts=True)
+            dice = 2 * shared / (len(query_grams) + self._token_gram_counts[candidates])
+            for token_id, similarity in zip(candidates, dice):
+                if token_id in scores:
+                    continue
+                if query_token in self._vocab[token_id]:
+                    scores[token_id] = SUBSTRING_SCORE
+                elif similarity >= FUZZY_THRESHOLD:
+                    scores[token_id] = FUZZY_WEIGHT * similarity
+        if len(query_token) < 3:
+            # Too short for a trigram of its own: substring scan of the vocabulary
+            for token_id, token in enumerate(self._vocab):
+                if token_id not in scores and query_token in token:
+                    scores[token_id] = SUBSTRING_SCORE
+        return scores
+
+    def search_names(self, query):
+        """(name ids, scores) of matching distinct names, best first."""
+        query = normalize(query)
+        tokens = query.split()
+        n_names = len(self._names)
+        if not tokens:
+            return np.arange(n_names), np.zeros(n_names)
+        total = np.zeros(n_names)
+        matched_all = np.ones(n_names, dtype=bool)
+        for token in tokens:
+            best = np.zeros(n_names)
+            matches = self._token_matches(token)
+            if matches:
+                token_ids = np.fromiter(matches.keys(), dtype=np.int64, count=len(matches))
+                token_scores = np.fromiter(matches.values(), dtype=float, count=len(matches))
+                names, lengths = _gather(self._posting_names, self._posting_starts, token_ids)
+                np.maximum.at(best, names, np.repeat(token_scores, lengths))
+            matched_all &= best > 0
+            total += best
+        name_ids = np.flatnonzero(matched_all)
+        scores = total[name_ids]
+        candidates = self._names.iloc[name_ids]
+        scores += PHRASE_BONUS * candidates.str.contains(query, regex=False).to_numpy()
+        scores += START_BONUS * candidates.str.startswith(query).to_numpy()
+        order = np.lexsort((name_ids, -scores))
+        return name_ids[order], scores[order]
+
+    def search(self, query, limit=None):
+        """Row ids matching ``query``, best match first (rows of one name in row order)."""
+        name_ids, scores = self.search_names(query)
+        if limit is not None:
+            name_ids, scores = name_ids[:limit], scores[:limit]
+        rows, lengths = _gather(self._row_order, self._row_starts, name_ids)
+        return rows, np.repeat(scores, lengths)
+
+    def row_mask(self, query):
+        """Boolean mask over all rows: True where the area name matches ``query``."""
+        if not normalize(query):
+            return np.ones(self.n_rows, dtype=bool)
+        mask = np.zeros(self.n_rows, dtype=bool)
+        rows, _ = self.search(query)
+        mask[rows] = True
+        return mask
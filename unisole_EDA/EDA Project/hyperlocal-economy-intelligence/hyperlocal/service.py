@@ -0,0 +1,599 @@
+"""Headless JSON query service over the scored dataset.
+
+A plain ASGI application (no web framework), so other tools can run the
+finder, recommender, top-k and aggregate queries without a Streamlit rerun::
+
+    python -m hyperlocal.service --port 8000        # needs uvicorn
+    curl -X POST localhost:8000/top -d '{"k": 5, "city": ["Mohali"]}'
+
+Endpoints (POST takes a JSON object, GET takes no body):
+
+* ``POST /finder``      Investment Finder criteria -> matching areas, optionally
+  ``"near": {"place": "Mohali", "km": 10}`` (or a pincode, ``area_id``, ``lat``/``lon``)
+* ``POST /nearby``      ``k`` nearest areas (or all within ``km``) of a place or an area
+
+  Proximity results carry a ``placement`` per area: ``"pincode"``, or
+  ``"city"`` for an area only placed at its city centre, whose distance is
+  city-level.  An area at its city centre has no neighbours of its own, so
+  ``/nearby`` of such an ``area_id`` returns no results.
+* ``POST /similar``     ``k`` areas with the most similar sub-scores to an ``area_id``
+  (or to a ``scores`` object)
+* ``POST /clusters``    k-means groups of the sub-scores: sizes and centers
+* ``POST /scenarios``   ``{"scenarios": [{"name", "weights", "high", ...}]}`` -> each
+  scenario's category counts and top ``k`` areas after re-scoring
+* ``POST /recommend``   business type + budget -> fastest-payback areas
+* ``POST /top``         top ``k`` areas by a column, optionally filtered
+* ``POST /aggregates``  ``overview`` / ``city_stats`` / ``risk_return``
+* ``POST /batch``       ``{"requests": [{"endpoint": ..., "params": ...}]}``
+* ``GET  /health``, ``GET /stats`` (latency percentiles, cache counters)
+
+The dataset is mapped from the shared export (:mod:`hyperlocal.shared`), so
+``--workers`` processes read the same pages; its filter indexes and the
+serialized responses are held in memory, and everything is rebuilt when
+:func:`~hyperlocal.store.dataset_version` changes.
+Responses are cached by endpoint and canonical request body, so a repeated
+query costs one hash and a dictionary lookup.  Concurrent ``/recommend``
+requests that arrive within :data:`BATCH_WINDOW` seconds are scored together
+in one :func:`~hyperlocal.recommender.score_profiles` pass, and ``/batch``
+does the same for the recommend queries it carries.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import AggregateCache, city_stats, overview_aggregates, risk_return_aggregates
+from .filters import FilterIndex
+from .geo import GeoIndex, load_pincode_table, resolve_place
+from .queries import finder_index, finder_rows, top_k
+from .recommender import PROFILES, score_profiles, top_areas
+from .scenarios import CATEGORIES, HEALTH_COLUMN, Scenario, ScenarioMatrix, category_counts
+from .shared import load_shared
+from .similarity import DEFAULT_CLUSTERS, SimilarityIndex
+from .store import dataset_version
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding
+    orjson = None
+
+RESULT_COLUMNS = ["area_id", "area_name", "city", "area_type", "locality_type",
+                  "economic_health_score", "investment_category", "monthly_rent",
+                  "footfall_score", "risk_score", "expected_return", "recommended_business"]
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 1000
+MAX_CLUSTERS = 50
+MAX_SCENARIOS = 100
+DEFAULT_RADIUS_KM = 10.0
+BATCH_WINDOW = 0.002
+MAX_BATCH = 64
+# Latency targets for a warm cache, reported by /stats
+LATENCY_TARGETS_MS = {"p50": 5.0, "p99": 50.0}
+LATENCY_WINDOW = 10_000
+
+logger = logging.getLogger("hyperlocal.service")
+
+
+class BadRequest(ValueError):
+    """Invalid request; answered with HTTP 400."""
+
+
+def dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def records(frame):
+    """JSON-ready rows: NaN becomes null, numpy scalars become Python values."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def series_dict(series):
+    return {str(key): (None if value != value else float(value)) for key, value in series.items()}
+
+
+class LatencyStats:
+    """Rolling per-endpoint latency samples with percentile summaries."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, endpoint, seconds):
+        self._samples[endpoint].append(seconds)
+
+    def summary(self):
+        out = {}
+        for endpoint, samples in self._samples.items():
+            p50, p99 = np.percentile(np.fromiter(samples, dtype=float), [50, 99]) * 1000
+            out[endpoint] = {"count": len(samples), "p50_ms": round(p50, 3),
+                             "p99_ms": round(p99, 3),
+                             "within_target": bool(p50 <= LATENCY_TARGETS_MS["p50"] and
+                                                   p99 <= LATENCY_TARGETS_MS["p99"])}
+        return out
+
+
+def _number(params, key, default, kind=float):
+    try:
+        return kind(params.get(key, default))
+    except (TypeError, ValueError):
+        raise BadRequest(f"{key!r} must be a number") from None
+
+
+def _text(params, key, default):
+    value = params.get(key, default)
+    if not isinstance(value, str):
+        raise BadRequest(f"{key!r} must be a string")
+    return value
+
+
+def _names(params, key, default=None):
+    """A list of strings (``default`` when absent)."""
+    value = params.get(key, default)
+    if value is not None and not (isinstance(value, list)
+                                  and all(isinstance(v, str) for v in value)):
+        raise BadRequest(f"{key!r} must be a list of strings")
+    return value
+
+
+def _score_range(params):
+    value = params.get("score_range")
+    if value is None:
+        return None
+    try:
+        low, high = (float(v) for v in value)
+    except (TypeError, ValueError):
+        raise BadRequest("'score_range' must be a [low, high] pair of numbers") from None
+    return low, high
+
+
+def _limit(params):
+    limit = _number(params, "limit" if "limit" in params else "k", DEFAULT_LIMIT, int)
+    if not 0 <= limit <= MAX_LIMIT:
+        raise BadRequest(f"limit must be between 0 and {MAX_LIMIT}")
+    return limit
+
+
+def _columns(df, params):
+    columns = _names(params, "columns", RESULT_COLUMNS)
+    unknown = [col for col in columns if col not in df.columns]
+    if unknown:
+        raise BadRequest(f"unknown columns: {unknown}")
+    return list(columns)
+
+
+def _profile(params):
+    name = _text(params, "business_type", "Other Service")
+    if name not in PROFILES:
+        raise BadRequest(f"unknown business_type {name!r}; expected one of {list(PROFILES)}")
+    return PROFILES[name].with_customers(_names(params, "target_customers"))
+
+
+class QueryService:
+    """Query handlers over the in-memory dataset, independent of HTTP."""
+
+    def __init__(self, loader=load_shared, version=dataset_version, cache_size=1024):
+        self._loader = loader
+        self._version = version
+        self.version = None
+        self.df = None
+        self.cache = AggregateCache(maxsize=cache_size)
+        self.latency = LatencyStats()
+        self.handlers = {"finder": self.finder, "recommend": self.recommend, "top": self.top,
+                         "aggregates": self.aggregates, "nearby": self.nearby,
+                         "similar": self.similar, "clusters": self.clusters,
+                         "scenarios": self.scenarios}
+
+    def ensure_loaded(self):
+        """Load the dataset (again, if its version changed)."""
+        version = self._version()
+        if self.df is None or version != self.version:
+            self.df = self._loader()
+            self.filter_index = FilterIndex(self.df)
+            self.finder_index = finder_index(self.df)
+            self.places = load_pincode_table()
+            self.geo_index = GeoIndex.from_frame(self.df, self.places)
+            self.area_ids = pd.Index(self.df["area_id"])
+            self._similarity = None
+            self._scenario_matrix = None
+            self.version = version
+            self.cache.clear()
+
+    def cache_key(self, endpoint, params):
+        body = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.blake2b(f"{self.version}:{endpoint}:{body}".encode(),
+                               digest_size=16).hexdigest()
+
+    def _rows(self, params):
+        """Sidebar-style selection: city / area_type lists and a score range."""
+        return self.filter_index.select(score_range=_score_range(params),
+                                        city=_names(params, "city"),
+                                        area_type=_names(params, "area_type"))
+
+    @property
+    def similarity(self):
+        """Sub-score :class:`SimilarityIndex`, built on the first lookup."""
+        if self._similarity is None:
+            self._similarity = SimilarityIndex(self.df)
+        return self._similarity
+
+    @property
+    def scenario_matrix(self):
+        """:class:`ScenarioMatrix` of the dataset, built on the first re-scoring."""
+        if self._scenario_matrix is None:
+            self._scenario_matrix = ScenarioMatrix(self.df)
+        return self._scenario_matrix
+
+    def _area_row(self, area_id):
+        if not isinstance(area_id, (str, int)):
+            raise BadRequest(f"unknown area_id {area_id!r}")
+        row = self.area_ids.get_indexer([area_id])[0]
+        if row < 0:
+            raise BadRequest(f"unknown area_id {area_id!r}")
+        return row
+
+    def _point(self, params):
+        """``(lat, lon, row)`` of an ``area_id``, a ``place`` (pincode or city) or ``lat``/``lon``."""
+        if not isinstance(params, dict):
+            raise BadRequest("a place must be an object with an area_id, place or lat/lon")
+        if "area_id" in params:
+            row = self._area_row(params["area_id"])
+            return self.geo_index.lat[row], self.geo_index.lon[row], row
+        if "place" in params:
+            try:
+                return (*resolve_place(params["place"], self.places), None)
+            except KeyError as exc:
+                raise BadRequest(exc.args[0]) from None
+        if "lat" in params and "lon" in params:
+            return _number(params, "lat", None), _number(params, "lon", None), None
+        raise BadRequest("give an area_id, a place (pincode or city) or lat and lon")
+
+    def _near(self, params):
+        """``(rows, distances)`` within ``km`` of the point in ``params``, nearest first."""
+        lat, lon, _ = self._point(params)
+        return self.geo_index.radius(lat, lon, _number(params, "km", DEFAULT_RADIUS_KM))
+
+    def finder(self, params):
+        near = params.get("near")
+        within, distances = self._near(near) if near is not None else (None, None)
+        rows = finder_rows(
+            self.df,
+            budget=_number(params, "budget", 25000),
+            min_score=_number(params, "min_score", 60),
+            growth=_names(params, "growth", ["Growing", "Stable"]),
+            min_footfall=_number(params, "min_footfall", 50),
+            cities=_names(params, "cities", self.filter_index.options["city"]),
+            localities=_names(params, "localities", ["Commercial", "Mixed"]),
+            max_risk=_number(params, "max_risk", 50),
+            index=self.finder_index,
+            within=within,
+        )
+        shown = rows[:_limit(params)]
+        results = self.df.iloc[shown][_columns(self.df, params)]
+        if within is not None:
+            # Distance of each shown row, looked up in the radius result
+            order = np.argsort(within, kind="stable")
+            found = order[np.searchsorted(within, shown, sorter=order)]
+            results = self._placed(results, shown, distances[found])
+        return {"count": len(rows), "results": records(results)}
+
+    def _placed(self, results, rows, distances):
+        placement = np.where(self.geo_index.exact[rows], "pincode", "city")
+        return results.assign(distance_km=distances.round(3), placement=placement)
+
+    def nearby(self, params):
+        """Nearest areas to a point or to an area (the area itself left out)."""
+        lat, lon, row = self._point(params)
+        if row is not None and not self.geo_index.exact[row]:
+            return {"results": [], "placement": "city"}
+        if "km" in params:
+            rows, distances = self.geo_index.radius(lat, lon, _number(params, "km", None))
+            keep = rows != row
+            rows, distances = rows[keep][:_limit(params)], distances[keep][:_limit(params)]
+        else:
+            rows, distances = self.geo_index.nearest(lat, lon, _limit(params), exclude=row)
+        results = self.df.iloc[rows][_columns(self.df, params)]
+        return {"results": records(self._placed(results, rows, distances))}
+
+    def similar(self, params):
+        """Areas whose sub-scores are nearest an area's (itself left out) or given ``scores``."""
+        if "area_id" in params:
+            rows, distances = self.similarity.similar(self._area_row(params["area_id"]),
+                                                      _limit(params))
+        elif isinstance(params.get("scores"), dict):
+            scores = {col: _number(params["scores"], col, np.nan)
+                      for col in self.similarity.columns}
+            rows, distances = self.similarity.query(self.similarity.vector(scores),
+                                                    _limit(params))
+        else:
+            raise BadRequest("give an area_id or a scores object")
+        results = self.df.iloc[rows][_columns(self.df, params)]
+        return {"results": records(results.assign(distance=distances.round(4)))}
+
+    def clusters(self, params):
+        k = _number(params, "k", DEFAULT_CLUSTERS, int)
+        if not 1 <= k <= MAX_CLUSTERS:
+            raise BadRequest(f"k must be between 1 and {MAX_CLUSTERS}")
+        labels, centers = self.similarity.clusters(k)
+        return {"columns": self.similarity.columns,
+                "sizes": np.bincount(labels, minlength=len(centers)).tolist(),
+                "centers": np.round(centers, 2).tolist()}
+
+    def scenarios(self, params):
+        """Re-score every area under each scenario (all in one pass)."""
+        given = params.get("scenarios")
+        if not isinstance(given, list) or not 1 <= len(given) <= MAX_SCENARIOS:
+            raise BadRequest(f"'scenarios' must be a list of 1 to {MAX_SCENARIOS} objects")
+        try:
+            scenarios = [Scenario.from_dict({"name": f"Scenario {i + 1}", **s})
+                         for i, s in enumerate(given)]
+        except (TypeError, ValueError) as exc:
+            raise BadRequest(f"invalid scenario: {exc}") from None
+        result = self.scenario_matrix.rescore(scenarios)
+        top = top_areas(result[HEALTH_COLUMN], _limit(params), largest=True)
+        columns = _columns(self.df, params)
+        responses = []
+        for i, (scenario, counts) in enumerate(zip(scenarios, category_counts(result))):
+            rows = top[i][top[i] >= 0]
+            frame = self.df.iloc[rows][columns].reset_index(drop=True)
+            for key in (HEALTH_COLUMN, "risk_score", "expected_return"):
+                frame[key] = result[key][i, rows]
+            frame["investment_category"] = np.array(CATEGORIES)[result["category"][i, rows]]
+            responses.append({"name": scenario.name,
+                              "category_counts": dict(zip(CATEGORIES, counts.tolist())),
+                              "results": records(frame)})
+        return {"scenarios": responses}
+
+    def top(self, params):
+        column = _text(params, "column", "economic_health_score")
+        if column not in self.df.columns:
+            raise BadRequest(f"unknown column {column!r}")
+        rows = top_k(self.df[column].to_numpy(dtype="float64"), _limit(params),
+                      largest=not params.get("ascending", False), rows=self._rows(params))
+        return {"results": records(self.df.iloc[rows][_columns(self.df, params)])}
+
+    def aggregates(self, params):
+        kind = _text(params, "kind", "overview")
+        selected = self.df.take(self._rows(params))
+        if kind == "city_stats":
+            stats = city_stats(selected)
+            return {"results": records(stats.reset_index())}
+        if kind == "risk_return":
+            agg = risk_return_aggregates(selected)
+            return {"risk_median": agg["risk_median"], "return_median": agg["return_median"],
+                    "best": records(agg["best"])}
+        if kind == "overview":
+            # Same shape for an empty selection: zero counts and shares, no top_city
+            agg = overview_aggregates(selected, self.df)
+            return {key: agg[key] for key in ("total", "share", "avg_score", "overall_avg_score",
+                                                "high_potential", "high_potential_share",
+                                                "top_city")} | {
+                "category_counts": series_dict(agg["category_counts"]),
+                "top_10": records(agg["top_10"][RESULT_COLUMNS]),
+            }
+        raise BadRequest(f"unknown aggregate kind {kind!r}")
+
+    def recommend(self, params):
+        return self.recommend_many([params])[0]
+
+    def recommend_query(self, params):
+        """Parsed recommend request; raises :class:`BadRequest` for any invalid value."""
+        return {"profile": _profile(params),
+                "investment": _number(params, "investment", 20 * 100000),
+                "monthly_budget": _number(params, "monthly_budget", np.inf),
+                "area_type": _text(params, "area_type", "Any"),
+                "limit": _limit(params),
+                "columns": _columns(self.df, params)}
+
+    def recommend_many(self, requests):
+        """Answer several recommend requests with one scoring pass."""
+        queries = [self.recommend_query(params) for params in requests]
+        result = score_profiles(self.df, [q["profile"] for q in queries],
+                                [q["investment"] for q in queries])
+        rent = self.df["monthly_rent"].to_numpy(dtype="float64")
+        area_type = self.df["area_type"].astype(object).to_numpy()
+        responses = []
+        for i, query in enumerate(queries):
+            mask = rent <= query["monthly_budget"]
+            if query["area_type"] != "Any":
+                mask &= area_type == query["area_type"]
+            top = top_areas(result["roi_months"][i], query["limit"], mask=mask)[0]
+            top = top[top >= 0]
+            frame = self.df.iloc[top][query["columns"]].reset_index(drop=True)
+            for key in ("revenue", "roi_months", "customer_fit"):
+                values = result[key][i, top]
+                frame[key] = np.where(np.isfinite(values), values, np.nan).round(2)
+            responses.append({"business_type": query["profile"].name,
+                              "candidates": int(mask.sum()), "results": records(frame)})
+        return responses
+
+    def handle(self, endpoint, params):
+        """Serialized response body for one query, from the cache when possible."""
+        if endpoint not in self.handlers:
+            raise KeyError(endpoint)
+        if not isinstance(params, dict):
+            raise BadRequest("request body must be a JSON object")
+        return self.cache.get(self.cache_key(endpoint, params),
+                              lambda: dumps(self.handlers[endpoint](params)))
+
+    def handle_batch(self, requests):
+        """Serialized responses for a list of queries; recommend queries share one pass."""
+        if not isinstance(requests, list):
+            raise BadRequest("'requests' must be a list")
+        bodies = [None] * len(requests)
+        pending = []
+        for i, request in enumerate(requests):
+            if not isinstance(request, dict):
+                raise BadRequest(f"requests[{i}] must be an object with an endpoint and params")
+            endpoint, params = request.get("endpoint"), request.get("params", {})
+            if not isinstance(endpoint, str) or endpoint not in self.handlers:
+                raise BadRequest(f"requests[{i}]: unknown endpoint {endpoint!r}")
+            if not isinstance(params, dict):
+                raise BadRequest(f"requests[{i}]: params must be an object")
+            key = self.cache_key(endpoint, params)
+            if endpoint == "recommend":
+                pending.append((i, key, params))
+            else:
+                bodies[i] = self.handle(endpoint, params)
+        if pending:
+            for (i, key, _), response in zip(pending, self.recommend_many([p for *_, p in pending])):
+                bodies[i] = self.cache.get(key, lambda response=response: dumps(response))
+        return b"[" + b",".join(bodies) + b"]"
+
+    def stats(self):
+        return {"version": self.version, "rows": 0 if self.df is None else len(self.df),
+                "cache": {"hits": self.cache.hits, "misses": self.cache.misses,
+                          "entries": len(self.cache)},
+                "latency": self.latency.summary(), "latency_targets_ms": LATENCY_TARGETS_MS}
+
+
+class RecommendBatcher:
+    """Coalesces concurrent recommend requests into one scoring pass."""
+
+    def __init__(self, service, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.service = service
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._flush_handle = None
+
+    async def submit(self, params):
+        key = self.service.cache_key("recommend", params)
+        if key in self.service.cache:
+            return self.service.handle("recommend", params)
+        self.service.recommend_query(params)  # reject bad requests before they join a batch
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((key, params, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        try:
+            responses = self.service.recommend_many([params for _, params, _ in batch])
+        except Exception:
+            # Answer each request on its own, so a failure only reaches its own caller
+            for _, params, future in batch:
+                try:
+                    future.set_result(self.service.handle("recommend", params))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+        for (key, _, future), response in zip(batch, responses):
+            future.set_result(self.service.cache.get(key, lambda response=response: dumps(response)))
+
+
+class ServiceApp:
+    """ASGI application wrapping a :class:`QueryService`."""
+
+    def __init__(self, service=None):
+        self.service = service or QueryService()
+        self.batcher = RecommendBatcher(self.service)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        start = time.perf_counter()
+        endpoint = scope["path"].strip("/")
+        status, body = await self._dispatch(scope["method"], endpoint, receive)
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+        if status == 200 and endpoint != "stats":
+            self.service.latency.record(endpoint, time.perf_counter() - start)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.service.ensure_loaded()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, method, endpoint, receive):
+        try:
+            self.service.ensure_loaded()
+            if method == "GET" and endpoint == "health":
+                return 200, dumps({"status": "ok", "version": self.service.version})
+            if method == "GET" and endpoint == "stats":
+                return 200, dumps(self.service.stats())
+            if endpoint not in self.service.handlers and endpoint != "batch":
+                return 404, dumps({"error": f"unknown endpoint /{endpoint}"})
+            if method != "POST":
+                return 405, dumps({"error": "use POST with a JSON body"})
+            params = await _read_json(receive)
+            if endpoint == "batch":
+                return 200, self.service.handle_batch(params.get("requests"))
+            if endpoint == "recommend":
+                return 200, await self.batcher.submit(params)
+            return 200, self.service.handle(endpoint, params)
+        except BadRequest as exc:
+            return 400, dumps({"error": str(exc)})
+        except Exception:
+            logger.exception("error answering %s /%s", method, endpoint)
+            return 500, dumps({"error": "internal server error"})
+
+
+async def _read_json(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    raw = b"".join(chunks)
+    try:
+        params = json.loads(raw) if raw.strip() else {}
+    except json.JSONDecodeError as exc:
+        raise BadRequest(f"invalid JSON: {exc}") from None
+    if not isinstance(params, dict):
+        raise BadRequest("request body must be a JSON object")
+    return params
+
+
+app = ServiceApp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the scored dataset as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="server processes; they share one memory-mapped copy of the dataset")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    target = "hyperlocal.service:app" if args.workers > 1 else app
+    uvicorn.run(target, host=args.host, port=args.port, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
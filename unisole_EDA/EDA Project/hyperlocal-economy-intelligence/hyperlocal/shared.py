@@ -0,0 +1,155 @@
+"""Memory-mapped processed dataset shared by every session and process.
+
+``st.cache_data`` hands each caller its own unpickled copy of the frame, and
+every worker process loads the store again.  :func:`open_shared` exports
+the typed store once per dataset version to a directory of column files and
+maps them read-only instead:
+
+* numeric and datetime columns are ``.npy`` files opened with ``mmap_mode="r"``;
+* categoricals are their integer codes (``.npy``) with the categories kept
+  in the manifest;
+* strings are an uncompressed Arrow IPC file, memory-mapped and wrapped in
+  pandas' Arrow-backed string array.
+
+Frames built on these files are views, so the OS page cache holds a single
+copy of each column however many sessions, Streamlit servers or service
+workers read it.  The arrays are read-only: copy a column before modifying
+it.  The export directory is :data:`SHARED_ROOT` (``$HYPERLOCAL_SHARED_DIR``,
+default a ``hyperlocal-shared`` folder in the system temp directory).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import APP_DIR
+from .store import dataset_version, load_processed
+
+SHARED_ROOT = Path(os.environ.get("HYPERLOCAL_SHARED_DIR",
+                                  Path(tempfile.gettempdir()) / "hyperlocal-shared"))
+MANIFEST = "manifest.json"
+STRINGS_FILE = "strings.arrow"
+
+
+def export_shared(df, directory):
+    """Write ``df`` (store schema) as column files plus a manifest into ``directory``."""
+    import pyarrow as pa
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    columns, strings = [], {}
+    for i, (name, series) in enumerate(df.items()):
+        entry = {"name": name, "file": f"{i:03d}.npy"}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry.update(kind="category", categories=series.cat.categories.tolist(),
+                         ordered=bool(series.cat.ordered))
+            np.save(directory / entry["file"], series.cat.codes.to_numpy())
+        elif isinstance(series.dtype, pd.StringDtype) or series.dtype == object:
+            entry.update(kind="string", file=STRINGS_FILE)
+            strings[name] = pa.array(series.astype("string").array, type=pa.large_string())
+        else:
+            entry.update(kind="array")
+            np.save(directory / entry["file"], series.to_numpy())
+        columns.append(entry)
+    if strings:
+        table = pa.table(strings)
+        with pa.OSFile(str(directory / STRINGS_FILE), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    # Written last: a directory with a manifest is complete
+    (directory / MANIFEST).write_text(json.dumps({"rows": len(df), "columns": columns}))
+    return directory
+
+
+def _version_dir(version, root):
+    digest = hashlib.blake2b(str(version).encode(), digest_size=8).hexdigest()
+    return Path(root) / digest
+
+
+def ensure_shared(version=None, root=None, app_dir=APP_DIR):
+    """Directory holding the export of ``version``, building it if no process has yet.
+
+    Concurrent builders each write a private directory and rename it into
+    place; the first rename wins.  Exports of other versions are removed.
+    """
+    root = Path(root or SHARED_ROOT)
+    version = version or dataset_version(app_dir)
+    target = _version_dir(version, root)
+    if (target / MANIFEST).exists():
+        return target
+    root.mkdir(parents=True, exist_ok=True)
+    build = Path(tempfile.mkdtemp(dir=root, prefix=".build-"))
+    try:
+        export_shared(load_processed(app_dir=app_dir), build)
+        os.rename(build, target)
+    except OSError:
+        if not (target / MANIFEST).exists():
+            raise
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+    for stale in root.iterdir():
+        if stale.is_dir() and stale != target and not stale.name.startswith("."):
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def _read_strings(path):
+    import pyarrow as pa
+
+    # The table keeps the memory map alive for as long as its columns are used
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def open_shared(columns=None, version=None, root=None, app_dir=APP_DIR):
+    """Processed dataset as a frame of read-only views over the shared export.
+
+    Same columns and dtypes as :func:`~hyperlocal.store.load_processed`;
+    ``columns`` picks (and orders) the columns to map.
+    """
+    directory = ensure_shared(version, root, app_dir)
+    manifest = json.loads((directory / MANIFEST).read_text())
+    entries = {entry["name"]: entry for entry in manifest["columns"]}
+    names = list(columns) if columns is not None else list(entries)
+    unknown = [name for name in names if name not in entries]
+    if unknown:
+        raise KeyError(f"columns not in the processed dataset: {unknown}")
+
+    data, strings = {}, None
+    for name in names:
+        entry = entries[name]
+        if entry["kind"] == "string":
+            if strings is None:
+                strings = _read_strings(directory / STRINGS_FILE)
+            data[name] = pd.arrays.ArrowStringArray(strings[name])
+            continue
+        # Plain ndarray view of the map: pandas treats np.memmap as its own class
+        values = np.load(directory / entry["file"], mmap_mode="r").view(np.ndarray)
+        if entry["kind"] == "category":
+            dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+            data[name] = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        else:
+            data[name] = values
+    return pd.DataFrame(data, columns=names, index=pd.RangeIndex(manifest["rows"]), copy=False)
+
+
+def load_shared(columns=None, version=None):
+    """:func:`open_shared`, or an in-memory :func:`~hyperlocal.store.load_processed`
+    when the export cannot be written or pyarrow is missing."""
+    try:
+        return open_shared(columns, version)
+    except (OSError, ImportError):
+        return load_processed(columns)
+
+
+def take_rows(df, rows):
+    """``df.take(rows)``, but a view (no copy) when ``rows`` is a contiguous run."""
+    rows = np.asarray(rows)
+    if len(rows) and rows[-1] - rows[0] == len(rows) - 1 and (np.diff(rows) == 1).all():
+        return df.iloc[rows[0]:rows[-1] + 1]
+    return df.take(rows)
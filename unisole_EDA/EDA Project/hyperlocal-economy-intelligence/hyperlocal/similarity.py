@@ -0,0 +1,171 @@
+""""More like this" lookups and clustering over the engineered sub-scores.
+
+:class:`SimilarityIndex` keeps the eight sub-scores of every area as one
+C-contiguous float32 matrix, standardised per column so each score counts
+the same (a missing score sits at the column mean).  Similar areas are the
+nearest rows by Euclidean distance in that space.
+
+Small datasets are scanned in full.  Above :data:`EXACT_ROWS` areas the
+index is an inverted file: k-means (:func:`kmeans`, trained on a sample)
+splits the rows into about ``sqrt(n)`` lists stored contiguously, and a
+lookup only scans the :data:`N_PROBE` lists whose centroids are nearest the
+query.  That is approximate (a neighbour in an unprobed list is missed) but
+reads a few thousand rows instead of all of them.
+
+:meth:`SimilarityIndex.clusters` groups the areas with the same k-means
+(the notebook imported ``KMeans`` and ``PCA`` but never used them) and
+:meth:`SimilarityIndex.projection` gives the two principal components for
+plotting.  Both are numpy only.
+"""
+
+import numpy as np
+import pandas as pd
+
+SUBSCORE_COLUMNS = ["business_density_score", "footfall_score", "infrastructure_score",
+                    "property_value_score", "digital_presence_score", "growth_momentum_score",
+                    "competition_score", "occupancy_score"]
+EXACT_ROWS = 50_000
+N_PROBE = 8
+SAMPLE_ROWS = 32_768
+KMEANS_ITERATIONS = 20
+DEFAULT_CLUSTERS = 5
+ASSIGN_ROWS = 65_536
+
+
+def _assign(matrix, centers, chunk_rows=ASSIGN_ROWS):
+    """Index of the nearest center for every row, ``chunk_rows`` rows at a time."""
+    center_norms = (centers ** 2).sum(axis=1)
+    labels = np.empty(len(matrix), dtype=np.intp)
+    for start in range(0, len(matrix), chunk_rows):
+        block = matrix[start:start + chunk_rows]
+        labels[start:start + len(block)] = np.argmin(center_norms - 2 * block @ centers.T, axis=1)
+    return labels
+
+
+def kmeans(matrix, k, iterations=KMEANS_ITERATIONS, seed=0, sample_rows=SAMPLE_ROWS):
+    """``(centers, labels)`` of Lloyd's k-means with k-means++ seeding.
+
+    Centers are fitted on at most ``sample_rows`` random rows; every row is
+    then labelled with its nearest center.
+    """
+    rng = np.random.default_rng(seed)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    k = max(1, min(k, len(matrix)))
+    sample = matrix
+    if len(matrix) > sample_rows:
+        sample = matrix[np.sort(rng.choice(len(matrix), sample_rows, replace=False))]
+
+    # k-means++: each next center drawn in proportion to squared distance
+    centers = np.empty((k, matrix.shape[1]), dtype=np.float32)
+    centers[0] = sample[rng.integers(len(sample))]
+    closest = ((sample - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = closest.sum()
+        if total > 0:
+            centers[i] = sample[rng.choice(len(sample), p=closest / total)]
+        else:
+            centers[i] = sample[rng.integers(len(sample))]
+        closest = np.minimum(closest, ((sample - centers[i]) ** 2).sum(axis=1))
+
+    for _ in range(iterations):
+        labels = _assign(sample, centers)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers, dtype="float64")
+        np.add.at(sums, labels, sample)
+        filled = counts > 0
+        updated = centers.copy()
+        # An empty cluster keeps its previous center
+        updated[filled] = (sums[filled] / counts[filled, None]).astype(np.float32)
+        if np.array_equal(updated, centers):
+            break
+        centers = updated
+    return centers, _assign(matrix, centers)
+
+
+class SimilarityIndex:
+    """Standardised sub-score matrix of ``df`` with nearest-neighbour lookups."""
+
+    def __init__(self, df, columns=SUBSCORE_COLUMNS, exact_rows=EXACT_ROWS, n_lists=None,
+                 seed=0):
+        self.columns = list(columns)
+        values = df[self.columns].to_numpy(dtype="float64")
+        present = np.maximum((~np.isnan(values)).sum(axis=0), 1)
+        self.mean = np.nansum(values, axis=0) / present
+        self.scale = np.sqrt(np.nansum((values - self.mean) ** 2, axis=0) / present)
+        self.scale[self.scale == 0] = 1.0
+        scaled = (values - self.mean) / self.scale
+        scaled[np.isnan(scaled)] = 0.0
+        self.matrix = np.ascontiguousarray(scaled, dtype=np.float32)
+        self._norms = (self.matrix ** 2).sum(axis=1)
+        self.seed = seed
+        self._clusters = {}
+
+        self.centroids = None
+        if len(self.matrix) > exact_rows:
+            n_lists = n_lists or int(np.sqrt(len(self.matrix)))
+            self.centroids, labels = kmeans(self.matrix, n_lists, iterations=10, seed=seed)
+            self._order = np.argsort(labels, kind="stable")
+            self._starts = np.searchsorted(labels[self._order], np.arange(len(self.centroids) + 1))
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def vector(self, scores):
+        """Standardised query vector for a mapping or sequence of raw sub-scores."""
+        if isinstance(scores, dict):
+            scores = [scores.get(col, np.nan) for col in self.columns]
+        scaled = (np.asarray(scores, dtype="float64") - self.mean) / self.scale
+        return np.nan_to_num(scaled).astype(np.float32)
+
+    def _candidates(self, vector, n_probe):
+        if self.centroids is None:
+            return None
+        probe = np.argsort(((self.centroids - vector) ** 2).sum(axis=1))[:n_probe]
+        return np.concatenate([self._order[self._starts[i]:self._starts[i + 1]] for i in probe])
+
+    def query(self, vector, k=10, n_probe=N_PROBE, exclude=None):
+        """``(rows, distances)`` of the ``k`` rows nearest ``vector``, nearest first."""
+        vector = np.asarray(vector, dtype=np.float32)
+        rows = self._candidates(vector, n_probe)
+        if rows is None:
+            rows, matrix, norms = np.arange(len(self.matrix)), self.matrix, self._norms
+        else:
+            matrix, norms = self.matrix[rows], self._norms[rows]
+        squared = np.maximum(norms - 2 * (matrix @ vector) + vector @ vector, 0)
+        if exclude is not None:
+            squared[rows == exclude] = np.inf
+        k = min(k, int(np.isfinite(squared).sum()))
+        if k <= 0:
+            return rows[:0], np.empty(0, dtype=np.float32)
+        top = np.argpartition(squared, k - 1)[:k] if k < len(squared) else np.arange(len(squared))
+        # Nearest first; equal distances keep row order
+        top = top[np.lexsort((rows[top], squared[top]))]
+        return rows[top], np.sqrt(squared[top])
+
+    def similar(self, row, k=10, n_probe=N_PROBE):
+        """The ``k`` areas most like the area at position ``row`` (itself left out)."""
+        return self.query(self.matrix[row], k, n_probe, exclude=row)
+
+    def clusters(self, k=DEFAULT_CLUSTERS):
+        """``(labels, centers)``: k-means groups, centers in sub-score units (cached per k)."""
+        if k not in self._clusters:
+            centers, labels = kmeans(self.matrix, k, seed=self.seed)
+            self._clusters[k] = (labels, centers * self.scale + self.mean)
+        return self._clusters[k]
+
+    def cluster_table(self, k=DEFAULT_CLUSTERS):
+        """One row per cluster: its size and mean sub-scores, largest cluster first."""
+        labels, centers = self.clusters(k)
+        table = pd.DataFrame(centers.round(1), columns=self.columns)
+        table.insert(0, "areas", np.bincount(labels, minlength=len(centers)))
+        table.index = pd.Index([f"Cluster {i + 1}" for i in range(len(centers))], name="cluster")
+        return table.sort_values("areas", ascending=False, kind="stable")
+
+    def projection(self):
+        """Coordinates of every area on the two principal components, ``(n, 2)``."""
+        if not len(self.matrix):
+            return np.empty((0, 2), dtype=np.float32)
+        centred = self.matrix - self.matrix.mean(axis=0)
+        _, vectors = np.linalg.eigh(centred.T.astype("float64") @ centred)
+        components = vectors[:, ::-1][:, :2].astype(np.float32)
+        return centred @ components
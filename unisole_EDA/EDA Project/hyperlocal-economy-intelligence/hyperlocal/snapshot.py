@@ -0,0 +1,129 @@
+"""Warm-start snapshot of what app.py builds before its first render.
+
+A new app process used to build the filter index, the area-name search
+index and the correlation cell sums, and compute the landing page's
+aggregates, before drawing anything.  :class:`Snapshot` holds all of them
+and is pickled once per dataset version next to the processed CSV, so a
+cold process loads them with one read::
+
+    python -m hyperlocal.snapshot      # e.g. in the deploy build step
+
+A snapshot file is only used when both its dataset version and its code
+fingerprint (the sources of the modules it pickles) match; otherwise
+:func:`load_snapshot` builds a fresh one and writes it back.  Snapshots are
+pickles: only load files this app wrote.
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .aggregates import NUMERIC_CORR_COLUMNS, overview_aggregates, selection_key
+from .analytics import SufficientStats
+from .filters import FilterIndex
+from .pipeline import PROCESSED_CSV
+from .search import AreaSearchIndex
+from .shared import load_shared, take_rows
+from .store import dataset_version
+
+SNAPSHOT_PATH = PROCESSED_CSV.with_suffix(".snapshot.pkl")
+# Columns of the sidebar filters and of the Overview page
+FILTER_COLUMNS = ('city', 'area_type', 'economic_health_score')
+OVERVIEW_COLUMNS = ('area_name', 'city', 'economic_health_score', 'investment_category')
+DEFAULT_CITY_COUNT = 3
+DEFAULT_SCORE_RANGE = (0, 100)
+_FINGERPRINT_MODULES = ("aggregates", "analytics", "filters", "search", "snapshot")
+
+
+def default_selection(options):
+    """Sidebar selection of a new session: the first cities, every area type, all scores."""
+    return (list(options['city'][:DEFAULT_CITY_COUNT]), list(options['area_type']),
+            DEFAULT_SCORE_RANGE)
+
+
+def code_fingerprint():
+    """Hash of the modules whose objects a snapshot pickles."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in _FINGERPRINT_MODULES:
+        digest.update((Path(__file__).parent / f"{name}.py").read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class Snapshot:
+    version: str
+    fingerprint: str
+    filter_index: FilterIndex
+    search_index: AreaSearchIndex
+    sufficient_stats: SufficientStats
+    # AggregateCache key -> value, for the default sidebar selection
+    aggregates: dict = field(default_factory=dict)
+
+
+def build_snapshot(version=None, loader=load_shared):
+    """Build every boot-time index and the default Overview aggregates."""
+    version = version or dataset_version()
+    columns = tuple(dict.fromkeys(FILTER_COLUMNS + tuple(NUMERIC_CORR_COLUMNS) + OVERVIEW_COLUMNS))
+    df = loader(columns, version)
+    filter_index = FilterIndex(df)
+
+    cities, area_types, score_range = default_selection(filter_index.options)
+    rows = filter_index.select(score_range=score_range, city=cities, area_type=area_types)
+    overview = df[list(OVERVIEW_COLUMNS)]
+    selection = selection_key(version, cities, area_types, score_range)
+    aggregates = {f"{selection}:overview": overview_aggregates(take_rows(overview, rows), overview)}
+
+    return Snapshot(
+        version=version,
+        fingerprint=code_fingerprint(),
+        filter_index=filter_index,
+        search_index=AreaSearchIndex(df['area_name']),
+        sufficient_stats=SufficientStats(df),
+        aggregates=aggregates,
+    )
+
+
+def save_snapshot(snapshot, path=SNAPSHOT_PATH):
+    """Write ``snapshot`` atomically (readers never see a partial file)."""
+    path = Path(path)
+    partial = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(partial, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial, path)
+    return path
+
+
+def load_snapshot(version=None, path=SNAPSHOT_PATH, loader=load_shared):
+    """The snapshot at ``path`` if it is current, else a fresh one (saved when possible)."""
+    version = version or dataset_version()
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot.version == version and snapshot.fingerprint == code_fingerprint():
+            return snapshot
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+        pass
+    snapshot = build_snapshot(version, loader)
+    try:
+        save_snapshot(snapshot, path)
+    except OSError:
+        pass  # read-only deploy: use it from memory
+    return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prebuild the app's warm-start snapshot.")
+    parser.add_argument("--output", type=Path, default=SNAPSHOT_PATH, help="snapshot file to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    path = save_snapshot(build_snapshot(), args.output)
+    print(f" Snapshot built in {time.perf_counter() - start:.2f}s -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Typed columnar store for the processed dataset.
+
+``pd.read_csv`` gives every numeric column float64 and every label an object
+string.  The store applies one schema instead: low-cardinality labels become
+categoricals, counts become the narrowest integer that fits (float32 when the
+column has gaps) and measurements and scores become float32.  It is written
+as Parquet next to the processed CSV and read back with column projection,
+so each dashboard page only loads what it uses::
+
+    python -m hyperlocal.store            # rebuild the .parquet from the CSV
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import APP_DIR, DATE_COLUMN, PROCESSED_CSV
+
+PROCESSED_PARQUET = PROCESSED_CSV.with_suffix(".parquet")
+
+CATEGORY_COLUMNS = [
+    "city", "area_type", "locality_type", "footfall_intensity", "business_growth",
+    "property_trend", "competition_level", "parking_availability", "main_issue",
+    "investment_category", "recommended_business",
+]
+STRING_COLUMNS = ["area_id", "area_name"]
+# Whole-number columns: narrowest integer type, float32 if any value is missing
+INTEGER_COLUMNS = [
+    "pincode", "retail_shops", "restaurants", "banks_atms", "medical_facilities",
+    "educational_centers", "parking_lots", "vacant_shops", "vehicle_count_15min",
+    "road_condition", "street_lighting", "cleanliness", "monthly_rent",
+    "property_price_sqft", "residential_rent_1bhk", "google_reviews_count",
+    "zomato_restaurants", "population_estimate", "news_mentions_6months",
+    "business_density", "growth_momentum_score", "competition_score",
+]
+
+
+def narrow_integer(series):
+    """Smallest integer dtype holding ``series``; float32 if it has NaNs or fractions."""
+    values = series.to_numpy(dtype="float64")
+    if len(values) and np.isfinite(values).all() and (values == np.round(values)).all():
+        return pd.to_numeric(series, downcast="integer")
+    return series.astype("float32")
+
+
+def apply_schema(df):
+    """Cast a processed frame (from CSV or the pipeline) to the store schema."""
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in STRING_COLUMNS:
+            df[col] = df[col].astype("string")
+        elif col == DATE_COLUMN:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif col in INTEGER_COLUMNS:
+            df[col] = narrow_integer(df[col])
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("float32")
+    return df
+
+
+def write_store(df, path=PROCESSED_PARQUET):
+    """Write ``df`` as Parquet with the store schema."""
+    apply_schema(df).to_parquet(path, engine="pyarrow", index=False)
+    return path
+
+
+def read_store(path=PROCESSED_PARQUET, columns=None):
+    """Read the Parquet store, loading only ``columns`` when given."""
+    return pd.read_parquet(path, engine="pyarrow",
+                           columns=list(columns) if columns is not None else None)
+
+
+def _candidates(app_dir):
+    names = ["hyperlocal_economy_processed.parquet", "hyperlocal_economy_processed.csv"]
+    for folder in (app_dir, app_dir / "data"):
+        yield tuple(folder / name for name in names)
+
+
+def dataset_version(app_dir=APP_DIR):
+    """Cache key that changes whenever the file :func:`load_processed` reads changes."""
+    for paths in _candidates(app_dir):
+        for path in paths:
+            if path.exists():
+                stat = path.stat()
+                return f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}"
+    return None
+
+
+def load_processed(columns=None, app_dir=APP_DIR):
+    """Processed dataset from the Parquet store, falling back to the CSV.
+
+    Both sources return the same typed schema; ``columns`` limits the load to
+    the listed columns.
+    """
+    for parquet_path, csv_path in _candidates(app_dir):
+        if parquet_path.exists():
+            try:
+                return read_store(parquet_path, columns)
+            except ImportError:
+                pass  # pyarrow not installed: use the CSV
+        if csv_path.exists():
+            usecols = list(columns) if columns is not None else None
+            return apply_schema(pd.read_csv(csv_path, usecols=usecols))[usecols or slice(None)]
+    raise FileNotFoundError(
+        "Could not find hyperlocal_economy_processed.parquet/.csv in expected locations."
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the processed CSV to the typed Parquet store.")
+    parser.add_argument("--input", default=PROCESSED_CSV, help="processed CSV")
+    parser.add_argument("--output", default=PROCESSED_PARQUET, help="Parquet file to write")
+    args = parser.parse_args(argv)
+
+    path = write_store(pd.read_csv(args.input), args.output)
+    print(f" Parquet store written: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Out-of-core pipeline for raw survey files larger than memory.
+
+:func:`~hyperlocal.pipeline.run_pipeline` reads the whole survey, and every
+stage needs dataset-wide statistics: group medians and modes for the fills,
+a neighbour pool for KNN, maxima and 5/95 percentile caps for scoring.  The
+streaming mode reads the raw CSV once in chunks and makes three passes over
+chunk files spilled to a scratch directory, so peak memory is one chunk plus
+fixed-size summaries:
+
+1. clean and validate each chunk; collect value counts for the group
+   medians, the winsorize caps and the modes, the category values, and a
+   reservoir sample of rows as the KNN neighbour pool;
+2. impute each chunk from those statistics, tracking the scoring maxima;
+3. score each chunk with the final :class:`~hyperlocal.pipeline.ScoringStats`
+   and append it to the output CSV.
+
+Medians and percentile caps come from :class:`QuantileSketch`, which is
+exact until a column has more than ``max_distinct`` distinct values and then
+rounds values to fewer significant digits.  With no more rows than
+``reference_rows`` the KNN pool is the whole file, and the output is the
+same as the in-memory pipeline's::
+
+    python -m hyperlocal --input statewide.csv --chunksize 200000
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .incremental import _tracked_values
+from .pipeline import (
+    DATE_COLUMN,
+    GROUP_FILL_COLUMNS,
+    GROUP_FILL_KEYS,
+    GROUP_FILL_TARGET,
+    INFRA_COLUMNS,
+    KNN_COLUMNS,
+    MODE_FILL_COLUMNS,
+    NUMERIC_COLUMNS,
+    WINSORIZE_COLUMNS,
+    WINSORIZE_LIMITS,
+    ScoringStats,
+    clean,
+    knn_impute,
+    score,
+)
+
+CHUNK_ROWS = 100_000
+REFERENCE_ROWS = 50_000
+MAX_DISTINCT = 2 ** 16
+# Columns the scoring stages read; a file without them cannot be processed
+REQUIRED_COLUMNS = sorted(set(
+    GROUP_FILL_KEYS + GROUP_FILL_COLUMNS + KNN_COLUMNS + WINSORIZE_COLUMNS + INFRA_COLUMNS +
+    ["business_growth", "competition_level", "google_rating", "vacant_shops"]
+))
+
+
+class QuantileSketch:
+    """Mergeable value counts of a numeric column, with NaNs counted apart.
+
+    Order statistics follow ``np.sort`` semantics (NaNs rank last), like
+    :class:`~hyperlocal.incremental.SortedValues`, but memory is bounded by
+    ``max_distinct`` rather than the row count.  Past that many distinct
+    values the sketch rounds to fewer significant digits and ``exact``
+    becomes False; ``max_distinct=None`` keeps it exact.
+    """
+
+    def __init__(self, max_distinct=MAX_DISTINCT):
+        self.max_distinct = max_distinct
+        self.values = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.nan_count = 0
+        self.exact = True
+        self._digits = 15
+
+    def __len__(self):
+        return int(self.counts.sum()) + self.nan_count
+
+    def add(self, values):
+        values = np.asarray(values, dtype="float64")
+        nan = np.isnan(values)
+        self.nan_count += int(nan.sum())
+        new_values, new_counts = np.unique(values[~nan], return_counts=True)
+        self._merge(new_values, new_counts)
+
+    def merge(self, other):
+        self.nan_count += other.nan_count
+        self.exact &= other.exact
+        self._merge(other.values, other.counts)
+
+    def _merge(self, values, counts):
+        if not self.exact:
+            values = _round_significant(values, self._digits)
+        merged, inverse = np.unique(np.concatenate([self.values, values]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]),
+                                  minlength=len(merged)).astype(np.int64)
+        self.values = merged
+        while (self.max_distinct is not None and len(self.values) > self.max_distinct
+               and self._digits > 1):
+            self._digits -= 1
+            self.exact = False
+            rounded, inverse = np.unique(_round_significant(self.values, self._digits),
+                                         return_inverse=True)
+            self.counts = np.bincount(inverse, weights=self.counts,
+                                      minlength=len(rounded)).astype(np.int64)
+            self.values = rounded
+
+    def max(self):
+        return float(self.values[-1]) if len(self.values) else np.nan
+
+    def order_stat(self, i):
+        """``i``-th smallest value (0-based); NaN past the finite values."""
+        cumulative = np.cumsum(self.counts)
+        if i >= (cumulative[-1] if len(cumulative) else 0):
+            return np.nan
+        return float(self.values[np.searchsorted(cumulative, i, side="right")])
+
+    def median(self):
+        """Median of the finite values, as ``Series.median`` computes it."""
+        n = int(self.counts.sum())
+        if n == 0:
+            return np.nan
+        if n % 2:
+            return self.order_stat(n // 2)
+        return (self.order_stat(n // 2 - 1) + self.order_stat(n // 2)) / 2
+
+    def winsorize_bounds(self, limits=WINSORIZE_LIMITS):
+        """Same result as :func:`hyperlocal.pipeline.winsorize_bounds` on the full column."""
+        n = len(self)
+        if n == 0:
+            return (np.nan, np.nan)
+        up_idx = n - int(n * limits[1])
+        low = self.order_stat(int(limits[0] * n)) if limits[0] else np.nan
+        high = self.order_stat(up_idx - 1) if up_idx > 0 else np.nan
+        return (low, high)
+
+
+def _round_significant(values, digits):
+    values = np.asarray(values, dtype="float64")
+    with np.errstate(divide="ignore"):
+        exponent = np.floor(np.log10(np.abs(values)))
+    scale = 10.0 ** (digits - 1 - np.where(np.isfinite(exponent), exponent, 0))
+    return np.round(values * scale) / scale
+
+
+class ReservoirSample:
+    """Uniform sample of up to ``size`` rows (algorithm R), kept in file order."""
+
+    def __init__(self, columns, size=REFERENCE_ROWS, seed=0):
+        self.columns = list(columns)
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.empty((0, len(self.columns)))
+        self._positions = np.empty(0, dtype=np.int64)
+
+    def add(self, chunk):
+        values = chunk[self.columns].to_numpy(dtype="float64")
+        positions = self.seen + np.arange(len(values))
+        self.seen += len(values)
+        room = max(0, self.size - len(self._rows))
+        self._rows = np.concatenate([self._rows, values[:room]])
+        self._positions = np.concatenate([self._positions, positions[:room]])
+        values, positions = values[room:], positions[room:]
+        if not len(values):
+            return
+        slots = self._rng.integers(0, positions + 1)
+        take = np.flatnonzero(slots < self.size)
+        # Within the chunk a later row replacing the same slot wins
+        last = len(take) - 1 - np.unique(slots[take][::-1], return_index=True)[1]
+        take = take[last]
+        self._rows[slots[take]] = values[take]
+        self._positions[slots[take]] = positions[take]
+
+    def frame(self):
+        order = np.argsort(self._positions, kind="stable")
+        return pd.DataFrame(self._rows[order], columns=self.columns)
+
+
+def _invalid_counts(raw, cleaned):
+    """Per column: raw values that were present but could not be parsed."""
+    counts = {}
+    for col in NUMERIC_COLUMNS + [DATE_COLUMN]:
+        if col in raw.columns:
+            bad = int((raw[col].notna() & cleaned[col].isna()).sum())
+            if bad:
+                counts[col] = bad
+    return counts
+
+
+class StreamingPipeline:
+    """Bounded-memory version of :func:`~hyperlocal.pipeline.run_pipeline`."""
+
+    def __init__(self, chunksize=CHUNK_ROWS, reference_rows=REFERENCE_ROWS,
+                 max_distinct=MAX_DISTINCT, seed=0, knn=knn_impute):
+        self.chunksize = chunksize
+        self.max_distinct = max_distinct
+        self.knn = knn
+        self.group_values = {}          # (column, group key) -> QuantileSketch
+        self.mode_counts = {col: pd.Series(dtype="int64") for col in MODE_FILL_COLUMNS}
+        self.has_missing = dict.fromkeys(GROUP_FILL_COLUMNS, False)
+        self.invalid = {}
+        self.reference = ReservoirSample(KNN_COLUMNS, reference_rows, seed)
+        self.tracked = {}
+        self.rows = 0
+
+    def _sketch(self, key):
+        if key not in self.group_values:
+            self.group_values[key] = QuantileSketch(self.max_distinct)
+        return self.group_values[key]
+
+    def merge(self, other):
+        """Fold in the summaries another pipeline collected from different rows."""
+        for key, sketch in other.group_values.items():
+            self._sketch(key).merge(sketch)
+        for col, counts in other.mode_counts.items():
+            self.mode_counts[col] = self.mode_counts[col].add(counts, fill_value=0)
+        for col, missing in other.has_missing.items():
+            self.has_missing[col] |= missing
+        for col, bad in other.invalid.items():
+            self.invalid[col] = self.invalid.get(col, 0) + bad
+        for name, sketch in other.tracked.items():
+            if name not in self.tracked:
+                self.tracked[name] = QuantileSketch(self.max_distinct)
+            self.tracked[name].merge(sketch)
+        self.rows += other.rows
+
+    # Pass 1
+    def observe(self, raw):
+        missing = [col for col in REQUIRED_COLUMNS if col not in raw.columns]
+        if missing:
+            raise ValueError(f"raw survey is missing required columns: {missing}")
+        cleaned = clean(raw)
+        for col, bad in _invalid_counts(raw, cleaned).items():
+            self.invalid[col] = self.invalid.get(col, 0) + bad
+        for col in GROUP_FILL_COLUMNS:
+            self.has_missing[col] |= bool(cleaned[col].isna().any())
+            for key, values in cleaned.groupby(GROUP_FILL_KEYS, sort=False, observed=True)[col]:
+                self._sketch((col, key)).add(values)
+        for col in MODE_FILL_COLUMNS:
+            if col in cleaned.columns:
+                self.mode_counts[col] = self.mode_counts[col].add(
+                    cleaned[col].value_counts(), fill_value=0)
+        self.reference.add(cleaned)
+        self.rows += len(cleaned)
+        return cleaned
+
+    def finish_observing(self):
+        """Turn pass-1 summaries into the fill values used by pass 2."""
+        # Same choice as group_fill_source, over the whole file
+        filled = [col for col in GROUP_FILL_COLUMNS if self.has_missing[col]]
+        self.fill_source = filled[-1] if filled else "monthly_rent"
+        self.medians = {key: sketch.median() for (col, key), sketch in self.group_values.items()
+                        if col == self.fill_source}
+        self.modes = {}
+        for col, counts in self.mode_counts.items():
+            if len(counts):
+                # Series.mode: most frequent, ties broken by the sorted order
+                self.modes[col] = sorted(counts.index[counts == counts.max()])[0]
+            else:
+                self.modes[col] = "Unknown"
+        self.reference_frame = self.reference.frame()
+
+    # Pass 2
+    def impute(self, cleaned):
+        df = cleaned.copy()
+        keys = pd.MultiIndex.from_frame(df[GROUP_FILL_KEYS])
+        medians = pd.Series(self.medians, dtype="float64")
+        if not medians.empty:
+            medians.index = pd.MultiIndex.from_tuples(medians.index, names=GROUP_FILL_KEYS)
+        fill = medians.reindex(keys).to_numpy() if not medians.empty else np.nan
+        df[GROUP_FILL_TARGET] = df[self.fill_source].fillna(pd.Series(fill, index=df.index))
+        for col in MODE_FILL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].fillna(self.modes[col])
+        if df[KNN_COLUMNS].isna().any().any():
+            df[KNN_COLUMNS] = self.knn(df, KNN_COLUMNS, reference=self.reference_frame)
+        for name, values in _tracked_values(df).items():
+            if name not in self.tracked:
+                self.tracked[name] = QuantileSketch(self.max_distinct)
+            self.tracked[name].add(values)
+        return df
+
+    def scoring_stats(self):
+        return ScoringStats(
+            business_density_max=self.tracked["business_density"].max(),
+            total_footfall_max=self.tracked["total_footfall"].max(),
+            property_price_sqft_max=self.tracked["property_price_sqft"].max(),
+            caps={col: self.tracked[col].winsorize_bounds() for col in WINSORIZE_COLUMNS},
+        )
+
+    def run(self, input_path, output_path, workdir=None):
+        """Process ``input_path`` into ``output_path``; returns a summary dict."""
+        with tempfile.TemporaryDirectory(dir=workdir) as scratch:
+            scratch = Path(scratch)
+            spilled = []
+            for i, raw in enumerate(pd.read_csv(input_path, chunksize=self.chunksize)):
+                path = scratch / f"chunk_{i:06d}.pkl"
+                self.observe(raw).to_pickle(path)
+                spilled.append(path)
+            self.finish_observing()
+
+            for path in spilled:
+                self.impute(pd.read_pickle(path)).to_pickle(path)
+            stats = self.scoring_stats()
+
+            # Integer columns that are float (have gaps) in any chunk are float
+            # in the whole file, as a single read_csv would type them
+            dtypes = {}
+            for path in spilled:
+                scored = score(pd.read_pickle(path), stats)
+                scored.to_pickle(path)
+                for col, dtype in scored.dtypes.items():
+                    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                        dtypes[col] = np.result_type(dtypes.get(col, dtype), dtype)
+
+            for i, path in enumerate(spilled):
+                scored = pd.read_pickle(path)
+                for col, dtype in dtypes.items():
+                    if col in scored.columns and scored[col].dtype != dtype:
+                        scored[col] = scored[col].astype(dtype)
+                scored.to_csv(output_path, index=False, header=(i == 0), mode="w" if i == 0 else "a")
+        return {"rows": self.rows, "chunks": len(spilled), "invalid_values": self.invalid,
+                "stats": stats, "exact": all(s.exact for s in self.tracked.values()) and
+                all(s.exact for s in self.group_values.values()),
+                "reference_rows": len(self.reference_frame)}
+
+
+def process_file_streaming(input_path, output_path, chunksize=CHUNK_ROWS,
+                           reference_rows=REFERENCE_ROWS, workdir=None, knn=knn_impute):
+    """Streaming counterpart of :func:`~hyperlocal.pipeline.process_file` (CSV output)."""
+    pipeline = StreamingPipeline(chunksize=chunksize, reference_rows=reference_rows, knn=knn)
+    return pipeline.run(input_path, output_path, workdir=workdir)
@@ -0,0 +1,184 @@
+"""Synthetic raw surveys with the schema and dirt of the real one.
+
+The bundled survey has 200 areas, too few to time anything.
+:func:`generate_raw` produces any number of rows with the same 35 columns,
+similar value ranges and missing rates, and the formats the cleaning stage
+has to undo: ``"Rs 1266"``, ``"6795/-"``, ``"~265"``, ``"3shops"`` and
+survey dates in ISO and day-first styles.  Footfall, customers and business
+counts rise together with an area's activity level (urban and commercial
+areas are busier), so the scores spread like the real ones.
+
+Rows are generated in blocks of :data:`BLOCK_ROWS`, each seeded from
+``(seed, block number)``, so every complete block is the same whatever the
+total size and :func:`write_raw_csv` can stream millions of rows::
+
+    python -m hyperlocal.synthetic --rows 1000000 --output raw_1m.csv
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import DATE_FORMATS
+
+BLOCK_ROWS = 100_000
+DIRTY_SHARE = 0.03
+
+CITIES = {
+    "Zirakpur": 25, "Panchkula": 25, "Mohali": 24, "Chandigarh": 22, "Ambala": 20,
+    "Patiala": 17, "Amritsar": 14, "Solan": 13, "Karnal": 12, "Jalandhar": 11,
+    "Ludhiana": 10, "Shimla": 7,
+}
+AREA_TYPES = {"Semi-Urban": 0.51, "Urban": 0.325, "Rural": 0.165}
+LOCALITY_TYPES = {"Commercial": 0.42, "Mixed": 0.31, "Residential": 0.27}
+# column -> (values and weights, missing rate)
+CATEGORIES = {
+    "footfall_intensity": ({"Medium": 0.64, "High": 0.2, "Low": 0.16}, 0.04),
+    "business_growth": ({"Declining": 0.5, "Growing": 0.29, "Stable": 0.21}, 0.09),
+    "property_trend": ({"Rising": 0.4, "Stable": 0.31, "Falling": 0.29}, 0.0),
+    "competition_level": ({"Low": 0.52, "High": 0.32, "Medium": 0.16}, 0.0),
+    "parking_availability": ({"Easy": 0.4, "Difficult": 0.31, "Moderate": 0.29}, 0.19),
+    "main_issue": ({"High rent": 0.39, "parking shortage": 0.27,
+                    "Poor infrastructure": 0.24, "Low footfall": 0.1}, 0.125),
+}
+# column -> (low, high, missing rate, decimals, follows activity, dirty format)
+NUMERIC = {
+    "pincode": (140000, 149999, 0.09, 0, False, None),
+    "retail_shops": (5, 69, 0.06, 0, True, None),
+    "restaurants": (2, 34, 0.075, 0, True, None),
+    "banks_atms": (2, 12, 0.125, 0, True, None),
+    "medical_facilities": (1, 9, 0.0, 0, True, None),
+    "educational_centers": (1, 7, 0.0, 0, False, None),
+    "parking_lots": (0, 5, 0.19, 0, False, None),
+    "vacant_shops": (0, 8, 0.04, 0, False, "{}shops"),
+    "pedestrian_count_15min": (20, 400, 0.075, 0, True, "~{}"),
+    "vehicle_count_15min": (7, 183, 0.0, 0, True, None),
+    "road_condition": (2, 6, 0.035, 0, False, None),
+    "street_lighting": (2, 5, 0.0, 0, False, None),
+    "cleanliness": (2, 4, 0.06, 0, False, None),
+    "avg_daily_customers": (7, 192, 0.09, 0, True, None),
+    "avg_transaction_value": (300, 1600, 0.125, 0, False, "Rs {}"),
+    "monthly_rent": (5000, 49140, 0.075, 0, True, None),
+    "property_price_sqft": (2000, 8000, 0.075, 0, True, "{}/-"),
+    "residential_rent_1bhk": (3000, 29484, 0.125, 0, True, None),
+    "google_rating": (3.2, 4.7, 0.075, 1, False, None),
+    "google_reviews_count": (114, 2485, 0.16, 0, True, None),
+    "zomato_restaurants": (2, 34, 0.125, 0, True, None),
+    "population_estimate": (5213, 49439, 0.06, 0, False, None),
+    "news_mentions_6months": (0, 19, 0.24, 0, False, None),
+}
+DATE_MISSING = 0.075
+NAME_PARTS = ["Sector", "Phase", "Model Town", "Civil Lines", "Mall Road", "GT Road",
+              "Old City", "Industrial Zone", "Market", "Colony", "Bazaar", "Chowk"]
+# Column order of the raw survey export
+RAW_COLUMNS = [
+    "area_id", "area_name", "city", "area_type", "locality_type", "pincode",
+    "retail_shops", "restaurants", "banks_atms", "medical_facilities",
+    "educational_centers", "parking_lots", "vacant_shops", "pedestrian_count_15min",
+    "vehicle_count_15min", "footfall_intensity", "road_condition", "street_lighting",
+    "cleanliness", "avg_daily_customers", "avg_transaction_value", "monthly_rent",
+    "business_growth", "property_price_sqft", "residential_rent_1bhk", "property_trend",
+    "google_rating", "google_reviews_count", "zomato_restaurants", "population_estimate",
+    "last_survey_date", "competition_level", "parking_availability", "main_issue",
+    "news_mentions_6months",
+]
+
+
+def _choice(rng, weighted, n, missing=0.0):
+    labels = np.array(list(weighted), dtype=object)
+    weights = np.array(list(weighted.values()), dtype="float64")
+    values = labels[rng.choice(len(labels), n, p=weights / weights.sum())]
+    values[rng.random(n) < missing] = np.nan
+    return values
+
+
+def _dirty(values, decimals, template, rng):
+    """Text column: plain numbers, with DIRTY_SHARE of them in ``template``."""
+    text = pd.Series(values).map(lambda v: f"{v:.{decimals}f}", na_action="ignore")
+    dirty = text.notna().to_numpy() & (rng.random(len(values)) < DIRTY_SHARE)
+    prefix, _, suffix = template.partition("{}")
+    text[dirty] = prefix + text[dirty] + suffix
+    return text.to_numpy(dtype=object)
+
+
+def _dates(rng, n):
+    days = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 31, n), unit="D")
+    styles = rng.choice(len(DATE_FORMATS), n, p=[0.85] + [0.05] * (len(DATE_FORMATS) - 1))
+    out = np.full(n, np.nan, dtype=object)
+    for i, fmt in enumerate(DATE_FORMATS):
+        rows = styles == i
+        out[rows] = days[rows].strftime(fmt)
+    out[rng.random(n) < DATE_MISSING] = np.nan
+    return out
+
+
+def _block(seed, block, start, n):
+    rng = np.random.default_rng([seed, block])
+    ids = np.arange(start + 1, start + n + 1)
+    data = {
+        "area_id": ("AREA_" + pd.Series(ids).astype(str).str.zfill(7)).to_numpy(dtype=object),
+        "city": _choice(rng, CITIES, n),
+        "area_type": _choice(rng, AREA_TYPES, n),
+        "locality_type": _choice(rng, LOCALITY_TYPES, n),
+    }
+    data["area_name"] = (pd.Series(np.array(NAME_PARTS, dtype=object)[rng.integers(0, len(NAME_PARTS), n)])
+                         + " " + pd.Series(rng.integers(1, 80, n)).astype(str)
+                         + " " + pd.Series(data["city"])).to_numpy(dtype=object)
+
+    # Busier areas: urban and commercial localities, plus noise
+    activity = (0.35 * (data["area_type"] == "Urban") + 0.15 * (data["area_type"] == "Semi-Urban")
+                + 0.25 * (data["locality_type"] == "Commercial")
+                + 0.1 * (data["locality_type"] == "Mixed"))
+    activity = np.clip(activity + rng.normal(0.2, 0.15, n), 0, 1)
+
+    for col, (low, high, missing, decimals, follows, template) in NUMERIC.items():
+        share = rng.random(n)
+        if follows:
+            share = np.clip(0.6 * activity + 0.4 * share, 0, 1)
+        values = np.round(low + share * (high - low), decimals)
+        values[rng.random(n) < missing] = np.nan
+        data[col] = _dirty(values, decimals, template, rng) if template else values
+    for col, (weighted, missing) in CATEGORIES.items():
+        data[col] = _choice(rng, weighted, n, missing)
+    data["last_survey_date"] = _dates(rng, n)
+    return pd.DataFrame(data, columns=RAW_COLUMNS)
+
+
+def iter_raw_blocks(rows, seed=0):
+    """Yield the synthetic survey ``rows`` long, one block frame at a time."""
+    for block, start in enumerate(range(0, rows, BLOCK_ROWS)):
+        frame = _block(seed, block, start, min(BLOCK_ROWS, rows - start))
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        yield frame
+
+
+def generate_raw(rows, seed=0):
+    """In-memory synthetic raw survey with ``rows`` areas."""
+    blocks = list(iter_raw_blocks(rows, seed))
+    if not blocks:
+        return _block(seed, 0, 0, 0)
+    return pd.concat(blocks)
+
+
+def write_raw_csv(path, rows, seed=0):
+    """Write the synthetic survey to ``path`` block by block (bounded memory)."""
+    for i, frame in enumerate(iter_raw_blocks(rows, seed)):
+        frame.to_csv(path, index=False, header=(i == 0), mode="w" if i == 0 else "a")
+    return Path(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic raw survey CSV.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    write_raw_csv(args.output, args.rows, args.seed)
+    print(f" {args.rows} synthetic areas -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from hyperlocal import aggregates
+from hyperlocal.aggregates import AggregateCache, selection_key
+from hyperlocal.pipeline import PROCESSED_CSV
+
+
+def test_selection_key_ignores_pick_order():
+    a = selection_key("v1", ["Mohali", "Ambala"], ["Urban"], (0, 100))
+    b = selection_key("v1", ["Ambala", "Mohali"], ["Urban"], (0.0, 100.0))
+    assert a == b
+    assert a != selection_key("v2", ["Ambala", "Mohali"], ["Urban"], (0, 100))
+    assert a != selection_key("v1", ["Ambala"], ["Urban"], (0, 100))
+
+
+def test_lru_evicts_least_recently_used():
+    cache = AggregateCache(maxsize=2)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    cache.get("a", lambda: compute(1))
+    cache.get("b", lambda: compute(2))
+    assert cache.get("a", lambda: compute(99)) == 1  # hit, refreshes "a"
+    cache.get("c", lambda: compute(3))  # evicts "b"
+    assert cache.get("b", lambda: compute(4)) == 4
+    assert calls == [1, 2, 3, 4]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+
+    cache.put("d", 5)  # preloaded values count as neither hit nor miss
+    assert "d" in cache and "c" not in cache
+    assert cache.get("d", lambda: compute(6)) == 5 and cache.misses == 4
+
+
+def test_page_aggregates_match_inline_pandas():
+    df = pd.read_csv(PROCESSED_CSV)
+    subset = df[df["city"].isin(["Mohali", "Patiala"])]
+    overview = aggregates.overview_aggregates(subset, df)
+    assert overview["top_city"] == subset.groupby("city")["economic_health_score"].mean().idxmax()
+    assert overview["top_10"].index.tolist() == subset.nlargest(10, "economic_health_score").index.tolist()
+    stats = aggregates.city_stats(subset)
+    assert stats["Count"].sum() == len(subset)
+    risk = aggregates.risk_return_aggregates(subset)
+    assert (risk["best"]["risk_score"] < subset["risk_score"].median()).all()
+
+    empty = aggregates.overview_aggregates(df[df["economic_health_score"] >= 99], df)
+    assert (empty["total"], empty["top_city"], empty["high_potential_share"]) == (0, None, 0.0)
+    assert empty["top_10"].empty
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.aggregates import NUMERIC_CORR_COLUMNS
+from hyperlocal.analytics import SufficientStats
+from hyperlocal.charts import ols_line
+from hyperlocal.filters import FilterIndex
+from hyperlocal.store import load_processed
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_processed()
+
+
+@pytest.fixture(scope="module")
+def stats(df):
+    return SufficientStats(df)
+
+
+@pytest.mark.parametrize("cities, area_types, score_range", [
+    ([], [], (0, 100)),
+    (["Mohali", "Ambala"], [], (0, 100)),
+    ([], ["Urban"], (40, 70)),
+    (["Patiala"], ["Semi-Urban", "Rural"], (10, 90)),
+    ([], [], (65, 65)),
+    (["Nowhere"], [], (0, 100)),
+])
+def test_matches_scanning_the_selection(df, stats, cities, area_types, score_range):
+    rows = FilterIndex(df).select(score_range=score_range, city=cities, area_type=area_types)
+    selected = df.take(rows)
+    expected = selected[NUMERIC_CORR_COLUMNS].corr()
+    got = stats.corr(score_range, city=cities, area_type=area_types)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), atol=1e-9, equal_nan=True)
+
+    line = stats.ols("monthly_rent", "economic_health_score", score_range,
+                     city=cities, area_type=area_types)
+    expected_line = ols_line(selected["monthly_rent"], selected["economic_health_score"])
+    if expected_line is None:
+        assert line is None
+    else:
+        np.testing.assert_allclose(line, expected_line, rtol=1e-7)
+
+
+def test_whole_dataset_and_missing_scores(df, stats):
+    np.testing.assert_allclose(stats.corr().to_numpy(), df[NUMERIC_CORR_COLUMNS].corr().to_numpy(),
+                               atol=1e-9, equal_nan=True)
+
+
+def test_trendlines_per_group(df, stats):
+    lines = stats.trendlines("footfall_score", "economic_health_score", "area_type", (0, 100))
+    for label, (slope, intercept, low, high) in lines.items():
+        group = df[(df["area_type"] == label) & df["economic_health_score"].between(0, 100)]
+        np.testing.assert_allclose((slope, intercept),
+                                   ols_line(group["footfall_score"], group["economic_health_score"]))
+        assert (low, high) == (group["footfall_score"].min(), group["footfall_score"].max())
+
+
+def test_fractional_ranges_are_not_supported(stats):
+    assert stats.supports((10, 90)) and not stats.supports((10.5, 90))
+    with pytest.raises(ValueError):
+        stats.corr((10.5, 90))
+
+
+def test_memory_follows_occupied_cells(df, stats):
+    # At most one cell per row, each holding 4 p x p moments
+    p = len(NUMERIC_CORR_COLUMNS)
+    assert stats.nbytes <= len(df) * (4 * p * p + 2 * p + 3) * 8
+    assert stats.nbytes < 1_000_000
+    # Doubling the rows adds no cells
+    doubled = SufficientStats(pd.concat([df, df], ignore_index=True))
+    assert doubled.nbytes == stats.nbytes
+    np.testing.assert_allclose(doubled.corr((20, 80)).to_numpy(),
+                               stats.corr((20, 80)).to_numpy(), atol=1e-9, equal_nan=True)
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from hyperlocal.bench import (append_history, find_regressions, main, read_history,  # noqa: E402
+                              run_benchmarks)
+
+
+def test_run_records_every_case(tmp_path):
+    record = run_benchmarks(rows=300, repeat=1, workdir=tmp_path)
+    assert record["rows"] == 300 and record["knn"] == "exact"
+    names = set(record["results"])
+    assert {"pipeline.clean", "pipeline.impute", "pipeline.score", "load.shared",
+            "sidebar.select", "overview.aggregates", "finder.rows",
+            "recommender.score_profiles", "reports.write", "snapshot.load"} <= names
+    assert all(r["min_ms"] <= r["median_ms"] for r in record["results"].values())
+    assert list(tmp_path.iterdir()) == []
+
+
+def _record(ms, rows=1000, host="a"):
+    return {"rows": rows, "seed": 0, "knn": "exact", "machine": {"host": host, "cpus": 1},
+            "results": {"x": {"min_ms": ms, "median_ms": ms}}}
+
+
+def test_regressions_against_recent_median(tmp_path):
+    path = tmp_path / "history.jsonl"
+    for ms in [100, 500, 100, 100, 110, 100]:
+        append_history(_record(ms), path)
+    history = read_history(path)
+    assert len(history) == 6
+
+    assert find_regressions(_record(120), history) == {}
+    assert find_regressions(_record(200), history)["x"]["baseline_ms"] == 100
+    # Other sizes and machines are not comparable
+    assert find_regressions(_record(200, rows=10), history) == {}
+    assert find_regressions(_record(200, host="b"), history) == {}
+
+
+def test_cli_appends_history(tmp_path, capsys):
+    path = tmp_path / "history.jsonl"
+    main(["--rows", "200", "--repeat", "1", "--history", str(path)])
+    assert "pipeline.impute" in capsys.readouterr().out
+    assert [r["rows"] for r in read_history(path)] == [200]
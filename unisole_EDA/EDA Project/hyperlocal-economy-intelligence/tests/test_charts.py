@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.charts import (binned_counts, hexbin, histogram_figure, ols_line,
+                               sample_positions, scatter_figure)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    x = rng.normal(50, 10, n)
+    x[:5] = [500, 501, 502, 503, 504]  # far-away outliers
+    return pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(0, 1, n),
+        "score": rng.uniform(0, 100, n),
+        "group": rng.choice(["a", "b", "c"], n),
+        "name": [f"area {i}" for i in range(n)],
+    })
+
+
+def test_binned_counts_match_numpy(frame):
+    values = frame["score"].to_numpy().copy()
+    values[:10] = np.nan
+    edges, labels, counts = binned_counts(values, nbins=30)
+    expected, expected_edges = np.histogram(values[~np.isnan(values)], bins=30)
+    np.testing.assert_allclose(edges, expected_edges)
+    assert labels == [None] and (counts[0] == expected).all()
+
+    edges, labels, counts = binned_counts(frame["score"], frame["group"], nbins=7)
+    for label, row in zip(labels, counts):
+        subset = frame.loc[frame["group"] == label, "score"]
+        assert (row == np.histogram(subset, bins=edges)[0]).all()
+
+
+def test_sample_keeps_outliers_and_budget(frame):
+    positions = sample_positions(frame["x"], frame["y"], max_points=1000)
+    assert len(positions) <= 1000 + 48 * 48
+    assert set(range(5)) & set(positions)  # the outliers share one cell: one of them stays
+    assert (np.diff(positions) > 0).all()
+    np.testing.assert_array_equal(positions, sample_positions(frame["x"], frame["y"], 1000))
+
+
+def test_small_frames_are_not_sampled(frame):
+    small = frame.head(300)
+    assert len(sample_positions(small["x"], small["y"], max_points=1000)) == 300
+
+
+def test_hexbin_counts_every_point(frame):
+    cx, cy, counts, means = hexbin(frame["x"], frame["y"], values=frame["score"])
+    assert counts.sum() == len(frame)
+    assert len(cx) == len(cy) == len(means)
+    total = np.nansum(means * counts)
+    assert total == pytest.approx(frame["score"].sum())
+
+
+def test_ols_matches_polyfit(frame):
+    slope, intercept = ols_line(frame["x"], frame["y"])
+    np.testing.assert_allclose([slope, intercept], np.polyfit(frame["x"], frame["y"], 1))
+    assert ols_line([1.0, 1.0], [2.0, 3.0]) is None
+
+
+def test_figures_send_bounded_payloads(frame):
+    hist = histogram_figure(frame, "score", color="group", nbins=30)
+    assert sum(len(trace.x) for trace in hist.data) == 90
+
+    fig = scatter_figure(frame, "x", "y", color="group", size="score", hover=["name"],
+                         trendline=True, max_points=2000)
+    markers = [t for t in fig.data if t.mode == "markers"]
+    assert sum(len(t.x) for t in markers) < len(frame)
+    assert len([t for t in fig.data if t.mode == "lines"]) == 3
+
+    dense = scatter_figure(frame, "x", "y", max_points=2000, hexbin_rows=10_000)
+    assert dense.data[0].marker.symbol == "hexagon"
@@ -0,0 +1,62 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal import export
+from hyperlocal.pipeline import PROCESSED_CSV
+
+COLUMNS = ["area_name", "city", "economic_health_score", "monthly_rent"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    return pd.read_csv(PROCESSED_CSV)
+
+
+def test_sort_positions_puts_nan_last(df):
+    for ascending in (True, False):
+        order = export.sort_positions(df["monthly_rent"], ascending)
+        expected = df["monthly_rent"].sort_values(ascending=ascending, kind="stable")
+        np.testing.assert_array_equal(df["monthly_rent"].to_numpy()[order], expected.to_numpy())
+
+
+def test_page_bounds_clamp_to_last_page():
+    assert export.page_count(0, 50) == 1
+    assert export.page_bounds(120, 1, 50) == (0, 50)
+    assert export.page_bounds(120, 3, 50) == (100, 120)
+    assert export.page_bounds(120, 9, 50) == (100, 120)
+
+
+def test_chunked_csv_matches_single_write(df):
+    order = export.sort_positions(df["economic_health_score"], ascending=False)
+    expected = df.iloc[order][COLUMNS].to_csv(index=False).encode()
+    assert export.export_csv(df, COLUMNS, order, chunk_rows=7) == expected
+
+
+def test_parquet_export_round_trips(df):
+    pytest.importorskip("pyarrow")
+    order = export.sort_positions(df["economic_health_score"])
+    data = export.export_parquet(df, COLUMNS, order, chunk_rows=64)
+    loaded = pd.read_parquet(io.BytesIO(data))
+    pd.testing.assert_frame_equal(loaded, df.iloc[order][COLUMNS].reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_xlsx_round_trips_through_openpyxl(df):
+    openpyxl = pytest.importorskip("openpyxl")
+    frame = df[COLUMNS].head(30).copy()
+    frame.loc[0, "area_name"] = 'A & B <"Zone">\x01'
+    frame.loc[1, "monthly_rent"] = np.nan
+    buffer = export.write_xlsx(io.BytesIO(), {"Areas": frame, "Empty": frame.iloc[:0]},
+                               chunk_rows=7)
+    workbook = openpyxl.load_workbook(buffer)
+    assert workbook.sheetnames == ["Areas", "Empty"]
+    rows = list(workbook["Areas"].values)
+    assert list(rows[0]) == COLUMNS and len(rows) == 31
+    assert rows[1][0] == 'A & B <"Zone">'
+    assert rows[2][3] is None
+    read = pd.read_excel(buffer, sheet_name="Areas")
+    np.testing.assert_allclose(read["economic_health_score"], frame["economic_health_score"])
+    assert list(workbook["Empty"].values) == [tuple(COLUMNS)]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.filters import FilterIndex
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    n = 5000
+    scores = rng.uniform(0, 100, n).round(2)
+    scores[rng.choice(n, 50, replace=False)] = np.nan
+    return pd.DataFrame({
+        "city": pd.Categorical(rng.choice(["Ambala", "Mohali", "Patiala", "Solan"], n)),
+        "area_type": rng.choice(["Urban", "Semi-Urban", "Rural"], n, p=[0.8, 0.15, 0.05]),
+        "economic_health_score": scores,
+    })
+
+
+def _pandas_filter(df, cities, area_types, score_range):
+    out = df[df["city"].isin(cities)] if cities else df
+    if area_types:
+        out = out[out["area_type"].isin(area_types)]
+    out = out[(out["economic_health_score"] >= score_range[0]) &
+              (out["economic_health_score"] <= score_range[1])]
+    return out.index.to_numpy()
+
+
+@pytest.mark.parametrize("cities, area_types, score_range", [
+    ([], [], (0, 100)),
+    (["Mohali"], [], (0, 100)),
+    (["Mohali", "Solan"], ["Rural"], (20, 80)),
+    ([], ["Urban", "Rural"], (99, 100)),
+    (["Patiala"], ["Semi-Urban"], (40, 40.5)),
+    (["Nowhere"], [], (0, 100)),
+])
+def test_select_matches_pandas_masks(frame, cities, area_types, score_range):
+    index = FilterIndex(frame)
+    rows = index.select(score_range=score_range, city=cities, area_type=area_types)
+    np.testing.assert_array_equal(rows, _pandas_filter(frame, cities, area_types, score_range))
+
+
+def test_options_keep_first_appearance_order(frame):
+    index = FilterIndex(frame)
+    assert index.options["city"] == list(frame["city"].unique())
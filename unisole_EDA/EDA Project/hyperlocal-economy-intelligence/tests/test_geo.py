@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.geo import (GeoIndex, area_coordinates, haversine_km, load_pincode_table,
+                            resolve_place)
+from hyperlocal.queries import finder_rows
+from hyperlocal.store import load_processed
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    lat, lon = rng.uniform(29.5, 31.8, 5000), rng.uniform(74.5, 77.5, 5000)
+    lat[:20] = np.nan
+    lat[20:40], lon[20:40] = 30.7, 76.8  # shared positions
+    return lat, lon
+
+
+def test_coordinates_prefer_pincode_then_city():
+    table = load_pincode_table()
+    df = pd.DataFrame({"pincode": [160017, 999999, np.nan, 147001, 160062],
+                       "city": ["Mohali", "Patiala", "Atlantis", None, "Mohali"]})
+    lat, lon, exact = area_coordinates(df, table)
+    # 160017 is filed under Chandigarh, so that Mohali area stays at Mohali's centre
+    assert exact.tolist() == [False, False, False, True, True]
+    assert (lat[0], lon[0]) == resolve_place("mohali", table)
+    assert (lat[4], lon[4]) == resolve_place("160062", table)
+    assert (lat[1], lon[1]) == resolve_place("patiala", table)
+    assert np.isnan(lat[2]) and (lat[3], lon[3]) == resolve_place(147001, table)
+    with pytest.raises(KeyError):
+        resolve_place("Atlantis", table)
+
+    processed = load_processed(["pincode", "city"])
+    lat, _, exact = area_coordinates(processed)
+    assert np.isfinite(lat).all()
+    # No survey pincode is in the bundled table: every area is city-level
+    assert not exact.any() and not GeoIndex.from_frame(processed).exact.any()
+
+
+def test_queries_match_brute_force(points):
+    lat, lon = points
+    index = GeoIndex(lat, lon)
+    assert len(index) == 4980
+    distances = haversine_km(30.7, 76.8, lat, lon)
+    for km in (0.5, 12, 80):
+        rows, found = index.radius(30.7, 76.8, km)
+        assert np.array_equal(np.sort(rows), np.flatnonzero(distances <= km))
+        assert np.allclose(found, distances[rows]) and (np.diff(found) >= 0).all()
+
+    rows, found = index.nearest(30.7, 76.8, 25)
+    expected = np.lexsort((np.arange(len(lat)), np.nan_to_num(distances, nan=np.inf)))[:25]
+    assert np.array_equal(rows, expected)
+    rows, _ = index.nearest(30.7, 76.8, 5, exclude=20)
+    assert 20 not in rows and len(rows) == 5
+    assert len(index.nearest(35.0, 80.0, 10_000)[0]) == 4980
+
+    box = index.bbox(30.0, 75.0, 30.5, 76.0)
+    assert np.array_equal(box, np.flatnonzero((lat >= 30.0) & (lat <= 30.5) &
+                                              (lon >= 75.0) & (lon <= 76.0)))
+    assert len(index.bbox(40, 80, 41, 81)) == 0
+
+
+def test_finder_within_radius():
+    df = load_processed()
+    index = GeoIndex.from_frame(df)
+    within, _ = index.radius(*resolve_place("Chandigarh"), 15)
+    assert 0 < len(within) < len(df)
+    args = (df, 40000, 40, ["Growing", "Stable", "Declining"], 20,
+            df["city"].dropna().unique(), ["Commercial", "Mixed", "Residential"], 80)
+    everywhere = finder_rows(*args)
+    near = finder_rows(*args, within=within)
+    assert list(near) == [row for row in everywhere if row in set(within)]
+    assert len(finder_rows(*args, within=[])) == 0
+
+
+def test_bundled_table_against_processed_data():
+    table = load_pincode_table()
+    processed = load_processed(["pincode", "city"])
+    # Every surveyed city has a centre to fall back on
+    assert set(processed["city"].dropna()) <= set(table["city"])
+    # Exact placements are exactly the (pincode, city) pairs the table lists
+    pairs = set(zip(table["pincode"], table["city"]))
+    listed = [(int(p), c) in pairs if pd.notna(p) else False
+              for p, c in zip(processed["pincode"], processed["city"].astype(object))]
+    _, _, exact = area_coordinates(processed, table)
+    assert exact.tolist() == listed
+    # Today the table only has head post offices, so proximity is city-level
+    assert not any(listed)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal import pipeline
+from hyperlocal.incremental import IncrementalScorer, SortedValues
+
+SCORE_COLUMNS = pipeline.SUB_SCORES + [
+    "monthly_rent_capped", "property_price_sqft_capped",
+    "economic_health_score", "risk_score", "expected_return",
+]
+
+
+@pytest.fixture()
+def raw():
+    return pd.read_csv(pipeline.RAW_CSV)
+
+
+def _assert_matches_full_rescore(scorer):
+    expected = pipeline.score(scorer.frame)
+    for col in SCORE_COLUMNS:
+        np.testing.assert_allclose(scorer.frame[col].astype(float), expected[col].astype(float),
+                                   err_msg=col)
+    assert (scorer.frame["investment_category"] == expected["investment_category"]).all()
+
+
+def test_sorted_values_tracks_order_statistics():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 20, 200).astype(float)
+    values[:7] = np.nan
+    tracked = SortedValues(values)
+    removed, added = values[::3], rng.integers(0, 30, 40).astype(float)
+    tracked.remove(removed)
+    tracked.insert(added)
+    current = np.concatenate([np.delete(values, np.arange(0, 200, 3)), added])
+    assert tracked.max() == np.nanmax(current)
+    assert tracked.winsorize_bounds() == pipeline.winsorize_bounds(current)
+
+
+def test_new_areas_are_scored_incrementally(raw):
+    scorer = IncrementalScorer(pipeline.run_pipeline(raw.iloc[:150]))
+    result = scorer.update(raw.iloc[150:])
+    assert result["added"] == 50 and result["updated"] == 0
+    assert len(scorer.frame) == 200
+    _assert_matches_full_rescore(scorer)
+
+
+def test_only_changed_rows_rescored_when_normalizers_hold(raw):
+    scorer = IncrementalScorer(pipeline.run_pipeline(raw))
+    before = scorer.frame.copy()
+    delta = raw.iloc[[5, 6]].copy()
+    delta["google_rating"] = 1.0
+    delta["last_survey_date"] = "2025-02-01"
+    result = scorer.update_from_survey(pd.concat([raw.iloc[:5], delta]))
+    assert result == {"updated": 2, "added": 0, "rescored": 2, "full_rescore": False}
+    assert (scorer.frame.loc[[5, 6], "digital_presence_score"] == 20.0).all()
+    pd.testing.assert_frame_equal(scorer.frame.drop(index=[5, 6]), before.drop(index=[5, 6]))
+    _assert_matches_full_rescore(scorer)
+
+
+def test_moving_a_maximum_triggers_full_rescore(raw):
+    scorer = IncrementalScorer(pipeline.run_pipeline(raw))
+    delta = raw.iloc[[0]].copy()
+    delta["property_price_sqft"] = "Rs 99999"
+    result = scorer.update(delta)
+    assert result["full_rescore"] and result["rescored"] == 200
+    assert scorer.stats.property_price_sqft_max == 99999.0
+    _assert_matches_full_rescore(scorer)
@@ -0,0 +1,59 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from hyperlocal.neighbours import tree_knn_impute  # noqa: E402
+from hyperlocal.parallel import run_pipeline_parallel  # noqa: E402
+from hyperlocal.pipeline import KNN_BLOCK_KEYS, RAW_CSV, knn_impute, run_pipeline  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.normal(size=(2000, 4)) * [1, 10, 100, 1000], columns=list("abcd"))
+    holes = rng.random(df.shape) < 0.15
+    holes[200:] = False  # every donor is complete
+    df = df.mask(holes)
+    df["city"] = rng.choice(["Pune", "Nashik", "Nagpur"], len(df))
+    return df
+
+
+def test_matches_exact_knn_with_complete_donors(frame):
+    receivers, donors = frame.iloc[:200], frame.iloc[200:]
+    got = tree_knn_impute(receivers, list("abcd"), reference=donors, scale=False, chunk_rows=37)
+    expected = knn_impute(receivers, list("abcd"), reference=donors)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy())
+
+
+def test_features_are_standardised(frame):
+    spread = frame[list("abcd")].std(ddof=0)
+    got = tree_knn_impute(frame, list("abcd"))
+    expected = tree_knn_impute(frame[list("abcd")] / spread, list("abcd"), scale=False) * spread
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_blocks_use_only_their_own_donors(frame):
+    got = tree_knn_impute(frame, list("abcd"), by=["city"], scale=False, workers=-1)
+    for city, rows in frame.groupby("city").groups.items():
+        alone = tree_knn_impute(frame.loc[rows], list("abcd"), scale=False)
+        np.testing.assert_allclose(got.loc[rows].to_numpy(), alone.to_numpy())
+    assert not got.isna().any().any()
+
+
+def test_reference_pool_and_missing_block_fallback(frame):
+    receivers = frame.iloc[:200].assign(city="Thane")
+    got = tree_knn_impute(receivers, list("abcd"), reference=frame.iloc[200:], by=["city"])
+    expected = tree_knn_impute(receivers, list("abcd"), reference=frame.iloc[200:])
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_pipeline_tree_mode_is_the_same_in_parallel():
+    raw = pd.read_csv(RAW_CSV)
+    knn = partial(tree_knn_impute, by=KNN_BLOCK_KEYS)
+    serial = run_pipeline(raw, knn)
+    assert not serial[["pedestrian_count_15min", "avg_daily_customers"]].isna().any().any()
+    pd.testing.assert_frame_equal(run_pipeline_parallel(raw, workers=2, knn=knn), serial)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.parallel import partition_positions, run_pipeline_parallel
+from hyperlocal.pipeline import RAW_CSV, run_pipeline
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(RAW_CSV)
+
+
+@pytest.fixture(scope="module")
+def expected(raw):
+    return run_pipeline(raw)
+
+
+def test_partitions_cover_every_row_once(raw):
+    parts = partition_positions(raw, workers=3)
+    positions = np.concatenate(parts)
+    assert np.array_equal(np.sort(positions), np.arange(len(raw)))
+    limit = -(-len(raw) // 12)
+    for rows in parts:
+        assert len(rows) <= limit
+        assert raw["city"].iloc[rows].nunique(dropna=False) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_output_matches_serial(raw, expected, workers):
+    result = run_pipeline_parallel(raw, workers=workers)
+    pd.testing.assert_frame_equal(result, expected)
+    assert result.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_missing_cities_form_their_own_partition(raw):
+    shuffled = raw.sample(frac=1, random_state=0)
+    shuffled.loc[shuffled.index[:7], "city"] = np.nan
+    pd.testing.assert_frame_equal(run_pipeline_parallel(shuffled, workers=1),
+                                  run_pipeline(shuffled))
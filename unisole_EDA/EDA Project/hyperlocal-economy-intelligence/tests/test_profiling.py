@@ -0,0 +1,71 @@
+import json
+import logging
+
+import pandas as pd
+
+from hyperlocal.aggregates import AggregateCache
+from hyperlocal.pipeline import RAW_CSV, run_pipeline
+from hyperlocal.profiling import MetricsRegistry, RunProfile, log_run, profiling_enabled
+
+
+def test_spans_record_time_rows_bytes_and_cache():
+    profile = RunProfile()
+    cache = AggregateCache()
+    frame = pd.DataFrame({"a": range(100)})
+    with profile.span("page", rows=100):
+        with profile.span("inner") as span:
+            span.rows = 7
+            profile.sent(frame)
+        assert profile.cached(cache, "k", lambda: 1, "agg") == 1
+        assert profile.cached(cache, "k", lambda: 2, "agg") == 1
+        profile.cached(cache, "k", lambda: 3)
+    assert [s.name for s in profile.spans] == ["inner", "agg", "agg", "page"]
+    inner, miss, hit, page = profile.spans
+    assert inner.rows == 7 and inner.bytes == frame.memory_usage(deep=True).sum()
+    assert (miss.misses, hit.hits, page.hits, page.rows) == (1, 1, 1, 100)
+    assert page.seconds >= inner.seconds > 0
+
+
+def test_disabled_profile_records_nothing(monkeypatch):
+    profile = RunProfile(enabled=False)
+    profile.start("page")
+    with profile.span("x") as span:
+        profile.sent(pd.DataFrame({"a": [1]}))
+        assert profile.cached(AggregateCache(), "k", lambda: 5, "agg") == 5
+    assert profile.finish() is None and profile.spans == [] and span.seconds == 0
+
+    monkeypatch.delenv("HYPERLOCAL_PROFILE", raising=False)
+    assert not profiling_enabled({}) and profiling_enabled({"profile": "1"})
+    monkeypatch.setenv("HYPERLOCAL_PROFILE", "1")
+    assert profiling_enabled()
+
+
+def test_registry_totals_and_prometheus_text():
+    registry = MetricsRegistry()
+    for rows in (10, 30):
+        profile = RunProfile()
+        with profile.span('page."x"', rows=rows):
+            profile.cached(AggregateCache(), "k", lambda: 0)
+        registry.observe(profile)
+    totals = registry.totals().set_index("span")
+    assert totals.loc['page."x"', "count"] == 2 and totals.loc['page."x"', "rows"] == 40
+    assert totals.loc['page."x"', "misses"] == 2
+
+    text = registry.prometheus_text()
+    assert "hyperlocal_runs_total 2" in text
+    assert 'hyperlocal_span_seconds_count{span="page.\\"x\\""} 2' in text
+    assert 'hyperlocal_cache_requests_total{span="page.\\"x\\"",result="miss"} 2' in text
+    assert "# TYPE hyperlocal_span_rows_total counter" in text
+
+
+def test_pipeline_stages_are_profiled(caplog):
+    raw = pd.read_csv(RAW_CSV)
+    profile = RunProfile()
+    pd.testing.assert_frame_equal(run_pipeline(raw, profile=profile), run_pipeline(raw))
+    assert [(s.name, s.rows) for s in profile.spans] == [
+        ("pipeline.clean", len(raw)), ("pipeline.impute", len(raw)), ("pipeline.score", len(raw))]
+
+    with caplog.at_level(logging.INFO, logger="hyperlocal.profile"):
+        log_run(profile, page="pipeline")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["page"] == "pipeline" and len(record["spans"]) == 3
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.recommender import (BusinessProfile, PROFILES, estimate_roi, recommendations_frame,
+                                    score_profiles, top_areas, weight_matrix)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return pd.DataFrame({
+        "area_name": ["A", "B", "C", "D"],
+        "city": ["Mohali", "Mohali", "Solan", "Solan"],
+        "locality_type": ["Commercial", "Residential", "Mixed", "Commercial"],
+        "avg_daily_customers": [100.0, 10.0, 50.0, np.nan],
+        "monthly_rent": [20000.0, 150000.0, 10000.0, 5000.0],
+        "educational_centers": [4, 0, 2, 1],
+        "banks_atms": [3.0, 1.0, np.nan, 0.0],
+        "population_estimate": [1000.0, 5000.0, 2500.0, 0.0],
+        "medical_facilities": [1, 2, 0, 0],
+        "google_reviews_count": [100.0, 0.0, 50.0, 10.0],
+        "zomato_restaurants": [5.0, 0.0, 2.0, 1.0],
+    })
+
+
+def test_matches_row_by_row_formula(frame):
+    profile = BusinessProfile("Legacy")
+    result = score_profiles(frame, [profile], investment=2_000_000)
+    for pos, row in frame.iterrows():
+        revenue = row["avg_daily_customers"] * 0.8 * 30 * 500
+        assert result["revenue"][0, pos] == pytest.approx(revenue, nan_ok=True)
+        if revenue > row["monthly_rent"]:
+            expected = 2_000_000 / (revenue - row["monthly_rent"])
+            assert result["roi_months"][0, pos] == pytest.approx(expected)
+
+
+def test_revenue_at_or_below_rent_is_not_viable():
+    _, margin, roi = estimate_roi(np.array([10.0, 10.0]), np.array([120000.0, 200000.0]),
+                                  0.8, 500, 1_000_000)
+    assert margin[0] == 0 and np.isinf(roi).all()
+
+
+def test_batch_equals_one_profile_at_a_time(frame):
+    profiles = list(PROFILES.values())
+    batch = score_profiles(frame, profiles, investment=1_500_000)
+    for i, profile in enumerate(profiles):
+        single = score_profiles(frame, [profile], investment=1_500_000)
+        for key in ("revenue", "roi_months", "customer_fit"):
+            np.testing.assert_allclose(batch[key][i], single[key][0])
+
+
+def test_customer_weights(frame):
+    students = BusinessProfile("Tutor").with_customers(["Students"])
+    fit = score_profiles(frame, [students], investment=1)["customer_fit"][0]
+    np.testing.assert_allclose(fit, [100, 0, 50, 25])
+    assert weight_matrix([BusinessProfile("None")]).sum() == 0
+
+
+def test_top_areas_skips_nan_and_masked():
+    values = np.array([[3.0, np.nan, 1.0, 2.0], [np.nan, np.nan, 5.0, 4.0]])
+    top = top_areas(values, 3, mask=np.array([True, True, True, False]))
+    assert top.tolist() == [[2, 0, -1], [2, -1, -1]]
+    assert top_areas(values, 2, largest=True).tolist() == [[0, 3], [2, 3]]
+
+
+def test_recommendations_frame(frame):
+    result = score_profiles(frame, list(PROFILES.values())[:2], investment=1_000_000)
+    table = recommendations_frame(frame, result, k=2)
+    assert table["business_type"].tolist() == ["Restaurant/Cafe"] * 2 + ["Retail Shop"] * 2
+    assert table["area_name"].tolist()[:2] == ["A", "C"]
+    assert (table["rank"].to_numpy() == [1, 2, 1, 2]).all()
@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal import reports
+from hyperlocal.pipeline import APP_DIR, PROCESSED_CSV
+
+NOTEBOOK_OUTPUTS = APP_DIR / "outputs"
+
+
+@pytest.fixture(scope="module")
+def df():
+    return pd.read_csv(PROCESSED_CSV)
+
+
+@pytest.fixture(scope="module")
+def built(df):
+    return reports.build_reports(df, by_city=True)
+
+
+def test_workbook_matches_notebook_sheets(built, tmp_path):
+    pytest.importorskip("openpyxl")
+    reports.write_report(built[0], tmp_path)
+    for sheet in ["Top_50_Areas", "City_Summary", "Risk_Areas"]:
+        ours = pd.read_excel(tmp_path / reports.EXCEL_FILE, sheet_name=sheet)
+        notebook = pd.read_excel(NOTEBOOK_OUTPUTS / reports.EXCEL_FILE, sheet_name=sheet)
+        pd.testing.assert_frame_equal(ours, notebook, check_dtype=False)
+
+
+def test_dashboard_matches_notebook_json(built):
+    notebook = json.loads((NOTEBOOK_OUTPUTS / reports.JSON_FILE).read_text())
+    ours = json.loads(reports.dumps(reports.dashboard_data(built[0])))
+    assert ours["summary"]["total_areas"] == notebook["summary"]["total_areas"]
+    assert ours["summary"]["high_potential"] == notebook["summary"]["high_potential"]
+    assert ours["summary"]["top_city"] == notebook["summary"]["top_city"]
+    assert ours["summary"]["avg_score"] == pytest.approx(notebook["summary"]["avg_score"])
+    assert ours["top_10"] == notebook["top_10"]
+    assert set(ours["recommendations"]) == set(reports.PROFILES)
+
+
+def test_city_reports_partition_the_areas(df, built):
+    cities = built[1:]
+    assert [r.scope for r in cities] == sorted(df["city"].unique())
+    assert sum(r.total for r in cities) == built[0].total == len(df)
+    for category, count in built[0].category_counts.items():
+        assert sum(r.category_counts[category] for r in cities) == count
+    for report in cities:
+        assert (report.top["city"] == report.scope).all()
+        assert (report.recommendations["city"] == report.scope).all()
+        scores = report.top["economic_health_score"].to_numpy()
+        assert np.all(np.diff(scores) <= 0)
+
+
+def test_written_packs_match_across_workers(built, tmp_path):
+    serial = reports.write_reports(built[:3], tmp_path / "serial")
+    pooled = reports.write_reports(built[:3], tmp_path / "pooled", workers=2)
+    assert serial[1][0] == tmp_path / "serial" / reports.CITY_DIR / "ambala" / reports.EXCEL_FILE
+    for ours, theirs in zip(serial, pooled):
+        for a, b in zip(ours, theirs):
+            if a.suffix != ".xlsx":
+                assert a.read_bytes() == b.read_bytes()
+    summary = serial[0][-1].read_text()
+    assert "FASTEST PAYBACK BY BUSINESS TYPE" in summary
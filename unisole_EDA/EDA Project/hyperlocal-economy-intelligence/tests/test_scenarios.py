@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.pipeline import RAW_CSV, WEIGHTS, health_score, risk_score, run_pipeline
+from hyperlocal.scenarios import (BASELINE, CATEGORIES, Scenario, ScenarioMatrix,
+                                  category_counts, score_ranks)
+
+
+@pytest.fixture(scope="module")
+def processed():
+    return run_pipeline(pd.read_csv(RAW_CSV))
+
+
+def test_baseline_reproduces_pipeline(processed):
+    result = ScenarioMatrix(processed).rescore([BASELINE])
+    for col in ("economic_health_score", "risk_score", "expected_return"):
+        np.testing.assert_allclose(result[col][0], processed[col], atol=0.0101)
+        assert np.array_equal(np.isnan(result[col][0]), processed[col].isna())
+    categories = np.array(CATEGORIES)[result["category"][0]]
+    assert (categories == processed["investment_category"].to_numpy()).all()
+
+
+def test_scenarios_side_by_side(processed):
+    weights = {**WEIGHTS, "footfall_score": 0.4, "competition_score": 0.0}
+    risk = {"vacancy_rate": 0.2, "infrastructure_score": 0.8}
+    scenarios = [Scenario("Footfall", weights=weights, high=60, moderate=30),
+                 Scenario("Risk", risk_weights=risk, return_weights={"footfall_score": 1.0}),
+                 BASELINE]
+    result = ScenarioMatrix(processed).rescore(scenarios)
+    assert result["economic_health_score"].shape == (3, len(processed))
+
+    expected = health_score(processed, weights)
+    np.testing.assert_allclose(result["economic_health_score"][0], expected, atol=0.0101)
+    np.testing.assert_allclose(result["risk_score"][1], risk_score(processed, risk), atol=0.0101)
+    np.testing.assert_allclose(result["expected_return"][1], processed["footfall_score"], atol=1e-9)
+
+    # Competition scores are missing in some areas, but carry no weight here
+    assert np.isnan(result["economic_health_score"][0]).sum() <= expected.isna().sum()
+    counts = category_counts(result)
+    assert (counts.sum(axis=1) == len(processed)).all()
+    health = result["economic_health_score"][0]
+    assert counts[0, 0] == (health >= 60).sum()
+    assert counts[0, 1] == ((health >= 30) & (health < 60)).sum()
+    assert (category_counts(ScenarioMatrix(processed).rescore([BASELINE])) == counts[2]).all()
+
+
+def test_scenario_validation_and_round_trip():
+    scenario = Scenario("Edited", weights={"footfall_score": 1.0}, high=80)
+    assert Scenario.from_dict(scenario.to_dict()) == scenario
+    with pytest.raises(ValueError):
+        Scenario("Bad", weights={"nope": 1.0})
+    with pytest.raises(ValueError):
+        Scenario("Bad", high=30, moderate=50)
+    with pytest.raises(ValueError):
+        Scenario("Bad", return_weights=[0.6, 0.4])
+
+
+def test_score_ranks():
+    scores = np.array([5.0, np.nan, 7.0, 5.0, 1.0])
+    assert score_ranks(scores).tolist() == [2, 5, 1, 2, 4]
+    assert score_ranks(scores, rows=[1, 0, 2]).tolist() == [5, 2, 1]
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from hyperlocal.search import AreaSearchIndex
+
+NAMES = ["Sector 17 Market", "Sector 22", "Sector 17 Market Zone 2", "Manimajra",
+         "Mall Road", "Model Town", "Sector 35", "Mall Road", None]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return AreaSearchIndex(pd.Series(NAMES))
+
+
+def _names(index, query):
+    rows, _ = index.search(query)
+    return [NAMES[r] for r in rows]
+
+
+def test_prefix_and_phrase_ranking(index):
+    found = _names(index, "sec 17")
+    assert found == ["Sector 17 Market", "Sector 17 Market Zone 2"]
+
+
+def test_full_name_ranks_first(index):
+    assert _names(index, "Sector 17 Market")[0] == "Sector 17 Market"
+
+
+def test_substring(index):
+    assert set(_names(index, "ajra")) == {"Manimajra"}
+
+
+def test_fuzzy_typo(index):
+    assert set(_names(index, "sectr 22")) == {"Sector 22"}
+
+
+def test_duplicate_names_return_every_row(index):
+    rows, scores = index.search("mall road")
+    assert sorted(rows) == [4, 7]
+    assert scores[0] == scores[1]
+
+
+def test_empty_query_matches_all_rows(index):
+    assert index.row_mask("  ").all()
+
+
+@pytest.mark.parametrize("query", ["17", "mall", "or", "zone 2", "x"])
+def test_contains_results_are_a_subset(index, query):
+    contains = pd.Series(NAMES).str.contains(query, case=False, regex=False).fillna(False)
+    mask = index.row_mask(query)
+    assert not (contains.to_numpy() & ~mask).any()
+    assert len(mask) == len(NAMES) and not mask[-1]
@@ -0,0 +1,257 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from hyperlocal.queries import finder_index, finder_rows, top_k
+from hyperlocal.service import QueryService, ServiceApp
+from hyperlocal.store import load_processed
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_processed()
+
+
+@pytest.fixture
+def app(df):
+    return ServiceApp(QueryService(loader=lambda: df, version=lambda: "test"))
+
+
+async def _call(app, method, path, body=None):
+    """Drive the ASGI app directly: returns (status, decoded JSON)."""
+    sent = []
+    payload = json.dumps(body).encode() if body is not None else b""
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def request(app, method, path, body=None):
+    return asyncio.run(_call(app, method, path, body))
+
+
+def test_finder_matches_pandas_masks(df):
+    criteria = dict(budget=30000, min_score=40, growth=["Growing", "Stable"], min_footfall=30,
+                    cities=["Mohali", "Ambala", "Panchkula"], localities=["Commercial", "Mixed"],
+                    max_risk=60)
+    expected = df[
+        (df['monthly_rent'] <= 30000) & (df['economic_health_score'] >= 40) &
+        df['business_growth'].isin(criteria["growth"]) & (df['footfall_score'] >= 30) &
+        df['city'].isin(criteria["cities"]) & df['locality_type'].isin(criteria["localities"]) &
+        (df['risk_score'] <= 60)
+    ].sort_values('economic_health_score', ascending=False, kind="stable").index
+    assert list(finder_rows(df, **criteria)) == list(expected)
+    assert list(finder_rows(df, **criteria, index=finder_index(df))) == list(expected)
+    assert len(finder_rows(df, **{**criteria, "cities": []})) == 0
+
+
+def test_top_k_matches_nlargest(df):
+    values = df['economic_health_score'].to_numpy(dtype="float64")
+    for k in (1, 10, 50):
+        assert list(top_k(values, k)) == list(df.nlargest(k, 'economic_health_score').index)
+        assert list(top_k(values, k, largest=False)) == \
+            list(df.nsmallest(k, 'economic_health_score').index)
+
+
+def test_endpoints(app, df):
+    status, body = request(app, "POST", "/top", {"k": 3, "city": ["Mohali"]})
+    assert status == 200
+    expected = df[df['city'] == "Mohali"].nlargest(3, 'economic_health_score')
+    assert [r["area_id"] for r in body["results"]] == list(expected['area_id'])
+
+    status, body = request(app, "POST", "/aggregates", {"kind": "city_stats"})
+    assert status == 200 and {r["city"] for r in body["results"]} == set(df['city'].dropna())
+
+    full = request(app, "POST", "/aggregates", {"kind": "overview"})[1]
+    status, empty = request(app, "POST", "/aggregates", {"kind": "overview",
+                                                         "score_range": [99.5, 100]})
+    assert status == 200 and set(empty) == set(full)
+    assert (empty["total"], empty["high_potential_share"], empty["top_city"]) == (0, 0.0, None)
+    assert empty["top_10"] == [] and not any(empty["category_counts"].values())
+
+    status, body = request(app, "POST", "/recommend",
+                           {"business_type": "Retail Shop", "monthly_budget": 20000, "k": 5})
+    assert status == 200 and len(body["results"]) == 5
+    assert all(r["monthly_rent"] <= 20000 for r in body["results"])
+    roi = [r["roi_months"] for r in body["results"]]
+    assert roi == sorted(roi)
+
+    status, body = request(app, "POST", "/finder", {"min_score": 0, "max_risk": 100})
+    assert status == 200 and body["count"] >= len(body["results"]) > 0
+
+
+def test_proximity_endpoints(app, df):
+    status, body = request(app, "POST", "/nearby", {"place": "Mohali", "k": 4})
+    assert status == 200 and len(body["results"]) == 4
+    distances = [r["distance_km"] for r in body["results"]]
+    assert distances == sorted(distances)
+
+    assert {r["placement"] for r in body["results"]} == {"city"}
+
+    # Every survey area is at its city centre, so it has no neighbours
+    area = df["area_id"].iloc[0]
+    status, body = request(app, "POST", "/nearby", {"area_id": area, "km": 5})
+    assert status == 200 and body == {"results": [], "placement": "city"}
+
+    criteria = {"min_score": 0, "max_risk": 100, "min_footfall": 0, "budget": 100000, "k": 1000}
+    everywhere = request(app, "POST", "/finder", criteria)[1]
+    status, body = request(app, "POST", "/finder",
+                           {**criteria, "near": {"place": "160017", "km": 10}})
+    assert status == 200 and 0 < body["count"] < everywhere["count"]
+    assert all(r["distance_km"] <= 10 for r in body["results"])
+    assert request(app, "POST", "/nearby", {"place": "Atlantis"})[0] == 400
+    assert request(app, "POST", "/nearby", {})[0] == 400
+
+
+def test_similarity_endpoints(app, df):
+    area = df["area_id"].iloc[0]
+    status, body = request(app, "POST", "/similar", {"area_id": area, "k": 5})
+    assert status == 200 and len(body["results"]) == 5
+    assert area not in [r["area_id"] for r in body["results"]]
+    distances = [r["distance"] for r in body["results"]]
+    assert distances == sorted(distances)
+
+    status, body = request(app, "POST", "/similar", {"scores": {"footfall_score": 90}, "k": 3})
+    assert status == 200 and len(body["results"]) == 3
+
+    status, body = request(app, "POST", "/clusters", {"k": 4})
+    assert status == 200 and sum(body["sizes"]) == len(df) and len(body["centers"]) == 4
+    assert request(app, "POST", "/clusters", {"k": 0})[0] == 400
+    assert request(app, "POST", "/similar", {"area_id": "nope"})[0] == 400
+
+
+def test_scenarios_endpoint(app, df):
+    footfall = {"name": "Footfall", "weights": {"footfall_score": 1.0}, "high": 60}
+    status, body = request(app, "POST", "/scenarios", {"scenarios": [{}, footfall], "k": 5})
+    assert status == 200 and [s["name"] for s in body["scenarios"]] == ["Scenario 1", "Footfall"]
+    baseline, edited = body["scenarios"]
+    assert sum(baseline["category_counts"].values()) == len(df)
+    assert baseline["category_counts"]["High Potential"] == (
+        df["investment_category"] == "High Potential").sum()
+    scores = [r["economic_health_score"] for r in edited["results"]]
+    assert len(scores) == 5 and scores == sorted(scores, reverse=True)
+    assert scores[0] == pytest.approx(df["footfall_score"].max(), abs=0.01)
+
+    assert request(app, "POST", "/scenarios", {"scenarios": []})[0] == 400
+    assert request(app, "POST", "/scenarios",
+                   {"scenarios": [{"weights": {"nope": 1}}]})[0] == 400
+    assert request(app, "POST", "/scenarios",
+                   {"scenarios": [{"high": 30, "moderate": 50}]})[0] == 400
+
+
+def test_errors(app):
+    assert request(app, "POST", "/nowhere", {})[0] == 404
+    assert request(app, "GET", "/top")[0] == 405
+    assert request(app, "POST", "/top", {"column": "nope"})[0] == 400
+    assert request(app, "POST", "/recommend", {"business_type": "Spaceport"})[0] == 400
+    for path, body in [("/top", {"k": "many"}), ("/top", {"column": ["a"]}),
+                       ("/aggregates", {"score_range": "high"}), ("/aggregates", {"city": "Mohali"}),
+                       ("/finder", {"budget": "lots"}), ("/finder", {"near": "Mohali"}),
+                       ("/nearby", {"lat": "x", "lon": 1}), ("/clusters", {"k": []}),
+                       ("/similar", {"scores": {"footfall_score": "high"}}),
+                       ("/similar", {"area_id": {"x": 1}}),
+                       ("/scenarios", {"scenarios": [{"weights": {"footfall_score": "x"}}]}),
+                       ("/batch", {"requests": ["x"]}),
+                       ("/batch", {"requests": [{"endpoint": "top", "params": [1]}]}),
+                       ("/batch", {"requests": [{"endpoint": ["top"]}]})]:
+        status, response = request(app, "POST", path, body)
+        assert status == 400 and response["error"], (path, body)
+
+
+def test_server_errors_are_not_client_errors(app, monkeypatch):
+    app.service.ensure_loaded()
+
+    def broken(params):
+        raise KeyError("bug")
+
+    monkeypatch.setitem(app.service.handlers, "top", broken)
+    assert request(app, "POST", "/top", {"k": 1}) == (500, {"error": "internal server error"})
+
+
+def test_batch_and_cache(app):
+    requests = [{"endpoint": "recommend", "params": {"business_type": name, "k": 2}}
+                for name in ("Retail Shop", "Gym/Fitness")]
+    requests.append({"endpoint": "top", "params": {"k": 1}})
+    status, body = request(app, "POST", "/batch", {"requests": requests})
+    assert status == 200 and len(body) == 3
+    single = request(app, "POST", "/recommend", requests[1]["params"])[1]
+    assert single == body[1]
+    assert app.service.cache.hits >= 1
+
+
+def test_concurrent_recommends_are_coalesced(app, monkeypatch):
+    app.service.ensure_loaded()
+    batch_sizes = []
+    recommend_many = app.service.recommend_many
+
+    def counting(requests):
+        batch_sizes.append(len(requests))
+        return recommend_many(requests)
+
+    monkeypatch.setattr(app.service, "recommend_many", counting)
+
+    async def burst():
+        return await asyncio.gather(*[
+            _call(app, "POST", "/recommend", {"investment": 1e6 + i, "k": 1}) for i in range(8)])
+
+    responses = asyncio.run(burst())
+    assert all(status == 200 for status, _ in responses)
+    assert batch_sizes == [8]
+
+
+def test_bad_recommend_fails_alone_in_a_burst(app, monkeypatch):
+    app.service.ensure_loaded()
+    batch_sizes = []
+    recommend_many = app.service.recommend_many
+
+    def counting(requests):
+        batch_sizes.append(len(requests))
+        return recommend_many(requests)
+
+    monkeypatch.setattr(app.service, "recommend_many", counting)
+    bodies = [{"investment": 1e6 + i, "k": 1} for i in range(3)]
+    bodies += [{"columns": ["nope"]}, {"monthly_budget": "abc"}, {"columns": "area_name"}]
+
+    async def burst():
+        return await asyncio.gather(*[_call(app, "POST", "/recommend", b) for b in bodies])
+
+    responses = asyncio.run(burst())
+    assert [status for status, _ in responses] == [200, 200, 200, 400, 400, 400]
+    assert "nope" in responses[3][1]["error"]
+    assert "monthly_budget" in responses[4][1]["error"]
+    assert batch_sizes == [3]
+
+
+def test_failed_batch_is_answered_request_by_request(app, monkeypatch):
+    app.service.ensure_loaded()
+    recommend_many = app.service.recommend_many
+
+    def fails_on_batches(requests):
+        if len(requests) > 1:
+            raise RuntimeError("batch failed")
+        return recommend_many(requests)
+
+    monkeypatch.setattr(app.service, "recommend_many", fails_on_batches)
+
+    async def burst():
+        return await asyncio.gather(*[
+            _call(app, "POST", "/recommend", {"investment": 2e6 + i, "k": 1}) for i in range(4)])
+
+    assert [status for status, _ in asyncio.run(burst())] == [200] * 4
+
+
+def test_stats_report_latency(app):
+    for _ in range(5):
+        request(app, "POST", "/top", {"k": 5})
+    status, body = request(app, "GET", "/stats")
+    assert status == 200
+    assert body["latency"]["top"]["count"] == 5
+    assert np.isfinite(body["latency"]["top"]["p99_ms"])
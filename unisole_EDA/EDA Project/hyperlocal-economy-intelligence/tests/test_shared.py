@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from hyperlocal.shared import MANIFEST, ensure_shared, open_shared, take_rows  # noqa: E402
+from hyperlocal.store import load_processed  # noqa: E402
+
+
+def test_shared_frame_matches_store(tmp_path):
+    pd.testing.assert_frame_equal(open_shared(root=tmp_path), load_processed())
+    columns = ["risk_score", "city", "area_name"]
+    pd.testing.assert_frame_equal(open_shared(columns, root=tmp_path), load_processed(columns))
+
+
+def test_columns_are_read_only_views(tmp_path):
+    df = open_shared(["economic_health_score", "city"], root=tmp_path)
+    scores = df["economic_health_score"].to_numpy()
+    assert not scores.flags.writeable
+    with pytest.raises(ValueError):
+        scores[0] = 0
+    assert not df["city"].array.codes.flags.writeable
+    with pytest.raises(KeyError, match="nope"):
+        open_shared(["nope"], root=tmp_path)
+
+
+def test_export_is_built_once_per_version(tmp_path):
+    first = ensure_shared("v1", root=tmp_path)
+    stamp = (first / MANIFEST).stat().st_mtime_ns
+    assert ensure_shared("v1", root=tmp_path) == first
+    assert (first / MANIFEST).stat().st_mtime_ns == stamp
+
+    second = ensure_shared("v2", root=tmp_path)
+    assert second != first and not first.exists()
+    assert [p.name for p in tmp_path.iterdir()] == [second.name]
+
+
+def test_take_rows_slices_contiguous_runs():
+    df = pd.DataFrame({"a": np.arange(10.0)})
+    run = take_rows(df, np.arange(3, 7))
+    assert np.shares_memory(run["a"].to_numpy(), df["a"].to_numpy())
+    pd.testing.assert_frame_equal(run, df.take(np.arange(3, 7)))
+    pd.testing.assert_frame_equal(take_rows(df, [1, 4, 2]), df.take([1, 4, 2]))
+    assert take_rows(df, []).empty
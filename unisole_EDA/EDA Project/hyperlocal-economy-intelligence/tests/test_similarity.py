@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.similarity import SUBSCORE_COLUMNS, SimilarityIndex, kmeans
+from hyperlocal.store import load_processed
+
+
+@pytest.fixture(scope="module")
+def scores():
+    rng = np.random.default_rng(3)
+    # Three loose groups of areas, a few scores missing
+    centres = rng.uniform(20, 90, (3, len(SUBSCORE_COLUMNS)))
+    values = centres[rng.integers(0, 3, 6000)] + rng.normal(0, 6, (6000, len(SUBSCORE_COLUMNS)))
+    values[rng.random(values.shape) < 0.02] = np.nan
+    return pd.DataFrame(values, columns=SUBSCORE_COLUMNS)
+
+
+def _brute_force(index, row, k):
+    distances = np.sqrt(((index.matrix.astype("float64") - index.matrix[row]) ** 2).sum(axis=1))
+    distances[row] = np.inf
+    return np.lexsort((np.arange(len(distances)), distances))[:k]
+
+
+def test_matrix_is_standardised_float32(scores):
+    index = SimilarityIndex(scores)
+    assert index.matrix.dtype == np.float32 and index.matrix.flags.c_contiguous
+    assert index.matrix.shape == (len(scores), len(SUBSCORE_COLUMNS))
+    assert np.allclose(index.matrix.mean(axis=0), 0, atol=0.05)
+    assert np.isfinite(index.matrix).all()
+    assert np.allclose(index.vector(scores.iloc[5].to_dict()), index.matrix[5], atol=1e-5)
+
+
+def test_exact_lookup_matches_brute_force(scores):
+    index = SimilarityIndex(scores)
+    assert index.centroids is None
+    for row in (0, 17, 4321):
+        rows, distances = index.similar(row, 10)
+        assert row not in rows and (np.diff(distances) >= 0).all()
+        expected = _brute_force(index, row, 10)
+        assert np.allclose(distances, np.sqrt(((index.matrix[expected] - index.matrix[row]) ** 2)
+                                              .sum(axis=1)), atol=1e-3)
+        assert len(set(rows) & set(expected)) >= 9  # float32 ties aside
+
+
+def test_inverted_file_recall(scores):
+    index = SimilarityIndex(scores, exact_rows=1000)
+    assert index.centroids is not None and len(index.centroids) == int(np.sqrt(len(scores)))
+    found = 0
+    for row in range(0, 6000, 300):
+        rows, _ = index.similar(row, 10)
+        assert row not in rows and len(rows) == 10
+        found += len(set(rows) & set(_brute_force(index, row, 10)))
+    assert found / (20 * 10) >= 0.9
+    # Probing every list is the exact answer
+    rows, _ = index.similar(42, 10, n_probe=len(index.centroids))
+    assert set(rows) == set(_brute_force(index, 42, 10))
+
+
+def test_clusters_and_projection(scores):
+    index = SimilarityIndex(scores)
+    labels, centers = index.clusters(3)
+    assert labels.shape == (len(scores),) and set(labels) == {0, 1, 2}
+    # Centers are in sub-score units: near each group's own mean
+    for label in range(3):
+        assert np.allclose(centers[label], scores[labels == label].mean(), atol=1.0)
+    assert index.clusters(3)[0] is labels
+    assert np.array_equal(SimilarityIndex(scores).clusters(3)[0], labels)
+
+    table = index.cluster_table(3)
+    assert table["areas"].sum() == len(scores) and table["areas"].is_monotonic_decreasing
+    assert list(table.columns) == ["areas", *SUBSCORE_COLUMNS]
+
+    projection = index.projection()
+    assert projection.shape == (len(scores), 2)
+    assert projection[:, 0].var() >= projection[:, 1].var()
+
+
+def test_kmeans_small_inputs():
+    centers, labels = kmeans(np.zeros((4, 2)), 10)
+    assert len(centers) == 4 and (labels < 4).all()
+    index = SimilarityIndex(load_processed(SUBSCORE_COLUMNS))
+    rows, _ = index.similar(0, 5)
+    assert len(rows) == 5 and 0 not in rows
@@ -0,0 +1,52 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from hyperlocal import snapshot as snapshot_module  # noqa: E402
+from hyperlocal.aggregates import overview_aggregates, selection_key  # noqa: E402
+from hyperlocal.snapshot import (OVERVIEW_COLUMNS, build_snapshot, default_selection,  # noqa: E402
+                                 load_snapshot, save_snapshot)
+from hyperlocal.store import load_processed  # noqa: E402
+
+
+def _loader(calls):
+    def load(columns, version):
+        calls.append(version)
+        return load_processed(columns)
+    return load
+
+
+def test_snapshot_round_trip_and_default_aggregates(tmp_path):
+    path = tmp_path / "app.snapshot.pkl"
+    calls = []
+    built = load_snapshot("v1", path, _loader(calls))
+    assert path.exists() and calls == ["v1"]
+    loaded = load_snapshot("v1", path, _loader(calls))
+    assert calls == ["v1"]  # served from the file
+
+    df = load_processed()
+    cities, area_types, score_range = default_selection(loaded.filter_index.options)
+    rows = loaded.filter_index.select(score_range=score_range, city=cities, area_type=area_types)
+    key = f"{selection_key('v1', cities, area_types, score_range)}:overview"
+    expected = overview_aggregates(df[list(OVERVIEW_COLUMNS)].take(rows), df[list(OVERVIEW_COLUMNS)])
+    assert loaded.aggregates[key]["top_city"] == expected["top_city"]
+    pd.testing.assert_frame_equal(loaded.aggregates[key]["top_10"], expected["top_10"])
+    assert (loaded.search_index.search("sector")[0] == built.search_index.search("sector")[0]).all()
+    pd.testing.assert_frame_equal(loaded.sufficient_stats.corr(), built.sufficient_stats.corr())
+
+
+def test_stale_or_broken_snapshots_are_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / "app.snapshot.pkl"
+    calls = []
+    save_snapshot(build_snapshot("v1", _loader(calls)), path)
+
+    assert load_snapshot("v2", path, _loader(calls)).version == "v2"
+    monkeypatch.setattr(snapshot_module, "code_fingerprint", lambda: "changed")
+    assert load_snapshot("v2", path, _loader(calls)).fingerprint == "changed"
+    path.write_bytes(b"not a pickle")
+    load_snapshot("v2", path, _loader(calls))
+    assert calls == ["v1", "v2", "v2", "v2"]
+    assert isinstance(pickle.loads(path.read_bytes()), snapshot_module.Snapshot)
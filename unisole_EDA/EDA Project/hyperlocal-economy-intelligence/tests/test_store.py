@@ -0,0 +1,42 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal import store
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def csv_frame():
+    return pd.read_csv(store.PROCESSED_CSV)
+
+
+def test_schema_narrows_types(csv_frame):
+    typed = store.apply_schema(csv_frame)
+    assert isinstance(typed["city"].dtype, pd.CategoricalDtype)
+    assert isinstance(typed["recommended_business"].dtype, pd.CategoricalDtype)
+    assert typed["medical_facilities"].dtype == np.int8
+    assert typed["pincode"].dtype == np.float32  # has gaps
+    assert typed["economic_health_score"].dtype == np.float32
+    assert typed.memory_usage(deep=True).sum() < csv_frame.memory_usage(deep=True).sum() / 2
+
+
+def test_round_trip_and_projection(tmp_path, csv_frame):
+    path = store.write_store(csv_frame, tmp_path / "processed.parquet")
+    loaded = store.read_store(path, ["area_name", "economic_health_score"])
+    assert list(loaded.columns) == ["area_name", "economic_health_score"]
+    np.testing.assert_allclose(loaded["economic_health_score"], csv_frame["economic_health_score"],
+                               rtol=1e-6)
+
+
+def test_csv_fallback_has_store_schema(tmp_path, csv_frame):
+    shutil.copy(store.PROCESSED_CSV, tmp_path)
+    columns = ["economic_health_score", "city"]
+    from_csv = store.load_processed(columns, app_dir=tmp_path)
+    store.write_store(csv_frame, tmp_path / "hyperlocal_economy_processed.parquet")
+    from_parquet = store.load_processed(columns, app_dir=tmp_path)
+    assert list(from_csv.columns) == columns
+    assert from_csv.dtypes.to_dict() == from_parquet.dtypes.to_dict()
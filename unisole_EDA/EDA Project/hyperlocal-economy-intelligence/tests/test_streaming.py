@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hyperlocal.pipeline import RAW_CSV, run_pipeline, winsorize_bounds
+from hyperlocal.streaming import (QuantileSketch, ReservoirSample, StreamingPipeline,
+                                  process_file_streaming)
+
+
+def test_streaming_output_matches_in_memory(tmp_path):
+    expected = tmp_path / "full.csv"
+    run_pipeline(pd.read_csv(RAW_CSV)).to_csv(expected, index=False)
+    output = tmp_path / "streamed.csv"
+    summary = process_file_streaming(RAW_CSV, output, chunksize=37)
+    assert summary["chunks"] == 6 and summary["exact"]
+    assert output.read_bytes() == expected.read_bytes()
+
+
+def test_missing_required_column_is_rejected(tmp_path):
+    raw = pd.read_csv(RAW_CSV).drop(columns=["monthly_rent"])
+    path = tmp_path / "raw.csv"
+    raw.to_csv(path, index=False)
+    with pytest.raises(ValueError, match="monthly_rent"):
+        process_file_streaming(path, tmp_path / "out.csv")
+
+
+def test_unparseable_values_are_counted(tmp_path):
+    raw = pd.read_csv(RAW_CSV)
+    raw["monthly_rent"] = raw["monthly_rent"].astype(object)
+    raw.loc[:2, "monthly_rent"] = "call owner"
+    path = tmp_path / "raw.csv"
+    raw.to_csv(path, index=False)
+    summary = StreamingPipeline(chunksize=50).run(path, tmp_path / "out.csv")
+    assert summary["invalid_values"]["monthly_rent"] == 3
+
+
+def test_sketch_order_statistics_are_exact():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 500, 10_001).astype(float)
+    values[rng.choice(len(values), 300, replace=False)] = np.nan
+    sketch = QuantileSketch()
+    for part in np.array_split(values, 7):
+        sketch.add(part)
+    assert sketch.exact
+    assert sketch.median() == np.nanmedian(values)
+    assert sketch.winsorize_bounds() == winsorize_bounds(values)
+    assert sketch.max() == np.nanmax(values)
+
+    other = QuantileSketch()
+    other.add(values[:5000])
+    merged = QuantileSketch()
+    merged.add(values[5000:])
+    merged.merge(other)
+    assert merged.winsorize_bounds() == winsorize_bounds(values)
+
+
+def test_sketch_compacts_beyond_max_distinct():
+    values = np.random.default_rng(1).lognormal(10, 1, 50_000)
+    sketch = QuantileSketch(max_distinct=1000)
+    sketch.add(values)
+    assert not sketch.exact and len(sketch.values) <= 1000 and len(sketch) == len(values)
+    assert sketch.median() == pytest.approx(np.median(values), rel=0.01)
+
+
+def test_reservoir_is_bounded_and_in_file_order():
+    frame = pd.DataFrame({"a": np.arange(1000.0)})
+    sample = ReservoirSample(["a"], size=100)
+    for start in range(0, len(frame), 111):
+        sample.add(frame.iloc[start:start + 111])
+    rows = sample.frame()["a"].to_numpy()
+    assert len(rows) == 100 and len(set(rows)) == 100
+    assert (np.diff(rows) > 0).all()
+
+    whole = ReservoirSample(["a"], size=5000)
+    whole.add(frame)
+    assert (whole.frame()["a"].to_numpy() == frame["a"].to_numpy()).all()
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from hyperlocal import synthetic
+from hyperlocal.pipeline import clean, run_pipeline
+from hyperlocal.synthetic import RAW_COLUMNS, generate_raw, write_raw_csv
+
+
+def test_schema_and_determinism():
+    raw = generate_raw(500, seed=3)
+    assert list(raw.columns) == RAW_COLUMNS and len(raw) == 500
+    pd.testing.assert_frame_equal(raw, generate_raw(500, seed=3))
+    assert not raw.equals(generate_raw(500, seed=4))
+    assert raw["area_id"].is_unique
+
+
+def test_blocks_do_not_depend_on_total_size(monkeypatch):
+    monkeypatch.setattr(synthetic, "BLOCK_ROWS", 50)
+    small = generate_raw(120, seed=1)
+    large = generate_raw(175, seed=1)
+    pd.testing.assert_frame_equal(small.iloc[:100], large.iloc[:100])
+    assert large.index.equals(pd.RangeIndex(175)) and large["area_id"].is_unique
+
+
+def test_dirty_formats_are_cleaned(tmp_path):
+    raw = pd.read_csv(write_raw_csv(tmp_path / "raw.csv", 3000, seed=0))
+    text = raw["avg_transaction_value"].dropna()
+    assert text.str.startswith("Rs ").any()
+    assert raw["property_price_sqft"].dropna().str.endswith("/-").any()
+    assert raw["pedestrian_count_15min"].dropna().str.startswith("~").any()
+    assert raw["vacant_shops"].dropna().str.endswith("shops").any()
+    assert raw["last_survey_date"].dropna().str.match(r"\d{2}[-/]").any()
+
+    cleaned = clean(raw)
+    for col in ["avg_transaction_value", "property_price_sqft", "pedestrian_count_15min",
+                "vacant_shops", "last_survey_date"]:
+        # Only values missing in the survey stay missing
+        assert cleaned[col].isna().sum() == raw[col].isna().sum()
+
+    processed = run_pipeline(raw)
+    # As in the real survey, rows missing a score input keep a missing score
+    scores = processed["economic_health_score"].dropna()
+    assert len(scores) > len(raw) / 2 and scores.between(0, 100).all()
+    assert set(processed["investment_category"].unique()) <= {
+        "High Potential", "Moderate Potential", "Low Potential"}